@@ -0,0 +1,81 @@
+"""Cost of scoring every applicant of one job.
+
+Compares the vectorized applicant scorer against scoring each applicant in a
+Python loop with ``match_scoring.skill_overlap`` / ``experience_fit``. Rows are
+synthetic (application_id, candidate_id, skills, years, overall_score) tuples,
+as ``CandidateRepository.iter_applicant_features`` yields them.
+
+Run from ``backend/``::
+
+    python -m benchmarks.applicant_scoring_bench --applicants 100000
+"""
+import argparse
+import random
+import time
+from core.tools.applicant_scoring import applicant_updates, score_applicants, top_applicants
+from core.tools.match_scoring import experience_fit, skill_overlap
+from core.tools.skill_matcher import load_skill_dictionary
+
+def build_job(rng: random.Random, terms, required: int, preferred: int) -> dict:
+    skills = rng.sample(terms, required + preferred)
+    return {
+        "title": "Senior Backend Engineer",
+        "required_skills": skills[:required],
+        "preferred_skills": skills[required:],
+        "min_experience_years": 3.0,
+        "max_experience_years": 10.0
+    }
+
+def build_rows(rng: random.Random, terms, count: int, skills_per_candidate: int):
+    return [
+        (i, 100000 + i, rng.sample(terms, skills_per_candidate), round(rng.uniform(0, 15), 1), rng.uniform(20, 95))
+        for i in range(count)
+    ]
+
+def loop_scores(job: dict, rows) -> list:
+    required = {s.lower() for s in job["required_skills"]}
+    preferred = {s.lower() for s in job["preferred_skills"]}
+    scores = []
+    for _, _, skills, years, _ in rows:
+        skill_score, matched, missing = skill_overlap(required, preferred, {s.lower() for s in skills})
+        scores.append((skill_score, experience_fit(years, job["min_experience_years"]), matched, missing))
+    return scores
+
+def run(applicants: int, required: int, preferred: int, skills_per_candidate: int, seed: int):
+    rng = random.Random(seed)
+    dictionary = load_skill_dictionary()
+    terms = sorted({e if isinstance(e, str) else e["term"] for entries in dictionary.values() for e in entries})
+    job = build_job(rng, terms, required, preferred)
+    rows = build_rows(rng, terms, applicants, min(skills_per_candidate, len(terms)))
+
+    start = time.perf_counter()
+    loop_scores(job, rows)
+    loop = time.perf_counter() - start
+
+    scoring = score_applicants(job, rows)
+    start = time.perf_counter()
+    updates = applicant_updates(scoring["columns"], scoring["matrix"], scoring["scores"])
+    explain = time.perf_counter() - start
+    start = time.perf_counter()
+    top_applicants(scoring["matrix"], scoring["scores"], 50)
+    top = time.perf_counter() - start
+
+    timings = scoring["timings_ms"]
+    print(f"{applicants} applicants, {required} required + {preferred} preferred skills, "
+          f"{skills_per_candidate} skills per applicant")
+    print(f"python loop (skills + experience only): {loop * 1000:8.1f} ms")
+    print(f"vectorized: build matrix                {timings['build']:8.1f} ms")
+    print(f"            score                       {timings['score']:8.1f} ms")
+    print(f"            strengths/gaps rows         {explain * 1000:8.1f} ms")
+    print(f"            top 50                      {top * 1000:8.1f} ms")
+    print(f"best score {max(update['match_score'] for update in updates):.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--applicants", type=int, default=100000)
+    parser.add_argument("--required", type=int, default=8)
+    parser.add_argument("--preferred", type=int, default=4)
+    parser.add_argument("--skills-per-candidate", type=int, default=15)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.applicants, args.required, args.preferred, args.skills_per_candidate, args.seed)
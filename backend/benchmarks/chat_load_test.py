@@ -0,0 +1,166 @@
+"""Chat WebSocket load test: are other connections slowed down by long turns?
+
+Probe connections measure ping -> pong round trips on ``/ws/chat/{user_id}``,
+first on an idle server (baseline) and then while load users keep long chat
+turns running. Each load user also sends a second message while its first turn
+is still in flight, which the per-user turn limit should reject.
+
+By default the app from ``main`` is served in-process with the supervisor graph
+swapped for one that blocks its worker thread for ``--turn-seconds`` (a stand-in
+for a chain of LLM calls), and with startup hooks off so no database is needed.
+Pass ``--url`` to load an already running server instead.
+
+Run from ``backend/``::
+
+    python -m benchmarks.chat_load_test --load-users 20 --probes 5 --turn-seconds 10
+    python -m benchmarks.chat_load_test --url ws://localhost:8000 --duration 30
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+import uuid
+from typing import Dict, List
+
+import websockets
+from core.llm.metrics import percentile
+
+class SleepyGraph:
+    """Supervisor graph stand-in whose turns block a thread like synchronous LLM calls do"""
+
+    def __init__(self, turn_seconds: float):
+        self.turn_seconds = turn_seconds
+
+    def invoke(self, state):
+        from langchain_core.messages import AIMessage
+
+        time.sleep(self.turn_seconds)
+        state["messages"].append(AIMessage(content="Load test turn complete"))
+        state["current_task"] = "load_test"
+        return state
+
+    def stream(self, state, stream_mode):
+        result = self.invoke(state)
+        if "updates" in stream_mode:
+            yield "updates", {"response_generation": {"current_task": "load_test"}}
+        if "values" in stream_mode:
+            yield "values", result
+
+class SleepySupervisor:
+    def __init__(self, turn_seconds: float):
+        self.graph = SleepyGraph(turn_seconds)
+
+def serve_in_process(port: int, turn_seconds: float):
+    """Serve ``main.app`` on a background thread with the sleepy supervisor"""
+    import uvicorn
+    import main
+
+    main.supervisor = SleepySupervisor(turn_seconds)
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, lifespan="off", log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+async def _receive_until(ws, types: set) -> Dict:
+    while True:
+        message = json.loads(await ws.recv())
+        if message.get("type") in types:
+            return message
+
+async def probe(url: str, stop: asyncio.Event, interval: float, samples: List[float]):
+    async with websockets.connect(f"{url}/ws/chat/probe-{uuid.uuid4().hex[:8]}") as ws:
+        await _receive_until(ws, {"message"})  # welcome
+        while not stop.is_set():
+            start = time.perf_counter()
+            await ws.send(json.dumps({"type": "ping"}))
+            await _receive_until(ws, {"pong"})
+            samples.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(interval)
+
+async def load_user(url: str, stop: asyncio.Event, stats: Dict[str, List[float]], stream: bool):
+    async with websockets.connect(f"{url}/ws/chat/load-{uuid.uuid4().hex[:8]}", ping_timeout=None) as ws:
+        await _receive_until(ws, {"message"})  # welcome
+        while not stop.is_set():
+            start = time.perf_counter()
+            await ws.send(json.dumps({"message": "Find the best candidates for the backend role", "stream": stream}))
+            await _receive_until(ws, {"typing"})
+            # Second message while the first turn runs; the per-user limit should refuse it
+            await ws.send(json.dumps({"message": "And the frontend role?"}))
+            refused = await _receive_until(ws, {"error", "message"})
+            if refused.get("type") == "error":
+                stats["rejected"].append(1)
+                final = await _receive_until(ws, {"message", "error"})
+            else:
+                final = refused
+            if final.get("type") == "message":
+                stats["turn_ms"].append((time.perf_counter() - start) * 1000)
+            else:
+                stats["failed"].append(1)
+
+async def run_phase(url: str, args, with_load: bool) -> Dict:
+    stop = asyncio.Event()
+    samples: List[float] = []
+    stats: Dict[str, List[float]] = {"turn_ms": [], "rejected": [], "failed": []}
+    tasks = [asyncio.create_task(probe(url, stop, args.probe_interval, samples)) for _ in range(args.probes)]
+    if with_load:
+        tasks += [asyncio.create_task(load_user(url, stop, stats, args.stream)) for _ in range(args.load_users)]
+    await asyncio.sleep(args.duration)
+    stop.set()
+    # Load users may be mid-turn; the probe samples are what matter
+    await asyncio.wait(tasks, timeout=args.turn_seconds + 5)
+    for task in tasks:
+        task.cancel()
+    return {
+        "phase": "loaded" if with_load else "baseline",
+        "pings": len(samples),
+        "ping_p50_ms": percentile(samples, 50),
+        "ping_p95_ms": percentile(samples, 95),
+        "ping_max_ms": max(samples) if samples else 0.0,
+        "turns_completed": len(stats["turn_ms"]),
+        "turn_p50_ms": percentile(stats["turn_ms"], 50),
+        "turns_rejected": len(stats["rejected"]),
+        "turns_failed": len(stats["failed"])
+    }
+
+def print_report(reports: List[Dict]):
+    print(f"\n{'phase':<9} {'pings':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'turns':>6} {'turn p50 ms':>12} {'rejected':>9} {'failed':>7}")
+    for r in reports:
+        print(f"{r['phase']:<9} {r['pings']:>6} {r['ping_p50_ms']:>8.1f} {r['ping_p95_ms']:>8.1f} {r['ping_max_ms']:>8.1f} "
+              f"{r['turns_completed']:>6} {r['turn_p50_ms']:>12.0f} {r['turns_rejected']:>9} {r['turns_failed']:>7}")
+
+async def run(args) -> List[Dict]:
+    url = args.url or f"ws://127.0.0.1:{args.port}"
+    return [await run_phase(url, args, with_load=False), await run_phase(url, args, with_load=True)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="ws:// base URL of a running server; default serves main.app in-process")
+    parser.add_argument("--port", type=int, default=8765, help="port for the in-process server")
+    parser.add_argument("--load-users", type=int, default=20)
+    parser.add_argument("--probes", type=int, default=5)
+    parser.add_argument("--turn-seconds", type=float, default=10.0, help="blocking time per stubbed turn")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per phase")
+    parser.add_argument("--probe-interval", type=float, default=0.2)
+    parser.add_argument("--stream", action="store_true", help="load users request streaming turns")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    server = None
+    if not args.url:
+        server, _ = serve_in_process(args.port, args.turn_seconds)
+    try:
+        reports = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.should_exit = True
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print_report(reports)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Top-k query latency of the candidate/job embedding index.
+
+Fills a throwaway Chroma index with random unit vectors (the model is not
+needed, only the vector count and dimension matter for HNSW search) and times
+"candidates for job" and "jobs for candidate" queries.
+
+Run from ``backend/``::
+
+    python -m benchmarks.embedding_index_bench --candidates 500000 --jobs 2000
+"""
+import argparse
+import math
+import random
+import shutil
+import tempfile
+import time
+from core.llm.metrics import percentile
+from core.tools.embedding_index import EmbeddingIndex
+
+ADD_BATCH = 5000
+
+def random_unit_vectors(rng: random.Random, count: int, dim: int):
+    for _ in range(count):
+        vector = [rng.gauss(0, 1) for _ in range(dim)]
+        norm = math.sqrt(sum(v * v for v in vector))
+        yield [v / norm for v in vector]
+
+def fill(collection, rng: random.Random, count: int, dim: int, metadata):
+    for start in range(0, count, ADD_BATCH):
+        size = min(ADD_BATCH, count - start)
+        collection.add(
+            ids=[str(i) for i in range(start, start + size)],
+            embeddings=list(random_unit_vectors(rng, size, dim)),
+            metadatas=[metadata(i) for i in range(start, start + size)]
+        )
+
+def time_queries(query, ids, k: int):
+    samples = []
+    for record_id in ids:
+        start = time.perf_counter()
+        query(record_id, k)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def run(candidates: int, jobs: int, dim: int, queries: int, k: int, seed: int):
+    rng = random.Random(seed)
+    path = tempfile.mkdtemp(prefix="embedding_index_bench_")
+    try:
+        index = EmbeddingIndex(path)
+        if not index.available:
+            print("chromadb is not installed")
+            return
+
+        start = time.perf_counter()
+        fill(index._collection("candidates"), rng, candidates, dim,
+             lambda i: {"is_available": int(i % 10 != 0), "content_hash": "bench"})
+        fill(index._collection("jobs"), rng, jobs, dim,
+             lambda i: {"status": "active" if i % 4 else "closed", "content_hash": "bench"})
+        print(f"indexed {candidates} candidates and {jobs} jobs ({dim}-d) in {time.perf_counter() - start:.1f}s")
+
+        job_ids = [rng.randrange(jobs) for _ in range(queries)]
+        candidate_ids = [rng.randrange(candidates) for _ in range(queries)]
+        for label, samples in (
+            ("candidates for job", time_queries(index.candidates_for_job, job_ids, k)),
+            ("jobs for candidate", time_queries(index.jobs_for_candidate, candidate_ids, k)),
+        ):
+            print(f"{label:20s} top-{k}: p50 {percentile(samples, 50):6.1f} ms   "
+                  f"p95 {percentile(samples, 95):6.1f} ms   max {max(samples):6.1f} ms")
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--candidates", type=int, default=100000)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--dim", type=int, default=384, help="all-MiniLM-L6-v2 produces 384-d vectors")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.candidates, args.jobs, args.dim, args.queries, args.k, args.seed)
@@ -0,0 +1,121 @@
+"""Candidate search: ranked full-text search against the previous ILIKE scan.
+
+Loads synthetic candidates into a scratch schema (``fts_bench``) of the
+database in ``DATABASE_URL``, with the same generated ``search_vector`` column
+and GIN index as ``candidates``, then times each query both ways:
+
+* ilike: ``full_name ILIKE '%q%' OR resume_text ILIKE '%q%'`` (all matches)
+* fts:   ``search_vector @@ to_tsquery(...)`` ranked by ``ts_rank``, top 20,
+         plus ``ts_headline`` snippets for those 20
+
+Run from ``backend/``::
+
+    python -m benchmarks.full_text_search_bench --rows 1000000
+"""
+import argparse
+import io
+import random
+import statistics
+import time
+from sqlalchemy import text
+from config.database import engine
+from database.full_text import CANDIDATE_SEARCH_VECTOR_SQL, HEADLINE_OPTIONS, TEXT_SEARCH_CONFIG, prefix_tsquery_text
+
+SCHEMA = "fts_bench"
+FIRST_NAMES = ["Aarav", "Maya", "Liam", "Sofia", "Noah", "Priya", "Ethan", "Zara", "Lucas", "Anika"]
+LAST_NAMES = ["Sharma", "Garcia", "Chen", "Okafor", "Mueller", "Patel", "Kim", "Rossi", "Silva", "Nair"]
+COMMON = ("designed built led team services data pipelines customers platform reduced latency cost "
+          "engineers migration dashboards reliability performance product delivery").split()
+SKILLS = ["python", "java", "javascript", "react", "kubernetes", "docker", "postgresql", "terraform",
+          "spark", "kafka", "django", "golang", "rust", "tensorflow", "airflow", "snowflake"]
+# Rare terms make the selective queries; one in RARE_EVERY resumes gets one
+RARE_TERMS = [f"certx{i}" for i in range(200)]
+RARE_EVERY = 50
+
+QUERIES = ["python", "kubernetes terraform", "snowflake airflow spark", "certx7", "pipel", "priya patel"]
+
+def resume_text(rng: random.Random, words: int) -> str:
+    tokens = [rng.choice(COMMON) if rng.random() < 0.8 else rng.choice(SKILLS) for _ in range(words)]
+    if rng.randrange(RARE_EVERY) == 0:
+        tokens.insert(rng.randrange(len(tokens)), rng.choice(RARE_TERMS))
+    return " ".join(tokens)
+
+def load(rows: int, words: int, seed: int, batch: int = 50000):
+    rng = random.Random(seed)
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        connection.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        connection.execute(text(f"""
+            CREATE TABLE {SCHEMA}.candidates (
+                id serial PRIMARY KEY,
+                full_name varchar(255) NOT NULL,
+                resume_text text,
+                search_vector tsvector GENERATED ALWAYS AS ({CANDIDATE_SEARCH_VECTOR_SQL}) STORED
+            )
+        """))
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for start in range(0, rows, batch):
+            buffer = io.StringIO()
+            for _ in range(min(batch, rows - start)):
+                name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+                buffer.write(f"{name}\t{resume_text(rng, words)}\n")
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY {SCHEMA}.candidates (full_name, resume_text) FROM STDIN", buffer)
+        raw.commit()
+    finally:
+        raw.close()
+
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE INDEX ON {SCHEMA}.candidates USING gin (search_vector)"))
+        connection.execute(text(f"ANALYZE {SCHEMA}.candidates"))
+
+def timed(connection, statement, params, repeat: int):
+    samples, rows = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = connection.execute(text(statement), params).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), rows
+
+def run(rows: int, words: int, repeat: int, seed: int, keep: bool):
+    start = time.perf_counter()
+    load(rows, words, seed)
+    print(f"loaded {rows} candidates ({words} words each) with tsvector + GIN in {time.perf_counter() - start:.1f}s")
+
+    ilike = (f"SELECT id FROM {SCHEMA}.candidates "
+             f"WHERE full_name ILIKE :pattern OR resume_text ILIKE :pattern")
+    fts = (f"SELECT id, ts_rank(search_vector, q) AS rank FROM {SCHEMA}.candidates, "
+           f"to_tsquery('{TEXT_SEARCH_CONFIG}', :query) q WHERE search_vector @@ q ORDER BY rank DESC, id LIMIT 20")
+    snippets = (f"SELECT id, ts_headline('{TEXT_SEARCH_CONFIG}', resume_text, to_tsquery('{TEXT_SEARCH_CONFIG}', :query), "
+                f":options) FROM {SCHEMA}.candidates WHERE id = ANY(:ids)")
+    count = (f"SELECT count(*) FROM {SCHEMA}.candidates "
+             f"WHERE search_vector @@ to_tsquery('{TEXT_SEARCH_CONFIG}', :query)")
+    try:
+        with engine.connect() as connection:
+            for query in QUERIES:
+                ts_text = prefix_tsquery_text(query)
+                ilike_ms, ilike_rows = timed(connection, ilike, {"pattern": f"%{query}%"}, repeat)
+                fts_ms, fts_rows = timed(connection, fts, {"query": ts_text}, repeat)
+                snippet_ms, _ = timed(connection, snippets, {
+                    "query": ts_text, "options": HEADLINE_OPTIONS, "ids": [row[0] for row in fts_rows]
+                }, repeat)
+                matches = connection.execute(text(count), {"query": ts_text}).scalar()
+                print(f"{query!r:28s} ilike {ilike_ms:8.1f} ms ({len(ilike_rows):7d} rows)   "
+                      f"fts top-20 {fts_ms:7.1f} ms + snippets {snippet_ms:5.1f} ms ({matches:7d} matches)")
+    finally:
+        if not keep:
+            with engine.begin() as connection:
+                connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--words", type=int, default=120, help="words of resume text per candidate")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="keep the fts_bench schema afterwards")
+    args = parser.parse_args()
+    run(args.rows, args.words, args.repeat, args.seed, args.keep)
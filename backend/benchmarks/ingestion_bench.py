@@ -0,0 +1,174 @@
+"""Resume ingestion benchmark: upload -> extract -> parse -> upsert.
+
+Runs ``HRService.process_resume_batch`` over a synthetic corpus with the stub
+LLM backend (``LLM_BACKEND=stub``), which answers with schema-valid resumes after
+a configurable latency, so runs are free and repeatable. Each batch size runs in its own subprocess, which keeps
+the peak RSS figures independent. The parse cache is disabled for the run.
+
+Upserts go to the database at ``DATABASE_URL`` (synthetic candidates use
+``@example.com`` addresses tagged with the run id); pass ``--skip-upsert`` to
+benchmark without a database.
+
+Run from ``backend/``::
+
+    python -m benchmarks.ingestion_bench --batch-sizes 1 10 100 1000 --llm-latency 0.8
+    python -m benchmarks.ingestion_bench --batch-sizes 50 --packed --skip-upsert
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List
+from core.llm.metrics import percentile
+
+STAGES = ["upload", "extract", "parse", "parse_pack", "upsert"]
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+def _timed(samples: List[float], func):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - start)
+    return wrapper
+
+def _spool(resume: Dict, upload_dir: str) -> Dict:
+    """Chunked write to disk, the same shape as the upload endpoint's spooling"""
+    path = os.path.join(upload_dir, f"{uuid.uuid4().hex}_{resume['filename']}")
+    content = resume["content"]
+    with open(path, "wb") as f:
+        for offset in range(0, len(content), UPLOAD_CHUNK_SIZE):
+            f.write(content[offset:offset + UPLOAD_CHUNK_SIZE])
+    return {"filename": resume["filename"], "path": path, "size": len(content)}
+
+def run_batch(args) -> Dict:
+    """Benchmark one batch size in the current process"""
+    os.environ["RESUME_PARSE_CACHE"] = "false"
+    os.environ["LLM_BACKEND"] = "stub"
+    low, high = args.llm_latency * (1 - args.llm_jitter), args.llm_latency * (1 + args.llm_jitter)
+    os.environ["LLM_STUB_LATENCY"] = f"uniform:{max(0.0, low)},{high}"
+    os.environ["LLM_STUB_SEED"] = str(args.seed)
+    from benchmarks.synthetic_resumes import generate_corpus
+    from core.tools.text_extraction import shutdown_extraction_pool
+    from services.hr_service import HRService
+
+    run_id = uuid.uuid4().hex[:8]
+    corpus = generate_corpus(args.batch_size, args.max_pages, args.formats, args.seed, run_id)
+    samples: Dict[str, List[float]] = defaultdict(list)
+
+    db = None
+    if not args.skip_upsert:
+        from config.database import get_database_session
+        db = get_database_session()
+
+    hr_service = HRService(db)
+    parser = hr_service.resume_parser
+    parser._extract_text = _timed(samples["extract"], parser._extract_text)
+    parser._parse_text = _timed(samples["parse"], parser._parse_text)
+    parser._parse_pack_with_gemini = _timed(samples["parse_pack"], parser._parse_pack_with_gemini)
+    if args.skip_upsert:
+        hr_service._persist_candidates = lambda outcomes, job_id: [o.pop("candidate_data", None) for o in outcomes]
+    hr_service._persist_candidates = _timed(samples["upsert"], hr_service._persist_candidates)
+
+    upload_dir = tempfile.mkdtemp(prefix="ingestion_bench_")
+    try:
+        start = time.perf_counter()
+        resumes = [_timed(samples["upload"], _spool)(resume, upload_dir) for resume in corpus]
+        result = asyncio.run(hr_service.process_resume_batch(
+            resumes, max_concurrency=args.concurrency, packed=args.packed
+        ))
+        elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        shutdown_extraction_pool()
+        if db is not None:
+            db.close()
+
+    return {
+        "batch_size": args.batch_size,
+        "packed": args.packed,
+        "elapsed_seconds": elapsed,
+        "resumes_per_second": args.batch_size / elapsed if elapsed else 0.0,
+        "processed": result.get("total_processed", 0),
+        "failed": len(result.get("failed_resumes", [])),
+        "input_tokens": result.get("parsing_method_stats", {}).get("input_tokens", 0),
+        "stages": {
+            stage: {
+                "count": len(values),
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000
+            }
+            for stage, values in samples.items() if values
+        },
+        # ru_maxrss is KiB on Linux; children covers the extraction pool workers
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "peak_child_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    }
+
+def _child_args(args, batch_size: int) -> List[str]:
+    argv = [sys.executable, "-m", "benchmarks.ingestion_bench", "--batch-size", str(batch_size),
+            "--max-pages", str(args.max_pages), "--formats", *args.formats, "--seed", str(args.seed),
+            "--llm-latency", str(args.llm_latency), "--llm-jitter", str(args.llm_jitter), "--json"]
+    if args.concurrency:
+        argv += ["--concurrency", str(args.concurrency)]
+    if args.packed:
+        argv.append("--packed")
+    if args.skip_upsert:
+        argv.append("--skip-upsert")
+    return argv
+
+def print_report(reports: List[Dict]):
+    print(f"\n{'batch':>6} {'resumes/s':>10} {'ok':>5} {'fail':>5} {'rss MB':>8} {'child MB':>9}  stage p50/p95 ms")
+    for report in reports:
+        stages = "  ".join(
+            f"{stage} {stats['p50_ms']:.0f}/{stats['p95_ms']:.0f}"
+            for stage, stats in sorted(report["stages"].items(), key=lambda item: STAGES.index(item[0]))
+        )
+        print(f"{report['batch_size']:>6} {report['resumes_per_second']:>10.2f} {report['processed']:>5} "
+              f"{report['failed']:>5} {report['peak_rss_mb']:>8.0f} {report['peak_child_rss_mb']:>9.0f}  {stages}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--batch-size", type=int, help="run a single batch in this process")
+    parser.add_argument("--max-pages", type=int, default=20)
+    parser.add_argument("--formats", nargs="+", default=["pdf", "docx", "txt"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="seconds per stubbed Gemini call")
+    parser.add_argument("--llm-jitter", type=float, default=0.25, help="relative latency jitter")
+    parser.add_argument("--concurrency", type=int, help="defaults to RESUME_PARSE_CONCURRENCY")
+    parser.add_argument("--packed", action="store_true", help="use packed multi-resume prompts")
+    parser.add_argument("--skip-upsert", action="store_true", help="do not write to the database")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    if args.batch_size:
+        report = run_batch(args)
+        print(json.dumps(report) if args.json else report)
+        return
+
+    reports = []
+    for batch_size in args.batch_sizes:
+        print(f"⏱️  Running batch of {batch_size}...")
+        completed = subprocess.run(_child_args(args, batch_size), capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(completed.stderr)
+            sys.exit(completed.returncode)
+        reports.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print_report(reports)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Intent routing benchmark: keyword rules vs local classifier vs LLM.
+
+Evaluates on the labelled examples in ``core/agents/intent_examples.json`` with
+stratified k-fold cross-validation, so the classifier is always scored on
+utterances it was not trained on. Reports accuracy, coverage (share of requests
+decided locally at the confidence threshold) and per-request latency for each
+path. ``--with-llm`` also scores the Gemini classifier (needs GEMINI_API_KEY;
+the response cache is disabled for the run).
+
+Run from ``backend/``::
+
+    python -m benchmarks.intent_router_bench
+    python -m benchmarks.intent_router_bench --folds 5 --threshold 0.5 --with-llm --llm-sample 40
+"""
+import argparse
+import json
+import os
+import random
+import time
+from typing import Dict, List, Tuple
+from core.llm.metrics import percentile
+
+def _folds(examples: Dict[str, List[str]], folds: int, seed: int) -> List[List[Tuple[str, str]]]:
+    """Stratified split into ``folds`` lists of (utterance, intent)"""
+    rng = random.Random(seed)
+    split: List[List[Tuple[str, str]]] = [[] for _ in range(folds)]
+    for intent, utterances in examples.items():
+        shuffled = list(utterances)
+        rng.shuffle(shuffled)
+        for index, utterance in enumerate(shuffled):
+            split[index % folds].append((utterance, intent))
+    return split
+
+def _summary(path: str, outcomes: List[Tuple[bool, float]], total: int) -> Dict:
+    latencies = [latency for _, latency in outcomes]
+    return {
+        "path": path,
+        "decided": len(outcomes),
+        "coverage": len(outcomes) / total if total else 0.0,
+        "accuracy": sum(correct for correct, _ in outcomes) / len(outcomes) if outcomes else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95)
+    }
+
+def evaluate_local(examples: Dict[str, List[str]], folds: int, threshold: float, seed: int) -> List[Dict]:
+    from core.agents.intent_router import IntentRouter
+
+    split = _folds(examples, folds, seed)
+    total = sum(len(fold) for fold in split)
+    rules, classifier, routed, deferred = [], [], [], []
+    for held_out in range(folds):
+        training: Dict[str, List[str]] = {intent: [] for intent in examples}
+        for index, fold in enumerate(split):
+            if index != held_out:
+                for utterance, intent in fold:
+                    training[intent].append(utterance)
+        router = IntentRouter(examples=training, threshold=threshold)
+        router.classify("warm up")  # train outside the timed region
+
+        for utterance, intent in split[held_out]:
+            start = time.perf_counter()
+            matched = router.match_rules(utterance)
+            elapsed = (time.perf_counter() - start) * 1000
+            if matched:
+                rules.append((matched[0] == intent, elapsed))
+
+            start = time.perf_counter()
+            classified = router.classify(utterance)
+            elapsed = (time.perf_counter() - start) * 1000
+            if classified:
+                classifier.append((classified[0] == intent, elapsed))
+
+            decision = router.route(utterance)
+            if decision["confident"]:
+                routed.append((decision["intent"] == intent, decision["latency_ms"]))
+            else:
+                deferred.append((decision["intent"] == intent, decision["latency_ms"]))
+
+    reports = [_summary("rules", rules, total)]
+    if classifier:
+        reports.append(_summary("classifier", classifier, total))
+    reports.append(_summary("local (confident)", routed, total))
+    reports.append(_summary("local (deferred)", deferred, total))
+    return reports
+
+def evaluate_llm(examples: Dict[str, List[str]], sample: int, seed: int) -> Dict:
+    os.environ["LLM_CACHE"] = "false"
+    from core.agents.intent_router import IntentRouter
+    from core.llm.client import get_llm
+
+    labelled = [(utterance, intent) for intent, utterances in examples.items() for utterance in utterances]
+    rng = random.Random(seed)
+    rng.shuffle(labelled)
+    labelled = labelled[:sample] if sample else labelled
+
+    llm = get_llm(temperature=0.7)
+    outcomes = []
+    for utterance, intent in labelled:
+        decision = IntentRouter.classify_with_llm(llm, utterance)
+        outcomes.append((decision["intent"] == intent, decision["latency_ms"]))
+    return _summary("llm", outcomes, len(labelled))
+
+def print_report(reports: List[Dict]):
+    print(f"\n{'path':<18} {'decided':>8} {'coverage':>9} {'accuracy':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for report in reports:
+        print(f"{report['path']:<18} {report['decided']:>8} {report['coverage']:>9.1%} {report['accuracy']:>9.1%} "
+              f"{report['p50_ms']:>9.3f} {report['p95_ms']:>9.3f}")
+
+def main():
+    from core.agents.intent_router import INTENT_CONFIDENCE_THRESHOLD, load_intent_examples
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--examples", help="labelled examples JSON, defaults to the shipped set")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=INTENT_CONFIDENCE_THRESHOLD)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--with-llm", action="store_true", help="also score the Gemini classifier")
+    parser.add_argument("--llm-sample", type=int, default=0, help="utterances sent to the LLM, 0 for all")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    examples = load_intent_examples(args.examples)
+    reports = evaluate_local(examples, args.folds, args.threshold, args.seed)
+    if args.with_llm:
+        reports.append(evaluate_llm(examples, args.llm_sample, args.seed))
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print_report(reports)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Cost of recommending jobs to new candidates and of publishing a job.
+
+* ingest:  a batch of candidates against every active job with
+           ``JobFeatureCache.recommend`` (what a resume upload without a job
+           runs), compared with scoring each pair in a Python loop
+* publish: one new job against every candidate with ``score_job`` (what a
+           published job runs before inserting itself into the lists it beats)
+
+Rows are synthetic; embeddings are random vectors of ``--dimension``.
+
+Run from ``backend/``::
+
+    python -m benchmarks.job_recommendations_bench --jobs 2000 --candidates 100000
+"""
+import argparse
+import random
+import time
+import numpy as np
+from core.tools.job_recommendations import JobFeatureCache, job_features, score_job
+from core.tools.match_scoring import experience_fit, skill_overlap
+
+def build_jobs(rng: random.Random, terms, count: int):
+    jobs = []
+    for job_id in range(1, count + 1):
+        skills = rng.sample(terms, 10)
+        jobs.append({
+            "id": job_id,
+            "title": f"Job {job_id}",
+            "required_skills": skills[:7],
+            "preferred_skills": skills[7:],
+            "min_experience_years": rng.choice([0, 2, 3, 5]),
+            "max_experience_years": rng.choice([None, 8, 12])
+        })
+    return jobs
+
+def build_candidates(rng: random.Random, terms, count: int):
+    return [
+        (candidate_id, rng.sample(terms, 15), round(rng.uniform(0, 15), 1), rng.uniform(20, 95))
+        for candidate_id in range(1, count + 1)
+    ]
+
+def loop_recommend(jobs, rows, limit: int):
+    requirements = [
+        ({s.lower() for s in job["required_skills"]}, {s.lower() for s in job["preferred_skills"]}, job["min_experience_years"])
+        for job in jobs
+    ]
+    for _, skills, years, _ in rows:
+        have = {s.lower() for s in skills}
+        scores = [
+            skill_overlap(required, preferred, have)[0] + experience_fit(years, min_years)
+            for required, preferred, min_years in requirements
+        ]
+        sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:limit]
+
+def run(jobs: int, candidates: int, batch: int, skills: int, dimension: int, limit: int, seed: int):
+    rng = random.Random(seed)
+    terms = [f"skill{i}" for i in range(skills)]
+    job_rows = build_jobs(rng, terms, jobs)
+    candidate_rows = build_candidates(rng, terms, candidates)
+    vectors = np.random.default_rng(seed).standard_normal((jobs + candidates, dimension)).astype(np.float32)
+    job_embeddings = {job["id"]: vectors[index] for index, job in enumerate(job_rows)}
+    candidate_embeddings = {row[0]: vectors[jobs + index] for index, row in enumerate(candidate_rows)}
+
+    cache = JobFeatureCache(max_age=0)
+    start = time.perf_counter()
+    cache.load(job_rows, job_embeddings)
+    cache.arrays()
+    print(f"{jobs} active jobs, {skills} distinct skills, {dimension}-d embeddings; "
+          f"cache build {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    ingest = candidate_rows[:batch]
+    start = time.perf_counter()
+    cache.recommend(ingest, candidate_embeddings, limit)
+    vectorized = time.perf_counter() - start
+    sample = ingest[:max(1, batch // 20)]
+    start = time.perf_counter()
+    loop_recommend(job_rows, sample, limit)
+    loop = (time.perf_counter() - start) * batch / len(sample)
+    print(f"ingest {batch} candidates x {jobs} jobs: vectorized {vectorized * 1000:8.1f} ms   "
+          f"python loop ~{loop * 1000:8.0f} ms (skills + experience only, extrapolated)")
+
+    features = job_features({**job_rows[0], "id": jobs + 1}, vectors[0])
+    start = time.perf_counter()
+    score_job(features, candidate_rows, candidate_embeddings)
+    print(f"publish 1 job x {candidates} candidates: {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--candidates", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=500, help="candidates in one ingested batch")
+    parser.add_argument("--skills", type=int, default=3000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.jobs, args.candidates, args.batch, args.skills, args.dimension, args.limit, args.seed)
@@ -0,0 +1,108 @@
+"""Candidate listing: keyset pages against OFFSET pages at increasing depth.
+
+Loads synthetic candidates into a scratch schema (``pagination_bench``) of the
+database in ``DATABASE_URL`` with the same ``(created_at, id)`` index as
+``candidates``, then times fetching one page of 50 at several depths:
+
+* offset: ``ORDER BY created_at DESC, id DESC OFFSET n LIMIT 50``, every column
+* keyset: ``WHERE (created_at, id) < (:created_at, :id)`` with the same order,
+          list columns only (resume text deferred)
+
+Run from ``backend/``::
+
+    python -m benchmarks.keyset_pagination_bench --rows 1000000
+"""
+import argparse
+import io
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import text
+from config.database import engine
+
+SCHEMA = "pagination_bench"
+PAGE_SIZE = 50
+DEPTHS = [1000, 10000, 100000, 500000]
+WORDS = "python kubernetes led team built data pipelines reduced latency platform customers migration".split()
+
+def load(rows: int, words: int, seed: int, batch: int = 50000):
+    rng = random.Random(seed)
+    epoch = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        connection.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        connection.execute(text(f"""
+            CREATE TABLE {SCHEMA}.candidates (
+                id serial PRIMARY KEY,
+                full_name varchar(255) NOT NULL,
+                status varchar(50),
+                overall_score float,
+                resume_text text,
+                created_at timestamptz NOT NULL
+            )
+        """))
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for start in range(0, rows, batch):
+            buffer = io.StringIO()
+            for index in range(start, min(start + batch, rows)):
+                resume = " ".join(rng.choice(WORDS) for _ in range(words))
+                # Three candidates per second, so the id tie-break matters
+                created_at = (epoch + timedelta(seconds=index // 3)).isoformat()
+                buffer.write(f"Candidate {index}\tnew\t{rng.random() * 100:.2f}\t{resume}\t{created_at}\n")
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY {SCHEMA}.candidates (full_name, status, overall_score, resume_text, created_at) "
+                               f"FROM STDIN", buffer)
+        raw.commit()
+    finally:
+        raw.close()
+
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE INDEX ON {SCHEMA}.candidates (created_at, id)"))
+        connection.execute(text(f"ANALYZE {SCHEMA}.candidates"))
+
+def timed(connection, statement, params, repeat: int):
+    samples, rows = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = connection.execute(text(statement), params).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), rows
+
+def run(rows: int, words: int, repeat: int, seed: int, keep: bool):
+    start = time.perf_counter()
+    load(rows, words, seed)
+    print(f"loaded {rows} candidates ({words} words of resume each) in {time.perf_counter() - start:.1f}s")
+
+    offset = (f"SELECT * FROM {SCHEMA}.candidates ORDER BY created_at DESC, id DESC "
+              f"OFFSET :offset LIMIT {PAGE_SIZE}")
+    boundary = (f"SELECT created_at, id FROM {SCHEMA}.candidates ORDER BY created_at DESC, id DESC "
+                f"OFFSET :offset LIMIT 1")
+    keyset = (f"SELECT id, full_name, status, overall_score, created_at FROM {SCHEMA}.candidates "
+              f"WHERE (created_at, id) < (:created_at, :id) ORDER BY created_at DESC, id DESC LIMIT {PAGE_SIZE}")
+    try:
+        with engine.connect() as connection:
+            for depth in [depth for depth in DEPTHS if depth < rows - PAGE_SIZE]:
+                offset_ms, offset_rows = timed(connection, offset, {"offset": depth}, repeat)
+                # The cursor a client would hold after reading ``depth`` rows
+                created_at, last_id = connection.execute(text(boundary), {"offset": depth - 1}).one()
+                keyset_ms, keyset_rows = timed(connection, keyset, {"created_at": created_at, "id": last_id}, repeat)
+                assert [row[0] for row in keyset_rows] == [row[0] for row in offset_rows], depth
+                print(f"page at row {depth:8d}   offset {offset_ms:8.1f} ms   keyset {keyset_ms:6.2f} ms")
+    finally:
+        if not keep:
+            with engine.begin() as connection:
+                connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--words", type=int, default=300, help="words of resume text per candidate")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="keep the pagination_bench schema afterwards")
+    args = parser.parse_args()
+    run(args.rows, args.words, args.repeat, args.seed, args.keep)
@@ -0,0 +1,62 @@
+"""AND/OR skill filter latency of the in-process skill index.
+
+Builds the index over synthetic candidates whose skills follow a Zipf-like
+distribution (a few very common skills, a long tail of rare ones) and times
+filters of increasing selectivity, compared with scanning every candidate's
+skill set in Python.
+
+Run from ``backend/``::
+
+    python -m benchmarks.skill_index_bench --candidates 1000000
+"""
+import argparse
+import random
+import time
+from core.tools.skill_index import SkillIndex
+
+QUERIES = [
+    {"all_of": ["skill0", "skill1"]},
+    {"all_of": ["skill0", "skill5", "skill10"]},
+    {"all_of": ["skill3", "skill1500"]},
+    {"all_of": ["skill0"], "any_of": ["skill100", "skill200"]},
+    {"any_of": ["skill20", "skill30", "skill40"]},
+]
+
+def build_rows(rng: random.Random, candidates: int, skills: int, per_candidate: int):
+    names = [f"skill{i}" for i in range(skills)]
+    weights = [1 / (i + 1) for i in range(skills)]
+    return [(i, set(rng.choices(names, weights, k=per_candidate))) for i in range(1, candidates + 1)]
+
+def scan(rows, all_of=(), any_of=()) -> int:
+    all_of, any_of = set(all_of), set(any_of)
+    return sum(1 for _, skills in rows if all_of <= skills and (not any_of or skills & any_of))
+
+def run(candidates: int, skills: int, per_candidate: int, repeat: int, seed: int):
+    rng = random.Random(seed)
+    rows = build_rows(rng, candidates, skills, per_candidate)
+    index = SkillIndex(max_age=0)
+    start = time.perf_counter()
+    index.refresh(lambda: rows, wait=True)
+    print(f"{candidates} candidates, {skills} skills, {per_candidate} draws per candidate; "
+          f"build {time.perf_counter() - start:.1f}s")
+
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            total = index.counts(**query)["total"]
+        indexed = (time.perf_counter() - start) / repeat
+        start = time.perf_counter()
+        expected = scan(rows, **query)
+        scanned = time.perf_counter() - start
+        assert total == expected, (query, total, expected)
+        print(f"{str(query):60s} {total:8d} matches   index {indexed * 1000:7.2f} ms   scan {scanned * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--candidates", type=int, default=1000000)
+    parser.add_argument("--skills", type=int, default=2000)
+    parser.add_argument("--per-candidate", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.candidates, args.skills, args.per_candidate, args.repeat, args.seed)
@@ -0,0 +1,136 @@
+"""Synthetic resume corpus for ingestion benchmarks.
+
+Generates deterministic PDF, DOCX and TXT resumes from one to ``max_pages``
+pages. PDFs are written directly (one Helvetica text stream per page) so the
+corpus needs nothing beyond python-docx.
+"""
+import io
+import random
+from typing import Dict, List
+import docx
+
+FIRST_NAMES = ["Aarav", "Maya", "Liam", "Sofia", "Noah", "Priya", "Ethan", "Zara", "Lucas", "Anika"]
+LAST_NAMES = ["Sharma", "Garcia", "Chen", "Okafor", "Müller", "Patel", "Kim", "Rossi", "Silva", "Nair"]
+CITIES = ["Pune, India", "Austin, TX", "Berlin, Germany", "Toronto, Canada", "Bangalore, India"]
+TITLES = ["Software Engineer", "Data Scientist", "DevOps Engineer", "Backend Developer", "ML Engineer"]
+COMPANIES = ["Acme Technologies", "Globex Systems", "Initech Inc", "Umbrella Corporation", "Hooli Ltd"]
+SKILLS = ["Python", "Java", "JavaScript", "React", "Node.js", "SQL", "PostgreSQL", "MongoDB", "AWS",
+          "Docker", "Kubernetes", "Git", "Machine Learning", "TensorFlow", "Django", "Flask", "REST", "CI/CD"]
+BULLETS = [
+    "Designed and shipped services handling millions of requests per day.",
+    "Reduced infrastructure cost by consolidating workloads onto Kubernetes.",
+    "Led a team of four engineers through a zero-downtime database migration.",
+    "Built data pipelines feeding dashboards used by the leadership team.",
+    "Mentored junior developers and introduced code review guidelines.",
+    "Improved API latency by profiling hot paths and adding caching.",
+]
+LINES_PER_PAGE = 48
+FORMATS = ["pdf", "docx", "txt"]
+
+def _ascii(name: str) -> str:
+    return name.lower().encode("ascii", errors="ignore").decode("ascii")
+
+def resume_lines(index: int, pages: int, rng: random.Random, run_id: str = "bench") -> List[str]:
+    """Plain resume lines spanning roughly ``pages`` pages"""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    lines = [
+        f"{first} {last}",
+        f"{_ascii(first)}.{_ascii(last)}.{run_id}.{index}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        rng.choice(CITIES),
+        "",
+        "SUMMARY",
+        f"{rng.choice(TITLES)} with {rng.randint(1, 15)} years of experience building reliable software.",
+        "",
+        "SKILLS",
+        ", ".join(rng.sample(SKILLS, 8)),
+        "",
+        "EXPERIENCE",
+    ]
+    target = pages * LINES_PER_PAGE - 8
+    year = 2024
+    while len(lines) < target:
+        lines.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} ({year - 2} - {year})")
+        lines.extend(f"- {rng.choice(BULLETS)}" for _ in range(rng.randint(3, 6)))
+        lines.append("")
+        year -= 2
+    lines.extend([
+        "EDUCATION",
+        "B.Tech in Computer Science, National Institute of Technology, 2012",
+        "",
+        "LANGUAGES",
+        "English, Hindi",
+    ])
+    return lines
+
+def _pdf_escape(line: str) -> str:
+    line = line.encode("latin-1", errors="replace").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def render_pdf(lines: List[str]) -> bytes:
+    """Minimal multi-page PDF with one text stream per page"""
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    objects: List[bytes] = []
+    page_ids = []
+    font_id = 3
+    for page_number, page_lines in enumerate(pages, 1):
+        body = ["BT", "/F1 10 Tf", "14 TL", "50 770 Td"]
+        body.extend(f"({_pdf_escape(line)}) Tj T*" for line in page_lines)
+        body.extend(["ET", f"BT /F1 8 Tf 290 30 Td (Page {page_number} of {len(pages)}) Tj ET"])
+        stream = "\n".join(body).encode("latin-1")
+        content_id = 4 + 2 * (page_number - 1)
+        page_ids.append(content_id + 1)
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (font_id, content_id))
+
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids)),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ] + objects
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, obj))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    out.writelines(b"%010d 00000 n \n" % offset for offset in offsets)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+def render_docx(lines: List[str]) -> bytes:
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+def render_txt(lines: List[str]) -> bytes:
+    return "\n".join(lines).encode("utf-8")
+
+RENDERERS = {"pdf": render_pdf, "docx": render_docx, "txt": render_txt}
+
+def generate_corpus(count: int, max_pages: int = 20, formats: List[str] = FORMATS,
+                    seed: int = 42, run_id: str = "bench") -> List[Dict]:
+    """``count`` upload dicts (``filename``, ``content``, ``pages``) cycling formats.
+
+    Page counts are skewed towards short resumes, like real uploads, with the
+    occasional long one up to ``max_pages``.
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(count):
+        file_format = formats[index % len(formats)]
+        pages = min(max_pages, max(1, int(rng.paretovariate(1.5))))
+        lines = resume_lines(index, pages, rng, run_id)
+        corpus.append({
+            "filename": f"resume_{index:05d}.{file_format}",
+            "content": RENDERERS[file_format](lines),
+            "pages": pages
+        })
+    return corpus
@@ -0,0 +1,196 @@
+import os
+import re
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+INTENTS = ["resume_analysis", "candidate_matching", "travel_optimization", "workflow_automation", "direct_response"]
+DEFAULT_INTENT = "direct_response"
+DEFAULT_EXAMPLES_PATH = Path(__file__).with_name("intent_examples.json")
+
+# Local decisions below this confidence are sent to the LLM
+INTENT_CONFIDENCE_THRESHOLD = float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", "0.6"))
+# "hybrid" (local first, LLM fallback), "local" (never call the LLM) or "llm" (always call it)
+INTENT_ROUTER_MODE = os.getenv("INTENT_ROUTER_MODE", "hybrid").lower()
+
+# Keyword rules: an utterance that hits exactly one intent is routed without a model
+INTENT_RULES: Dict[str, List[str]] = {
+    "resume_analysis": [
+        r"\bresumes?\b", r"\bcvs?\b", r"\bparse\b", r"\bcurriculum vitae\b",
+    ],
+    "candidate_matching": [
+        r"\bmatch(es|ing)?\b", r"\bshortlist\b(?!.*\b(email|send)\b)", r"\bbest (fit|candidates?|match)\b",
+        r"\brank\b", r"\btop \d* ?(candidates|applicants|matches|talent)\b", r"\bfit for\b",
+    ],
+    "travel_optimization": [
+        r"\bflights?\b", r"\bfly(ing)?\b", r"\bair(fare|line|port)s?\b", r"\btravel (options|costs?|plans?)\b",
+        r"\bitinerary\b", r"\bhotel\b", r"\b(?-i:[A-Z]{3}) to (?-i:[A-Z]{3})\b", r"\btrip\b",
+    ],
+    "workflow_automation": [
+        r"\b(re)?schedul(e|ing)\b", r"\bemails?\b", r"\bremind(er)?s?\b", r"\bfollow[- ]?up\b",
+        r"\bapprov(e|al)s?\b", r"\bcalendar\b", r"\bmeeting\b", r"\binvites?\b", r"\boffer letters?\b",
+        r"\b(update|change) (the )?(application )?status\b",
+    ],
+    "direct_response": [
+        r"^(hi|hello|hey|thanks|thank you|bye|good (morning|afternoon|evening))\b",
+        r"^what can you do\b", r"^who are you\b",
+    ],
+}
+# Rules fire on intent keywords, not full understanding, so their confidence is capped
+RULE_BASE_CONFIDENCE = 0.75
+RULE_MAX_CONFIDENCE = 0.95
+
+INTENT_PROMPT = """
+        Analyze this HR/Travel request from a {user_role}:
+        "{message}"
+
+        Classify intent as:
+        1. resume_analysis - uploading/analyzing resumes
+        2. candidate_matching - matching candidates to jobs
+        3. travel_optimization - flight search, travel booking
+        4. workflow_automation - scheduling, emails, approvals
+        5. direct_response - general questions, greetings
+
+        Respond with just the intent name.
+        """
+
+def load_intent_examples(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """Load ``{intent: [utterance]}`` training examples from JSON"""
+    with open(path or DEFAULT_EXAMPLES_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def parse_intent_label(text: str) -> Optional[str]:
+    """First known intent named in an LLM reply ("2. candidate_matching" included)"""
+    lowered = text.strip().lower().replace(" ", "_")
+    positions = [(lowered.find(intent), intent) for intent in INTENTS if intent in lowered]
+    return min(positions)[1] if positions else None
+
+class IntentRouter:
+    """Routes supervisor requests without an LLM call when it can.
+
+    Keyword rules handle unambiguous requests; a TF-IDF + logistic regression
+    classifier trained on the labelled examples handles the rest. Either path
+    returns a confidence, and callers fall back to the LLM below the threshold.
+    scikit-learn is optional: without it only the rules run locally.
+    """
+
+    def __init__(self, examples: Optional[Dict[str, List[str]]] = None,
+                 threshold: float = INTENT_CONFIDENCE_THRESHOLD):
+        self.examples = examples if examples is not None else load_intent_examples(os.getenv("INTENT_EXAMPLES_PATH"))
+        self.threshold = threshold
+        self._rules = {
+            intent: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for intent, patterns in INTENT_RULES.items()
+        }
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._model_failed = False
+
+    def match_rules(self, message: str) -> Optional[Tuple[str, float]]:
+        """Intent and confidence if the rules point at exactly one intent"""
+        text = message.strip()
+        hits = {
+            intent: sum(1 for pattern in patterns if pattern.search(text))
+            for intent, patterns in self._rules.items()
+        }
+        hits = {intent: count for intent, count in hits.items() if count}
+        if len(hits) != 1:
+            return None
+        intent, count = next(iter(hits.items()))
+        # Greetings only count on their own, not as the opener of a real request
+        if intent == "direct_response" and len(text.split()) > 6:
+            return None
+        return intent, min(RULE_MAX_CONFIDENCE, RULE_BASE_CONFIDENCE + 0.1 * count)
+
+    def _classifier(self):
+        if self._model is not None or self._model_failed:
+            return self._model
+        with self._model_lock:
+            if self._model is None and not self._model_failed:
+                try:
+                    self._model = self._train(self.examples)
+                except ImportError:
+                    print("⚠️ scikit-learn not installed, intent routing uses keyword rules only")
+                    self._model_failed = True
+        return self._model
+
+    @staticmethod
+    def _train(examples: Dict[str, List[str]]):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import make_pipeline, make_union
+
+        texts = [text for intent in examples for text in examples[intent]]
+        labels = [intent for intent in examples for _ in examples[intent]]
+        # Word n-grams carry the meaning; character n-grams absorb typos and inflections
+        model = make_pipeline(
+            make_union(
+                TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True),
+                TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4), sublinear_tf=True)
+            ),
+            LogisticRegression(C=10.0, max_iter=1000)
+        )
+        model.fit(texts, labels)
+        return model
+
+    def classify(self, message: str) -> Optional[Tuple[str, float]]:
+        """Classifier intent and probability, or None without scikit-learn"""
+        model = self._classifier()
+        if model is None:
+            return None
+        probabilities = model.predict_proba([message])[0]
+        best = probabilities.argmax()
+        return model.classes_[best], float(probabilities[best])
+
+    def route(self, message: str) -> Dict:
+        """Best local decision: ``{"intent", "confidence", "path", "confident", "latency_ms"}``.
+
+        ``path`` is "rules", "classifier" or "default" (nothing matched);
+        ``confident`` says whether the decision clears the threshold or should
+        be confirmed by the LLM.
+        """
+        start = time.perf_counter()
+        decision = {"intent": DEFAULT_INTENT, "confidence": 0.0, "path": "default"}
+        matched = self.match_rules(message)
+        if matched:
+            decision = {"intent": matched[0], "confidence": matched[1], "path": "rules"}
+        if decision["confidence"] < self.threshold:
+            classified = self.classify(message)
+            if classified and classified[1] > decision["confidence"]:
+                decision = {"intent": classified[0], "confidence": classified[1], "path": "classifier"}
+        decision["confidence"] = round(decision["confidence"], 4)
+        decision["confident"] = decision["confidence"] >= self.threshold
+        decision["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        return decision
+
+    @staticmethod
+    def classify_with_llm(llm, message: str, user_role: str = "hr_manager") -> Dict:
+        """LLM decision in the same shape as ``route``"""
+        start = time.perf_counter()
+        response = llm.invoke([_human_message(INTENT_PROMPT.format(user_role=user_role, message=message))],
+                              call_site="supervisor.analyze_intent")
+        intent = parse_intent_label(response.content)
+        return {
+            "intent": intent or DEFAULT_INTENT,
+            "confidence": 1.0 if intent else 0.0,
+            "path": "llm",
+            "confident": intent is not None,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 3)
+        }
+
+def _human_message(content: str):
+    from langchain_core.messages import HumanMessage
+    return HumanMessage(content=content)
+
+_router: Optional[IntentRouter] = None
+_router_lock = threading.Lock()
+
+def get_intent_router() -> IntentRouter:
+    """Process-wide router; the classifier is trained on first use"""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = IntentRouter()
+        return _router
@@ -1,27 +1,25 @@
 from langgraph.graph import StateGraph, START, END
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langgraph.config import get_stream_writer
+from core.llm.client import get_llm
 from langchain_core.messages import HumanMessage, AIMessage
 from core.graph.state import NaviHireState
+from core.agents.intent_router import INTENT_ROUTER_MODE, get_intent_router
 from core.nodes.resume_analysis_node import ResumeAnalysisNode
 from core.nodes.candidate_matching_node import CandidateMatchingNode
 from core.nodes.travel_optimization_node import TravelOptimizationNode
 from core.nodes.workflow_automation_node import WorkflowAutomationNode
-import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
 class NaviHireSupervisor:
     def __init__(self):
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
+        self.llm = get_llm(temperature=0.7)
+        # Replay and stub backends (LLM_BACKEND) run without an API key
+        if not self.llm.available:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
             
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            temperature=0.7,
-            google_api_key=api_key 
-        )
+        self.intent_router = get_intent_router()
         
         # Initialize nodes
         self.resume_node = ResumeAnalysisNode()
@@ -69,28 +67,30 @@ class NaviHireSupervisor:
         return workflow.compile()
     
     def analyze_intent(self, state: NaviHireState) -> NaviHireState:
-        """Analyze user intent and determine routing"""
+        """Analyze user intent and determine routing.
+
+        Keyword rules and the local classifier decide first; the LLM is only
+        asked when they are not confident enough (or ``INTENT_ROUTER_MODE=llm``).
+        """
         last_message = state["messages"][-1].content
         user_role = state.get("user_role", "hr_manager")
         
-        intent_prompt = f"""
-        Analyze this HR/Travel request from a {user_role}:
-        "{last_message}"
-        
-        Classify intent as:
-        1. resume_analysis - uploading/analyzing resumes
-        2. candidate_matching - matching candidates to jobs
-        3. travel_optimization - flight search, travel booking
-        4. workflow_automation - scheduling, emails, approvals
-        5. direct_response - general questions, greetings
-        
-        Respond with just the intent name.
-        """
-        
-        response = self.llm.invoke([HumanMessage(content=intent_prompt)])
-        intent = response.content.strip().lower()
-        
-        state["next_action"] = intent
+        decision = None
+        if INTENT_ROUTER_MODE != "llm":
+            decision = self.intent_router.route(last_message)
+        
+        if decision is None or (not decision["confident"] and INTENT_ROUTER_MODE != "local"):
+            try:
+                llm_decision = self.intent_router.classify_with_llm(self.llm, last_message, user_role)
+                if llm_decision["confident"] or decision is None:
+                    decision = llm_decision
+            except Exception as e:
+                print(f"⚠️ LLM intent analysis failed, using local routing: {e}")
+                if decision is None:
+                    decision = self.intent_router.route(last_message)
+        
+        state["next_action"] = decision["intent"]
+        state["intent_routing"] = decision
         return state
     
     def route_based_on_intent(self, state: NaviHireState) -> str:
@@ -98,7 +98,7 @@ class NaviHireSupervisor:
         return state.get("next_action", "direct_response")
     
     def generate_response(self, state: NaviHireState) -> NaviHireState:
-        """Generate final response to user"""
+        """Generate final response to user, streaming tokens to the graph's stream writer"""
         last_message = state["messages"][-1].content
         task_results = state.get("task_progress", {})
         
@@ -110,7 +110,12 @@ class NaviHireSupervisor:
         Be helpful, professional, and action-oriented.
         """
         
-        response = self.llm.invoke([HumanMessage(content=response_prompt)])
-        state["messages"].append(AIMessage(content=response.content))
+        # Tokens go to "custom" stream mode consumers as they arrive; plain invoke ignores them
+        write = get_stream_writer()
+        chunks = []
+        for chunk in self.llm.stream([HumanMessage(content=response_prompt)], call_site="supervisor.generate_response"):
+            chunks.append(chunk)
+            write({"type": "token", "node": "response_generation", "content": chunk})
+        state["messages"].append(AIMessage(content="".join(chunks)))
         
         return state
\ No newline at end of file
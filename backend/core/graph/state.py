@@ -25,6 +25,7 @@ class NaviHireState(TypedDict):
     # Workflow State
     current_task: Optional[str]
     next_action: Optional[str]
+    intent_routing: Optional[Dict[str, Any]]  # how next_action was decided: rules, classifier or llm
     task_progress: Dict[str, Any]
     
     # Analytics
@@ -0,0 +1,255 @@
+import asyncio
+import json
+import math
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from langchain_core.messages import AIMessage, BaseMessage
+from core.llm.cache import LLMResponseCache
+from core.llm.synthetic import synthesize
+
+# "gemini" (default), "record" (Gemini, saving every exchange), "replay" (recorded
+# responses, synthetic on a miss) or "stub" (synthetic responses only)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini").lower()
+LLM_RECORDINGS_PATH = os.getenv("LLM_RECORDINGS_PATH", "recordings/llm_recordings.jsonl")
+# Replay misses: "synthetic" answers them, "error" raises ReplayMissError
+LLM_REPLAY_MISS = os.getenv("LLM_REPLAY_MISS", "synthetic").lower()
+# Simulated latency for replay/stub, e.g. "fixed:0.8", "uniform:0.3,1.2",
+# "normal:0.8,0.2", "lognormal:0.8,0.5" (median, sigma) or "recorded"
+LLM_STUB_LATENCY = os.getenv("LLM_STUB_LATENCY", "fixed:0")
+LLM_STUB_SEED = int(os.getenv("LLM_STUB_SEED", "42"))
+
+class ReplayMissError(Exception):
+    """Raised in strict replay when a prompt has no recording"""
+
+def _usage(prompt_text: str, response_text: str) -> Dict[str, int]:
+    input_tokens = len(prompt_text) // 4 + 1
+    output_tokens = len(response_text) // 4 + 1
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens}
+
+def _prompt_text(messages: List[BaseMessage]) -> str:
+    return "\n".join(str(m.content) for m in messages)
+
+class LatencyModel:
+    """Seeded latency distribution parsed from a spec like ``lognormal:0.8,0.5``"""
+
+    def __init__(self, spec: str = LLM_STUB_LATENCY, seed: int = LLM_STUB_SEED):
+        self.spec = spec
+        name, _, params = spec.partition(":")
+        self.kind = name.strip().lower()
+        self.params = [float(p) for p in params.split(",") if p.strip()]
+        if self.kind not in ("fixed", "uniform", "normal", "lognormal", "recorded"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self, recorded: Optional[float] = None) -> float:
+        p = self.params
+        with self._lock:
+            if self.kind == "recorded":
+                return recorded or 0.0
+            if self.kind == "fixed":
+                return p[0] if p else 0.0
+            if self.kind == "uniform":
+                return self._rng.uniform(p[0], p[1])
+            if self.kind == "normal":
+                return max(0.0, self._rng.gauss(p[0], p[1]))
+            # lognormal: median and sigma of the underlying normal
+            return self._rng.lognormvariate(math.log(p[0]), p[1])
+
+class RecordingStore:
+    """Prompt/response pairs in a JSONL file, keyed like the response cache"""
+
+    def __init__(self, path: str = LLM_RECORDINGS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[Dict]] = defaultdict(list)
+        self._cursor: Dict[str, int] = defaultdict(int)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]].append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def record(self, key: str, call_site: str, model: str, temperature: float,
+               messages: List[BaseMessage], response: str, latency: float):
+        entry = {
+            "key": key,
+            "call_site": call_site,
+            "model": model,
+            "temperature": temperature,
+            "prompt": [[getattr(m, "type", "human"), str(m.content)] for m in messages],
+            "response": response,
+            "latency_seconds": round(latency, 4),
+            "recorded_at": datetime.now().isoformat()
+        }
+        with self._lock:
+            self._entries[key].append(entry)
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """Next recording for ``key``, cycling when a prompt was recorded several times"""
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            entry = entries[self._cursor[key] % len(entries)]
+            self._cursor[key] += 1
+            return entry
+
+class GeminiBackend:
+    """ChatGoogleGenerativeAI behind the backend interface"""
+
+    def __init__(self, model: str, temperature: float, timeout: float):
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        from core.llm.client import LLMUnavailableError
+
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise LLMUnavailableError("GEMINI_API_KEY not found in environment variables")
+        self.chat_model = ChatGoogleGenerativeAI(
+            model=model,
+            temperature=temperature,
+            google_api_key=api_key,
+            timeout=timeout,
+            max_retries=0  # retries are handled by LLMClient, with jitter
+        )
+
+    def invoke(self, messages: List[BaseMessage], call_site: str) -> BaseMessage:
+        return self.chat_model.invoke(messages)
+
+    async def ainvoke(self, messages: List[BaseMessage], call_site: str) -> BaseMessage:
+        return await self.chat_model.ainvoke(messages)
+
+    def stream(self, messages: List[BaseMessage], call_site: str) -> Iterator[str]:
+        for chunk in self.chat_model.stream(messages):
+            if isinstance(chunk.content, str) and chunk.content:
+                yield chunk.content
+
+class RecordingBackend:
+    """Delegates to another backend and saves every exchange to a RecordingStore"""
+
+    def __init__(self, inner, store: RecordingStore, model: str, temperature: float):
+        self.inner = inner
+        self.store = store
+        self.model = model
+        self.temperature = temperature
+
+    def _record(self, messages: List[BaseMessage], call_site: str, content, latency: float):
+        if isinstance(content, str):
+            key = LLMResponseCache.make_key(messages, self.model, self.temperature)
+            self.store.record(key, call_site, self.model, self.temperature, messages, content, latency)
+
+    def invoke(self, messages: List[BaseMessage], call_site: str) -> BaseMessage:
+        start = time.perf_counter()
+        response = self.inner.invoke(messages, call_site)
+        self._record(messages, call_site, response.content, time.perf_counter() - start)
+        return response
+
+    async def ainvoke(self, messages: List[BaseMessage], call_site: str) -> BaseMessage:
+        start = time.perf_counter()
+        response = await self.inner.ainvoke(messages, call_site)
+        self._record(messages, call_site, response.content, time.perf_counter() - start)
+        return response
+
+    def stream(self, messages: List[BaseMessage], call_site: str) -> Iterator[str]:
+        start = time.perf_counter()
+        chunks = []
+        for chunk in self.inner.stream(messages, call_site):
+            chunks.append(chunk)
+            yield chunk
+        self._record(messages, call_site, "".join(chunks), time.perf_counter() - start)
+
+class ReplayBackend:
+    """Serves recorded responses, and synthetic ones when there is no recording.
+
+    With no store (``LLM_BACKEND=stub``) every response is synthetic. Latency
+    comes from the configured distribution, or from the recording itself.
+    """
+
+    def __init__(self, store: Optional[RecordingStore], latency: LatencyModel, model: str,
+                 temperature: float, miss: str = LLM_REPLAY_MISS):
+        self.store = store
+        self.latency = latency
+        self.model = model
+        self.temperature = temperature
+        self.miss = miss
+
+    def _respond(self, messages: List[BaseMessage], call_site: str):
+        prompt = _prompt_text(messages)
+        entry = None
+        if self.store is not None:
+            entry = self.store.lookup(LLMResponseCache.make_key(messages, self.model, self.temperature))
+            if entry is None and self.miss == "error":
+                raise ReplayMissError(f"No recorded response for {call_site}")
+        content = entry["response"] if entry else synthesize(prompt, call_site)
+        delay = self.latency.sample(entry.get("latency_seconds") if entry else None)
+        message = AIMessage(
+            content=content,
+            response_metadata={"backend": "replay" if entry else "synthetic"},
+            usage_metadata=_usage(prompt, content)
+        )
+        return message, delay
+
+    def invoke(self, messages: List[BaseMessage], call_site: str) -> BaseMessage:
+        message, delay = self._respond(messages, call_site)
+        time.sleep(delay)
+        return message
+
+    async def ainvoke(self, messages: List[BaseMessage], call_site: str) -> BaseMessage:
+        message, delay = self._respond(messages, call_site)
+        await asyncio.sleep(delay)
+        return message
+
+    def stream(self, messages: List[BaseMessage], call_site: str) -> Iterator[str]:
+        message, delay = self._respond(messages, call_site)
+        words = message.content.split(" ")
+        # Spread the latency over the chunks so streaming consumers see a realistic cadence
+        for index, word in enumerate(words):
+            time.sleep(delay / len(words))
+            yield word if index == len(words) - 1 else word + " "
+
+_store: Optional[RecordingStore] = None
+_latency: Optional[LatencyModel] = None
+_lock = threading.Lock()
+
+def _shared_store() -> RecordingStore:
+    global _store
+    with _lock:
+        if _store is None:
+            _store = RecordingStore()
+        return _store
+
+def _shared_latency() -> LatencyModel:
+    global _latency
+    with _lock:
+        if _latency is None:
+            _latency = LatencyModel()
+        return _latency
+
+def backend_available(backend: str = LLM_BACKEND) -> bool:
+    """Replay and stub never need network access or an API key"""
+    return backend in ("replay", "stub") or bool(os.getenv("GEMINI_API_KEY"))
+
+def create_backend(model: str, temperature: float, timeout: float, backend: str = LLM_BACKEND):
+    """Backend selected by ``LLM_BACKEND`` for one model/temperature/timeout"""
+    if backend == "gemini":
+        return GeminiBackend(model, temperature, timeout)
+    if backend == "record":
+        return RecordingBackend(GeminiBackend(model, temperature, timeout), _shared_store(), model, temperature)
+    if backend == "replay":
+        return ReplayBackend(_shared_store(), _shared_latency(), model, temperature)
+    if backend == "stub":
+        return ReplayBackend(None, _shared_latency(), model, temperature)
+    raise ValueError(f"Unknown LLM_BACKEND: {backend}")
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "true").lower() not in ("0", "false", "no")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2048"))
+# Seconds a response is reused for call sites without their own TTL. Caching is
+# opt-in: 0 keeps generative calls (emails, analyses, chat replies) fresh on every call
+LLM_CACHE_DEFAULT_TTL = float(os.getenv("LLM_CACHE_DEFAULT_TTL", "0"))
+# Optional shared tier; falls back to REDIS_URL, "false" keeps the cache in-process
+LLM_CACHE_REDIS_URL = os.getenv("LLM_CACHE_REDIS_URL", os.getenv("REDIS_URL", ""))
+REDIS_KEY_PREFIX = "navihire:llm:"
+# After a Redis error the tier is skipped for this long instead of failing every call
+REDIS_RETRY_SECONDS = 60
+
+DAY = 24 * 3600
+
+# Call sites whose answer depends only on the prompt, with their TTLs in seconds.
+# Resume parsing is left out because the resume parse cache already keys it by content
+CALL_SITE_TTLS: Dict[str, float] = {
+    # IATA codes do not change
+    "main.get_airport_code": 30 * DAY,
+    "supervisor.analyze_intent": DAY,
+    "jd_generator.generate_job_description": DAY,
+    "jd_generator.optimize_jd_for_sourcing": DAY,
+    # Classification and field extraction from the user's request
+    "workflow_automation.analyze_automation_request": 3600,
+    "workflow_automation.handle_travel_approval": 3600,
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip()
+
+class LLMResponseCache:
+    """Two-tier cache of LLM responses keyed on normalized prompt, model and temperature.
+
+    The first tier is an in-process LRU with per-entry expiry; the optional second
+    tier is Redis, shared between workers and restarts. Only response text is
+    stored. Hits and misses are counted per call site.
+    """
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES, redis_url: str = LLM_CACHE_REDIS_URL,
+                 enabled: bool = LLM_CACHE_ENABLED):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"memory_hits": 0, "redis_hits": 0, "misses": 0})
+        self._redis = None
+        self._redis_disabled_until = 0.0
+
+        if enabled and redis_url and redis_url.lower() not in ("0", "false", "no"):
+            try:
+                import redis
+                self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+            except Exception as e:
+                print(f"⚠️ LLM cache Redis tier unavailable: {e}")
+
+    @property
+    def blocking(self) -> bool:
+        """True when lookups may hit Redis (network I/O)"""
+        return self._redis_ready()
+
+    @staticmethod
+    def make_key(messages: List, model: str, temperature: float) -> str:
+        payload = json.dumps({
+            "model": model,
+            "temperature": temperature,
+            "messages": [[getattr(m, "type", "human"), _normalize(str(m.content))] for m in messages]
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, call_site: str, override: Optional[float] = None) -> float:
+        if not self.enabled:
+            return 0
+        if override is not None:
+            return override
+        return CALL_SITE_TTLS.get(call_site, LLM_CACHE_DEFAULT_TTL)
+
+    def get(self, key: str, call_site: str) -> Optional[Tuple[str, str]]:
+        """Cached text and the tier it came from, or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._stats[call_site]["memory_hits"] += 1
+                return entry[1], "memory"
+            if entry:
+                del self._entries[key]
+
+        content, ttl = self._redis_get(key)
+        with self._lock:
+            if content is None:
+                self._stats[call_site]["misses"] += 1
+                return None
+            self._stats[call_site]["redis_hits"] += 1
+        self._remember(key, content, ttl)
+        return content, "redis"
+
+    def set(self, key: str, content: str, ttl: float):
+        if ttl <= 0:
+            return
+        self._remember(key, content, ttl)
+        if self._redis_ready():
+            try:
+                self._redis.setex(REDIS_KEY_PREFIX + key, int(max(1, ttl)), content)
+            except Exception as e:
+                self._redis_failed(e)
+
+    def _remember(self, key: str, content: str, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _redis_get(self, key: str) -> Tuple[Optional[str], float]:
+        if not self._redis_ready():
+            return None, 0
+        try:
+            pipe = self._redis.pipeline()
+            pipe.get(REDIS_KEY_PREFIX + key)
+            pipe.ttl(REDIS_KEY_PREFIX + key)
+            value, ttl = pipe.execute()
+            if value is None:
+                return None, 0
+            return value.decode("utf-8"), max(1, ttl or 1)
+        except Exception as e:
+            self._redis_failed(e)
+            return None, 0
+
+    def _redis_ready(self) -> bool:
+        return self._redis is not None and time.time() >= self._redis_disabled_until
+
+    def _redis_failed(self, error: Exception):
+        print(f"⚠️ LLM cache Redis error, using memory only for {REDIS_RETRY_SECONDS}s: {error}")
+        self._redis_disabled_until = time.time() + REDIS_RETRY_SECONDS
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            call_sites = {}
+            totals = {"memory_hits": 0, "redis_hits": 0, "misses": 0}
+            for call_site, counts in self._stats.items():
+                lookups = sum(counts.values())
+                call_sites[call_site] = {
+                    **counts,
+                    "hit_rate": round((counts["memory_hits"] + counts["redis_hits"]) / lookups, 4) if lookups else 0.0
+                }
+                for name, value in counts.items():
+                    totals[name] += value
+            lookups = sum(totals.values())
+            return {
+                "enabled": self.enabled,
+                "redis_tier": self._redis is not None,
+                "redis_available": self._redis_ready(),
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                **totals,
+                "hit_rate": round((totals["memory_hits"] + totals["redis_hits"]) / lookups, 4) if lookups else 0.0,
+                "call_sites": call_sites
+            }
+
+response_cache = LLMResponseCache()
@@ -0,0 +1,264 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from core.llm.backends import LLM_BACKEND, backend_available, create_backend
+from core.llm.cache import response_cache
+from core.llm.metrics import llm_metrics
+
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+# Gemini requests in flight across the whole process (sync and async callers)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# Per-request timeout and retry policy
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+
+# Transient failures worth retrying: rate limits, overload, timeouts, dropped connections
+RETRYABLE_ERRORS = (
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+    "DeadlineExceeded", "GatewayTimeout", "TimeoutError", "ConnectionError", "LLMTimeoutError"
+)
+RETRYABLE_MARKERS = ("429", "500", "502", "503", "504", "rate limit", "quota", "timed out", "timeout")
+
+Prompt = Union[str, List[BaseMessage]]
+
+class LLMUnavailableError(Exception):
+    """Raised when no Gemini API key is configured"""
+
+class LLMTimeoutError(Exception):
+    """Raised when a single LLM request exceeds its timeout"""
+
+class _ConcurrencyLimit:
+    """Process-wide cap on concurrent requests, usable from threads and coroutines"""
+
+    def __init__(self, limit: int):
+        self._semaphore = threading.BoundedSemaphore(max(1, limit))
+
+    def acquire(self):
+        self._semaphore.acquire()
+
+    async def acquire_async(self):
+        # Polling keeps the event loop free and never leaks a slot on cancellation
+        delay = 0.001
+        while not self._semaphore.acquire(blocking=False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+    def release(self):
+        self._semaphore.release()
+
+_limit = _ConcurrencyLimit(LLM_MAX_CONCURRENCY)
+_backends: Dict[Tuple[str, float, float], object] = {}
+_clients: Dict[Tuple[str, float, float], "LLMClient"] = {}
+_lock = threading.Lock()
+
+def _as_messages(prompt: Prompt) -> List[BaseMessage]:
+    return [HumanMessage(content=prompt)] if isinstance(prompt, str) else prompt
+
+def _is_retryable(error: Exception) -> bool:
+    if type(error).__name__ in RETRYABLE_ERRORS:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in RETRYABLE_MARKERS)
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff"""
+    return random.uniform(0, min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * (2 ** attempt)))
+
+class LLMClient:
+    """Shared Gemini chat client.
+
+    The underlying backend (for Gemini, a ``ChatGoogleGenerativeAI`` and its
+    HTTP/gRPC channel) is created once per model/temperature/timeout and reused
+    by every caller; ``LLM_BACKEND`` swaps in the recorder, replay or stub. All
+    requests pass through the process-wide concurrency limit and are retried on
+    transient errors with jittered backoff, and responses are served from the
+    shared response cache where the call site allows it. ``invoke`` serves the
+    synchronous graph nodes and tools; ``ainvoke`` is for code on the event loop.
+    """
+
+    def __init__(self, model: str = GEMINI_MODEL, temperature: float = 0.7,
+                 timeout: float = LLM_TIMEOUT_SECONDS, max_retries: int = LLM_MAX_RETRIES):
+        self.model = model
+        self.temperature = temperature
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+    @property
+    def available(self) -> bool:
+        return backend_available(LLM_BACKEND)
+
+    def _backend(self):
+        key = (self.model, self.temperature, self.timeout)
+        with _lock:
+            backend = _backends.get(key)
+            if backend is None:
+                backend = create_backend(self.model, self.temperature, self.timeout)
+                _backends[key] = backend
+            return backend
+
+    def _cache_lookup(self, messages: List[BaseMessage], call_site: str,
+                      cache_ttl: Optional[float]) -> Tuple[Optional[str], float, Optional[BaseMessage]]:
+        ttl = response_cache.ttl_for(call_site, cache_ttl)
+        if ttl <= 0:
+            return None, 0, None
+        key = response_cache.make_key(messages, self.model, self.temperature)
+        cached = response_cache.get(key, call_site)
+        if cached is None:
+            return key, ttl, None
+        content, tier = cached
+        return key, ttl, AIMessage(content=content, response_metadata={"cache": tier})
+
+    @staticmethod
+    def _cache_store(key: Optional[str], ttl: float, response: BaseMessage):
+        if key and isinstance(response.content, str) and response.content:
+            response_cache.set(key, response.content, ttl)
+
+    def _account(self, call_site: str, messages: List[BaseMessage], response: Optional[BaseMessage],
+                 started: float, cache: str):
+        """Record tokens, latency and cache status of one call in the LLM metrics"""
+        latency_ms = (time.perf_counter() - started) * 1000
+        if response is None or cache in ("memory", "redis"):
+            # Errors and cache hits are not billed
+            llm_metrics.record(call_site, self.model, 0, 0, latency_ms, cache)
+            return
+        usage = getattr(response, "usage_metadata", None) or {}
+        input_tokens, output_tokens = usage.get("input_tokens"), usage.get("output_tokens")
+        estimated = input_tokens is None or output_tokens is None
+        if input_tokens is None:
+            input_tokens = sum(len(str(m.content)) for m in messages) // 4 + 1
+        if output_tokens is None:
+            output_tokens = len(str(response.content)) // 4 + 1
+        llm_metrics.record(call_site, self.model, input_tokens, output_tokens, latency_ms, cache, estimated)
+
+    def invoke(self, prompt: Prompt, call_site: str = "default",
+               cache_ttl: Optional[float] = None) -> BaseMessage:
+        """Blocking call; returns the model's message (``.content`` holds the text).
+        
+        Responses are cached only for call sites listed in ``CALL_SITE_TTLS``, or when ``cache_ttl`` is given.
+        """
+        started = time.perf_counter()
+        messages = _as_messages(prompt)
+        key, ttl, cached = self._cache_lookup(messages, call_site, cache_ttl)
+        if cached is not None:
+            self._account(call_site, messages, cached, started, cached.response_metadata["cache"])
+            return cached
+        try:
+            response = self._invoke_model(messages, call_site)
+        except Exception:
+            self._account(call_site, messages, None, started, "error")
+            raise
+        self._cache_store(key, ttl, response)
+        self._account(call_site, messages, response, started, "miss" if key else "bypass")
+        return response
+
+    async def ainvoke(self, prompt: Prompt, call_site: str = "default",
+                      cache_ttl: Optional[float] = None) -> BaseMessage:
+        """Async call with the same cache, limits, retries and a hard per-request timeout"""
+        started = time.perf_counter()
+        messages = _as_messages(prompt)
+        # The Redis tier does blocking I/O, so it is accessed off the event loop
+        if response_cache.blocking:
+            key, ttl, cached = await asyncio.to_thread(self._cache_lookup, messages, call_site, cache_ttl)
+        else:
+            key, ttl, cached = self._cache_lookup(messages, call_site, cache_ttl)
+        if cached is not None:
+            self._account(call_site, messages, cached, started, cached.response_metadata["cache"])
+            return cached
+        try:
+            response = await self._ainvoke_model(messages, call_site)
+        except Exception:
+            self._account(call_site, messages, None, started, "error")
+            raise
+        if response_cache.blocking:
+            await asyncio.to_thread(self._cache_store, key, ttl, response)
+        else:
+            self._cache_store(key, ttl, response)
+        self._account(call_site, messages, response, started, "miss" if key else "bypass")
+        return response
+
+    def stream(self, prompt: Prompt, call_site: str = "default",
+               cache_ttl: Optional[float] = None) -> Iterator[str]:
+        """Blocking generator of text chunks as the model produces them.
+
+        A cache hit is yielded as a single chunk. Transient errors are retried
+        only until the first chunk has been yielded; the full text is cached.
+        """
+        started = time.perf_counter()
+        messages = _as_messages(prompt)
+        key, ttl, cached = self._cache_lookup(messages, call_site, cache_ttl)
+        if cached is not None:
+            self._account(call_site, messages, cached, started, cached.response_metadata["cache"])
+            yield cached.content
+            return
+
+        backend = self._backend()
+        chunks: List[str] = []
+        for attempt in range(self.max_retries + 1):
+            _limit.acquire()
+            try:
+                for chunk in backend.stream(messages, call_site):
+                    chunks.append(chunk)
+                    yield chunk
+                break
+            except Exception as e:
+                if chunks or attempt >= self.max_retries or not _is_retryable(e):
+                    self._account(call_site, messages, None, started, "error")
+                    raise
+                delay = _backoff(attempt)
+                print(f"⚠️ LLM stream {call_site} failed ({e}), retrying in {delay:.1f}s")
+            finally:
+                _limit.release()
+            time.sleep(delay)
+        response = AIMessage(content="".join(chunks))
+        self._cache_store(key, ttl, response)
+        self._account(call_site, messages, response, started, "miss" if key else "bypass")
+
+    def _invoke_model(self, messages: List[BaseMessage], call_site: str) -> BaseMessage:
+        backend = self._backend()
+        for attempt in range(self.max_retries + 1):
+            _limit.acquire()
+            try:
+                return backend.invoke(messages, call_site)
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    raise
+                delay = _backoff(attempt)
+                print(f"⚠️ LLM call {call_site} failed ({e}), retrying in {delay:.1f}s")
+            finally:
+                _limit.release()
+            time.sleep(delay)
+
+    async def _ainvoke_model(self, messages: List[BaseMessage], call_site: str) -> BaseMessage:
+        backend = self._backend()
+        for attempt in range(self.max_retries + 1):
+            await _limit.acquire_async()
+            try:
+                try:
+                    return await asyncio.wait_for(backend.ainvoke(messages, call_site), self.timeout)
+                except asyncio.TimeoutError:
+                    raise LLMTimeoutError(f"LLM call {call_site} timed out after {self.timeout}s")
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    raise
+                delay = _backoff(attempt)
+                print(f"⚠️ LLM call {call_site} failed ({e}), retrying in {delay:.1f}s")
+            finally:
+                _limit.release()
+            await asyncio.sleep(delay)
+
+def get_llm(temperature: float = 0.7, model: str = GEMINI_MODEL,
+            timeout: Optional[float] = None) -> LLMClient:
+    """Shared client for a model/temperature/timeout combination"""
+    key = (model, temperature, timeout or LLM_TIMEOUT_SECONDS)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = LLMClient(model=model, temperature=temperature, timeout=key[2])
+            _clients[key] = client
+        return client
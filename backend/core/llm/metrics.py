@@ -0,0 +1,192 @@
+import contextvars
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict, defaultdict, deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# USD per million tokens (input, output); LLM_PRICING_JSON overrides or extends it
+DEFAULT_PRICING = {
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini-2.0-flash-lite": (0.075, 0.30),
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-1.5-pro": (1.25, 5.00),
+}
+LLM_PRICING: Dict[str, tuple] = {
+    **DEFAULT_PRICING,
+    **{model: tuple(prices) for model, prices in json.loads(os.getenv("LLM_PRICING_JSON", "{}")).items()}
+}
+# Attach each chat turn's LLM usage to task_progress["llm_usage"]
+LLM_METRICS_DEBUG = os.getenv("LLM_METRICS_DEBUG", "false").lower() in ("1", "true", "yes")
+# Latency samples kept per node/call site for percentiles, and sessions kept in memory
+LLM_METRICS_LATENCY_SAMPLES = int(os.getenv("LLM_METRICS_LATENCY_SAMPLES", "1000"))
+LLM_METRICS_MAX_SESSIONS = int(os.getenv("LLM_METRICS_MAX_SESSIONS", "500"))
+
+def node_for_call_site(call_site: str) -> str:
+    """Call sites are named "<node or tool>.<function>"; the prefix is the node"""
+    return call_site.split(".", 1)[0]
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    input_price, output_price = LLM_PRICING.get(model, (0.0, 0.0))
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (``pct`` in 0-100); 0.0 for no values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+class _Totals:
+    """Running totals for one group of calls (a node, call site, model or session)"""
+
+    def __init__(self, latency_samples: int = 0):
+        self.calls = 0
+        self.cache_hits = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cost_usd = 0.0
+        self.latency_ms = 0.0
+        self.latencies = deque(maxlen=latency_samples) if latency_samples else None
+
+    def add(self, call: Dict):
+        self.calls += 1
+        self.cache_hits += call["cache"] in ("memory", "redis")
+        self.input_tokens += call["input_tokens"]
+        self.output_tokens += call["output_tokens"]
+        self.cost_usd += call["cost_usd"]
+        self.latency_ms += call["latency_ms"]
+        if self.latencies is not None:
+            self.latencies.append(call["latency_ms"])
+
+    def as_dict(self) -> Dict:
+        stats = {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "latency_ms": round(self.latency_ms, 1)
+        }
+        if self.latencies is not None:
+            samples = list(self.latencies)
+            stats["p50_ms"] = round(percentile(samples, 50), 1)
+            stats["p95_ms"] = round(percentile(samples, 95), 1)
+        return stats
+
+class LLMUsage:
+    """LLM calls made while handling one request (a chat turn, an upload)"""
+
+    def __init__(self, session_id: Optional[str] = None, request_id: Optional[str] = None):
+        self.session_id = session_id
+        self.request_id = request_id or uuid.uuid4().hex
+        self.calls: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def add(self, call: Dict):
+        with self._lock:
+            self.calls.append(call)
+
+    def summary(self, include_calls: bool = False) -> Dict:
+        """Totals and per-node breakdown; nodes are ordered by cost, then latency"""
+        with self._lock:
+            calls = list(self.calls)
+        total, by_node = _Totals(), defaultdict(_Totals)
+        for call in calls:
+            total.add(call)
+            by_node[call["node"]].add(call)
+        summary = {
+            "request_id": self.request_id,
+            "session_id": self.session_id,
+            **total.as_dict(),
+            "by_node": dict(sorted(
+                ((node, totals.as_dict()) for node, totals in by_node.items()),
+                key=lambda item: (item[1]["cost_usd"], item[1]["latency_ms"]),
+                reverse=True
+            ))
+        }
+        if include_calls:
+            summary["llm_calls"] = calls
+        return summary
+
+_current_usage: contextvars.ContextVar[Optional[LLMUsage]] = contextvars.ContextVar("llm_usage", default=None)
+
+class LLMMetrics:
+    """Process-wide LLM call accounting by node, call site, model and session"""
+
+    def __init__(self, latency_samples: int = LLM_METRICS_LATENCY_SAMPLES,
+                 max_sessions: int = LLM_METRICS_MAX_SESSIONS):
+        self.latency_samples = latency_samples
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._total = _Totals(self.latency_samples)
+            self._by_node: Dict[str, _Totals] = defaultdict(lambda: _Totals(self.latency_samples))
+            self._by_call_site: Dict[str, _Totals] = defaultdict(lambda: _Totals(self.latency_samples))
+            self._by_model: Dict[str, _Totals] = defaultdict(_Totals)
+            self._sessions: "OrderedDict[str, _Totals]" = OrderedDict()
+
+    def record(self, call_site: str, model: str, input_tokens: int, output_tokens: int,
+               latency_ms: float, cache: str, estimated: bool = False) -> Dict:
+        """Account for one LLM call; also added to the current request's usage"""
+        usage = _current_usage.get()
+        billed = cache not in ("memory", "redis")
+        call = {
+            "call_site": call_site,
+            "node": node_for_call_site(call_site),
+            "model": model,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cost_usd": estimate_cost(model, input_tokens, output_tokens) if billed else 0.0,
+            "latency_ms": round(latency_ms, 1),
+            "cache": cache,
+            "estimated_tokens": estimated,
+            "session_id": usage.session_id if usage else None
+        }
+        with self._lock:
+            self._total.add(call)
+            self._by_node[call["node"]].add(call)
+            self._by_call_site[call_site].add(call)
+            self._by_model[model].add(call)
+            if call["session_id"]:
+                session = self._sessions.pop(call["session_id"], None) or _Totals()
+                session.add(call)
+                self._sessions[call["session_id"]] = session
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+        if usage is not None:
+            usage.add(call)
+        return call
+
+    def get_stats(self, session_id: Optional[str] = None) -> Dict:
+        with self._lock:
+            if session_id is not None:
+                session = self._sessions.get(session_id)
+                return {"session_id": session_id, **(session.as_dict() if session else _Totals().as_dict())}
+            return {
+                **self._total.as_dict(),
+                "by_node": {node: totals.as_dict() for node, totals in self._by_node.items()},
+                "by_call_site": {site: totals.as_dict() for site, totals in self._by_call_site.items()},
+                "by_model": {model: totals.as_dict() for model, totals in self._by_model.items()},
+                "sessions_tracked": len(self._sessions),
+                "recent_sessions": {
+                    session: totals.as_dict() for session, totals in list(self._sessions.items())[-20:]
+                }
+            }
+
+@contextmanager
+def llm_usage_scope(session_id: Optional[str] = None, request_id: Optional[str] = None) -> Iterator[LLMUsage]:
+    """Collect the LLM calls made in this context (threads need a copied context)"""
+    usage = LLMUsage(session_id, request_id)
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+
+llm_metrics = LLMMetrics()
@@ -1,20 +1,55 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+from core.llm.client import get_llm
 from langchain_core.messages import HumanMessage
 from core.graph.state import NaviHireState
 from core.tools.resume_parser import ResumeParser
+from core.tools.match_scoring import recommendation_for, score_candidates
 from database.models.candidate import Candidate
 from database.models.job import Job
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
 import os
 import json
 
+# "hybrid" scores everyone locally and reranks the top K with the LLM; "local" never calls the LLM
+CANDIDATE_MATCHING_MODE = os.getenv("CANDIDATE_MATCHING_MODE", "hybrid").lower()
+# Candidates sent to the LLM rerank, how many share one prompt, and prompts in flight
+CANDIDATE_RERANK_TOP_K = int(os.getenv("CANDIDATE_RERANK_TOP_K", "10"))
+CANDIDATE_RERANK_BATCH_SIZE = int(os.getenv("CANDIDATE_RERANK_BATCH_SIZE", "5"))
+CANDIDATE_RERANK_CONCURRENCY = int(os.getenv("CANDIDATE_RERANK_CONCURRENCY", "4"))
+
+# Job fields worth showing the LLM; the rest of the JD adds tokens, not signal
+JOB_SUMMARY_FIELDS = ["job_title", "title", "role_summary", "required_qualifications", "preferred_qualifications",
+                      "technical_skills", "required_skills", "preferred_skills", "soft_skills", "experience_level",
+                      "min_experience_years", "location"]
+
+CANDIDATE_RERANK_PROMPT = """
+Rate how well each candidate below matches this job on a scale of 0-100.
+
+Job:
+{job}
+
+Candidates:
+{candidates}
+
+Return ONLY a valid JSON array with one object per candidate:
+[
+    {{
+        "candidate_id": "C1",
+        "match_score": 85,
+        "reasoning": "Strong technical skills match...",
+        "strengths": ["Python", "Machine Learning"],
+        "gaps": ["Leadership experience"],
+        "recommendation": "Strong candidate for interview"
+    }}
+]
+"""
+
 class CandidateMatchingNode:
-    def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            temperature=0.7,
-            google_api_key=os.getenv("GEMINI_API_KEY")
-        )
+    def __init__(self, mode: str = CANDIDATE_MATCHING_MODE, top_k: int = CANDIDATE_RERANK_TOP_K):
+        self.llm = get_llm(temperature=0.7)
         self.resume_parser = ResumeParser()
+        self.mode = mode
+        self.top_k = top_k
     
     def process(self, state: NaviHireState) -> NaviHireState:
         """Process candidate matching requests"""
@@ -29,7 +64,7 @@ class CandidateMatchingNode:
                 }
                 return state
             
-            # Perform semantic matching
+            # Local scoring for everyone, LLM rerank for the shortlist
             matches = self._match_candidates_to_job(job_description, analyzed_resumes)
             
             # Rank candidates
@@ -38,10 +73,12 @@ class CandidateMatchingNode:
             state["candidate_matches"] = ranked_matches
             state["task_progress"]["candidate_matching"] = {
                 "status": "completed",
+                "mode": self.mode,
                 "total_matches": len(ranked_matches),
+                "reranked": sum(1 for match in ranked_matches if match.get("reranked")),
                 "top_candidates": ranked_matches[:3]
             }
-            
+        
         except Exception as e:
             state["task_progress"]["candidate_matching"] = {
                 "status": "error",
@@ -51,58 +88,105 @@ class CandidateMatchingNode:
         return state
     
     def _match_candidates_to_job(self, job_description: dict, analyzed_resumes: list) -> list:
-        """Match candidates to job using AI"""
-        matches = []
+        """Two-stage matching: score every candidate locally, then rerank the top K with the LLM"""
+        scores = score_candidates(job_description, analyzed_resumes)
+        matches = [self._local_match(resume, score) for resume, score in zip(analyzed_resumes, scores)]
         
-        for resume in analyzed_resumes:
-            try:
-                matching_prompt = f"""
-                Analyze the match between this candidate and job:
-                
-                Job Description: {json.dumps(job_description, indent=2)}
-                
-                Candidate Profile:
-                - Skills: {resume.get('skills', {})}
-                - Experience: {resume.get('experience', {})}
-                - Score: {resume.get('score', 0)}
-                
-                Rate the match on a scale of 0-100 and provide reasoning.
-                
-                Return JSON:
-                {{
-                    "match_score": 85,
-                    "reasoning": "Strong technical skills match...",
-                    "strengths": ["Python", "Machine Learning"],
-                    "gaps": ["Leadership experience"],
-                    "recommendation": "Strong candidate for interview"
-                }}
-                """
-                
-                response = self.llm.invoke([HumanMessage(content=matching_prompt)])
-                match_data = self._parse_json_response(response.content)
-                
-                matches.append({
-                    "candidate": resume,
-                    "match_score": match_data.get("match_score", 0),
-                    "reasoning": match_data.get("reasoning", ""),
-                    "strengths": match_data.get("strengths", []),
-                    "gaps": match_data.get("gaps", []),
-                    "recommendation": match_data.get("recommendation", "")
-                })
-                
-            except Exception as e:
-                matches.append({
-                    "candidate": resume,
-                    "match_score": 0,
-                    "error": str(e)
-                })
+        if self.mode != "local" and self.top_k > 0 and self.llm.available:
+            shortlist = sorted(matches, key=lambda match: match["local_score"], reverse=True)[:self.top_k]
+            self._rerank(job_description, shortlist)
         
         return matches
     
+    @staticmethod
+    def _local_match(resume: dict, score: dict) -> dict:
+        matched, missing = score["matched_skills"], score["missing_skills"]
+        reasoning = f"Matches {len(matched)} listed skills"
+        if missing:
+            reasoning += f", missing {len(missing)}"
+        reasoning += f"; {score['experience_years']:g} years of experience"
+        if score["required_years"]:
+            reasoning += f" (job asks for {score['required_years']:g})"
+        
+        local_score = score["local_score"]
+        return {
+            "candidate": resume,
+            "match_score": local_score,
+            "local_score": local_score,
+            "score_breakdown": {key: score[key] for key in ("skill_score", "experience_score", "similarity", "similarity_method")},
+            "reasoning": reasoning,
+            "strengths": matched[:10],
+            "gaps": missing[:10],
+            "recommendation": recommendation_for(local_score),
+            "reranked": False
+        }
+    
+    @staticmethod
+    def _job_summary(job_description: dict) -> str:
+        """Compact JSON of the job, built once per turn instead of once per candidate"""
+        summary = {field: job_description[field] for field in JOB_SUMMARY_FIELDS if job_description.get(field)}
+        return json.dumps(summary or job_description, indent=1, default=str)
+    
+    @staticmethod
+    def _candidate_block(candidate_id: str, match: dict) -> str:
+        resume = match["candidate"]
+        experience = resume.get("experience") if isinstance(resume.get("experience"), dict) else {}
+        profile = {
+            "skills": resume.get("skills", {}),
+            "experience_years": experience.get("total_years", 0),
+            "industries": experience.get("industries", []),
+            "achievements": experience.get("achievements", [])[:3],
+            "matched_skills": match["strengths"],
+            "missing_skills": match["gaps"]
+        }
+        return f"=== CANDIDATE {candidate_id} ===\n{json.dumps(profile, default=str)}"
+    
+    def _rerank(self, job_description: dict, shortlist: list):
+        """LLM rerank of the shortlist in concurrent batches; updates the matches in place"""
+        job_summary = self._job_summary(job_description)
+        batch_size = max(1, CANDIDATE_RERANK_BATCH_SIZE)
+        batches = [shortlist[i:i + batch_size] for i in range(0, len(shortlist), batch_size)]
+        workers = max(1, min(CANDIDATE_RERANK_CONCURRENCY, len(batches)))
+        # One copied context per batch keeps LLM usage attributed to this turn
+        contexts = [contextvars.copy_context() for _ in batches]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(
+                lambda context, batch: context.run(self._rerank_batch, job_summary, batch),
+                contexts, batches
+            ))
+    
+    def _rerank_batch(self, job_summary: str, batch: list):
+        candidates = {f"C{i}": match for i, match in enumerate(batch, 1)}
+        prompt = CANDIDATE_RERANK_PROMPT.format(
+            job=job_summary,
+            candidates="\n\n".join(self._candidate_block(cid, match) for cid, match in candidates.items())
+        )
+        try:
+            response = self.llm.invoke([HumanMessage(content=prompt)], call_site="candidate_matching.rerank_candidates")
+            entries = self._parse_json_array_response(response.content)
+        except Exception as e:
+            # The batch keeps its local scores
+            print(f"⚠️ Candidate rerank failed, keeping local scores: {e}")
+            return
+        
+        for entry in entries:
+            match = candidates.get(str(entry.get("candidate_id", "")).strip()) if isinstance(entry, dict) else None
+            if match is None:
+                continue
+            try:
+                match["match_score"] = float(entry.get("match_score", match["local_score"]))
+            except (TypeError, ValueError):
+                continue
+            match["reasoning"] = entry.get("reasoning", match["reasoning"])
+            match["strengths"] = entry.get("strengths", match["strengths"])
+            match["gaps"] = entry.get("gaps", match["gaps"])
+            match["recommendation"] = entry.get("recommendation", match["recommendation"])
+            match["reranked"] = True
+    
     def _rank_candidates(self, matches: list, job_description: dict) -> list:
         """Rank candidates by match score and other factors"""
-        # Sort by match score
-        ranked = sorted(matches, key=lambda x: x.get("match_score", 0), reverse=True)
+        # Reranked candidates come first, each group sorted by its match score
+        ranked = sorted(matches, key=lambda x: (x.get("reranked", False), x.get("match_score", 0)), reverse=True)
         
         # Add ranking information
         for i, match in enumerate(ranked, 1):
@@ -111,23 +195,18 @@ class CandidateMatchingNode:
         
         return ranked
     
-    def _parse_json_response(self, response_text: str) -> dict:
-        """Parse JSON response from LLM"""
+    def _parse_json_array_response(self, response_text: str) -> list:
+        """Parse a JSON array from an LLM response"""
         try:
             cleaned = response_text.strip()
-            if cleaned.startswith('```'):
-                cleaned = cleaned[7:-3]
-            elif cleaned.startswith('```'):
-                cleaned = cleaned[3:-3]
-
-            start_idx = cleaned.find('{')
-            end_idx = cleaned.rfind('}')
-
+            start_idx = cleaned.find('[')
+            end_idx = cleaned.rfind(']')
+            
             if start_idx != -1 and end_idx != -1:
-                json_str = cleaned[start_idx:end_idx + 1]
-                return json.loads(json_str)
-
-            return {}
+                parsed = json.loads(cleaned[start_idx:end_idx + 1])
+                return parsed if isinstance(parsed, list) else []
+            
+            return []
         except Exception as e:
-            print(f"Error parsing JSON response: {e}")
-            return {}
+            print(f"Error parsing JSON array response: {e}")
+            return []
@@ -1,19 +1,56 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+from core.llm.client import get_llm
 from langchain_core.messages import HumanMessage
 from core.tools.resume_parser import ResumeParser
+from core.tools.resume_text import prepare_resume_text
+from core.tools.skill_matcher import match_skills
 from core.graph.state import NaviHireState
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import json
 import os
 
+# Approximate tokens of resume text included in each analysis prompt
+RESUME_ANALYSIS_TOKEN_BUDGET = int(os.getenv("RESUME_ANALYSIS_TOKEN_BUDGET", "1500"))
+# Resumes analyzed at the same time within one turn; each costs a single LLM call
+RESUME_ANALYSIS_CONCURRENCY = int(os.getenv("RESUME_ANALYSIS_CONCURRENCY", "8"))
+
+SKILL_CATEGORIES = ["technical_skills", "soft_skills", "programming_languages", "tools_technologies", "certifications"]
+
+RESUME_ANALYSIS_PROMPT = """
+Analyze the skills and work experience in this resume.
+
+Return ONLY valid JSON in exactly this format:
+{{
+    "skills": {{
+        "technical_skills": [],
+        "soft_skills": [],
+        "programming_languages": [],
+        "tools_technologies": [],
+        "certifications": []
+    }},
+    "experience": {{
+        "total_years": 0,
+        "industries": [],
+        "leadership_experience": false,
+        "achievements": []
+    }}
+}}
+
+Resume:
+{resume_text}
+"""
+
 class ResumeAnalysisNode:
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            google_api_key=os.getenv("GEMINI_API_KEY")
-        )
+        self.llm = get_llm(temperature=0.7)
         self.resume_parser = ResumeParser()
     
     def process(self, state: NaviHireState) -> NaviHireState:
-        """Process resume analysis requests"""
+        """Process resume analysis requests.
+        
+        Each resume gets one LLM call covering skills and experience; resumes are
+        analyzed concurrently, at most RESUME_ANALYSIS_CONCURRENCY at a time.
+        """
         uploaded_resumes = state.get("uploaded_resumes", [])
         
         if not uploaded_resumes:
@@ -23,35 +60,14 @@ class ResumeAnalysisNode:
             }
             return state
         
-        analyzed_resumes = []
-        
-        for resume_data in uploaded_resumes:
-            try:
-                # Parse resume content
-                parsed_data = self.resume_parser.parse_resume(resume_data["content"])
-                
-                # AI-powered skill extraction
-                skills_analysis = self._analyze_skills(parsed_data["text"])
-                
-                # Experience analysis
-                experience_analysis = self._analyze_experience(parsed_data["text"])
-                
-                analyzed_resume = {
-                    "filename": resume_data["filename"],
-                    "parsed_data": parsed_data,
-                    "skills": skills_analysis,
-                    "experience": experience_analysis,
-                    "score": self._calculate_resume_score(parsed_data, skills_analysis)
-                }
-                
-                analyzed_resumes.append(analyzed_resume)
-                
-            except Exception as e:
-                analyzed_resumes.append({
-                    "filename": resume_data["filename"],
-                    "error": str(e),
-                    "status": "failed"
-                })
+        workers = max(1, min(RESUME_ANALYSIS_CONCURRENCY, len(uploaded_resumes)))
+        # One copied context per task keeps LLM usage attributed to this turn
+        contexts = [contextvars.copy_context() for _ in uploaded_resumes]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            analyzed_resumes = list(pool.map(
+                lambda context, resume_data: context.run(self._analyze_resume, resume_data),
+                contexts, uploaded_resumes
+            ))
         
         state["task_progress"]["resume_analysis"] = {
             "status": "completed",
@@ -61,41 +77,94 @@ class ResumeAnalysisNode:
         
         return state
     
-    def _analyze_skills(self, resume_text: str) -> dict:
-        """Extract and categorize skills using AI"""
-        skills_prompt = f"""
-        Extract and categorize skills from this resume:
-        {resume_text[:2000]}
-        
-        Return JSON format:
-        {{
-            "technical_skills": [],
-            "soft_skills": [],
-            "programming_languages": [],
-            "tools_technologies": [],
-            "certifications": []
-        }}
-        """
-        
-        response = self.llm.invoke([HumanMessage(content=skills_prompt)])
-        # Parse JSON response (add error handling)
-        return {"technical_skills": [], "soft_skills": []}  # Simplified
+    def _analyze_resume(self, resume_data: dict) -> dict:
+        """Parse one resume and analyze it with a single LLM call"""
+        try:
+            # Parse resume content
+            parsed_data = self.resume_parser.parse_resume(resume_data["content"], resume_data.get("filename", ""))
+            
+            # Keep contact, skills, experience and education within the prompt budget
+            prepared = prepare_resume_text(parsed_data["text"], RESUME_ANALYSIS_TOKEN_BUDGET)
+            analysis = self._analyze_skills_and_experience(prepared["text"])
+            
+            return {
+                "filename": resume_data["filename"],
+                "parsed_data": parsed_data,
+                "skills": analysis["skills"],
+                "experience": analysis["experience"],
+                "analysis_method": analysis["method"],
+                "score": self._calculate_resume_score(parsed_data, analysis["skills"]),
+                "input_tokens": prepared["input_tokens"]
+            }
+        except Exception as e:
+            return {
+                "filename": resume_data["filename"],
+                "error": str(e),
+                "status": "failed"
+            }
     
-    def _analyze_experience(self, resume_text: str) -> dict:
-        """Analyze work experience using AI"""
-        exp_prompt = f"""
-        Analyze work experience from this resume:
-        {resume_text[:2000]}
+    def _analyze_skills_and_experience(self, resume_text: str) -> dict:
+        """Skills and experience from one structured LLM call, with a local fallback"""
+        try:
+            response = self.llm.invoke(
+                [HumanMessage(content=RESUME_ANALYSIS_PROMPT.format(resume_text=resume_text))],
+                call_site="resume_analysis.analyze_resume"
+            )
+            result = self._parse_json_response(response.content)
+            if isinstance(result.get("skills"), dict) and isinstance(result.get("experience"), dict):
+                return {
+                    "skills": self._normalize_skills(result["skills"]),
+                    "experience": self._normalize_experience(result["experience"]),
+                    "method": "llm"
+                }
+            print("⚠️ Resume analysis response missing skills or experience, using fallback")
+        except Exception as e:
+            print(f"⚠️ Resume analysis LLM call failed, using fallback: {e}")
         
-        Extract:
-        - Total years of experience
-        - Industry experience
-        - Leadership experience
-        - Key achievements
-        """
+        matched = match_skills(resume_text)
+        return {
+            "skills": self._normalize_skills({category: list(matched.get(category, ())) for category in SKILL_CATEGORIES}),
+            "experience": self._normalize_experience({}),
+            "method": "fallback"
+        }
+    
+    @staticmethod
+    def _normalize_skills(skills: dict) -> dict:
+        return {
+            category: [str(skill) for skill in skills.get(category) or [] if skill]
+            for category in SKILL_CATEGORIES
+        }
+    
+    @staticmethod
+    def _normalize_experience(experience: dict) -> dict:
+        try:
+            total_years = float(experience.get("total_years") or 0)
+        except (TypeError, ValueError):
+            total_years = 0.0
+        return {
+            "total_years": total_years,
+            "industries": list(experience.get("industries") or []),
+            "leadership_experience": bool(experience.get("leadership_experience", False)),
+            "achievements": list(experience.get("achievements") or [])
+        }
+    
+    def _parse_json_response(self, response_text: str) -> dict:
+        """Parse the JSON object in an LLM response, tolerating code fences"""
+        cleaned = response_text.strip()
+        if cleaned.startswith("```"):
+            cleaned = cleaned.strip("`")
+            if cleaned.startswith("json"):
+                cleaned = cleaned[4:]
         
-        response = self.llm.invoke([HumanMessage(content=exp_prompt)])
-        return {"total_years": 0, "industries": [], "achievements": []}  # Simplified
+        start_idx = cleaned.find("{")
+        end_idx = cleaned.rfind("}")
+        if start_idx == -1 or end_idx == -1:
+            return {}
+        try:
+            return json.loads(cleaned[start_idx:end_idx + 1])
+        except json.JSONDecodeError as e:
+            print(f"Error parsing JSON response: {e}")
+            return {}
     
     def _calculate_resume_score(self, parsed_data: dict, skills: dict) -> float:
         """Calculate overall resume score"""
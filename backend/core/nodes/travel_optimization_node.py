@@ -1,18 +1,13 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+from core.llm.client import get_llm
 from langchain_core.messages import HumanMessage
 from core.graph.state import NaviHireState
 from core.tools.flight_search import GoogleFlightScraper
 from core.tools.email_automation import EmailAutomation
-import os
 from datetime import datetime, timedelta
 
 class TravelOptimizationNode:
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            temperature=0.7,
-            google_api_key=os.getenv("GEMINI_API_KEY")
-        )
+        self.llm = get_llm(temperature=0.7)
         self.flight_scraper = GoogleFlightScraper()
         self.email_automation = EmailAutomation()
     
@@ -149,7 +144,7 @@ class TravelOptimizationNode:
         """
         
         try:
-            response = self.llm.invoke([HumanMessage(content=recommendation_prompt)])
+            response = self.llm.invoke([HumanMessage(content=recommendation_prompt)], call_site="travel_optimization.generate_travel_recommendations")
             return response.content
         except:
             return "Unable to generate recommendations at this time."
@@ -1,22 +1,17 @@
 from langchain_core.messages import HumanMessage, AIMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
+from core.llm.client import get_llm
 from core.graph.state import NaviHireState
 from core.tools.email_automation import EmailAutomation
 from core.tools.calendar_integration import CalendarIntegration
 from database.models.candidate import Candidate, JobApplication
 from database.models.job import Job
 from database.models.travel import TravelRequest
-import os
 import json
 from datetime import datetime, timedelta
 
 class WorkflowAutomationNode:
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            temperature=0.7,
-            google_api_key=os.getenv("GEMINI_API_KEY")
-        )
+        self.llm = get_llm(temperature=0.7)
         self.email_automation = EmailAutomation()
         self.calendar_integration = CalendarIntegration()
 
@@ -77,7 +72,7 @@ class WorkflowAutomationNode:
         """
         
         try:
-            response = self.llm.invoke([HumanMessage(content=analysis_prompt)])
+            response = self.llm.invoke([HumanMessage(content=analysis_prompt)], call_site="workflow_automation.analyze_automation_request")
             return response.content.strip().lower()
         except:
             return "general"
@@ -100,7 +95,7 @@ class WorkflowAutomationNode:
             }}
             """
             
-            response = self.llm.invoke([HumanMessage(content=extraction_prompt)])
+            response = self.llm.invoke([HumanMessage(content=extraction_prompt)], call_site="workflow_automation.handle_interview_scheduling")
             interview_data = self._parse_json_response(response.content)
             
             if interview_data.get("candidate_name") and interview_data.get("interview_date"):
@@ -158,7 +153,7 @@ class WorkflowAutomationNode:
             }}
             """
             
-            response = self.llm.invoke([HumanMessage(content=extraction_prompt)])
+            response = self.llm.invoke([HumanMessage(content=extraction_prompt)], call_site="workflow_automation.handle_follow_up_emails")
             email_data = self._parse_json_response(response.content)
             
             email_type = email_data.get("email_type", "status_update")
@@ -235,7 +230,7 @@ class WorkflowAutomationNode:
             }}
             """
             
-            response = self.llm.invoke([HumanMessage(content=extraction_prompt)])
+            response = self.llm.invoke([HumanMessage(content=extraction_prompt)], call_site="workflow_automation.handle_travel_approval")
             travel_data = self._parse_json_response(response.content)
             
             action = travel_data.get("action", "review")
@@ -291,7 +286,7 @@ class WorkflowAutomationNode:
             }}
             """
             
-            response = self.llm.invoke([HumanMessage(content=extraction_prompt)])
+            response = self.llm.invoke([HumanMessage(content=extraction_prompt)], call_site="workflow_automation.handle_candidate_status_update")
             status_data = self._parse_json_response(response.content)
             
             candidates = status_data.get("candidate_names", [])
@@ -340,7 +335,7 @@ class WorkflowAutomationNode:
             }}
             """
             
-            response = self.llm.invoke([HumanMessage(content=extraction_prompt)])
+            response = self.llm.invoke([HumanMessage(content=extraction_prompt)], call_site="workflow_automation.handle_bulk_email_campaign")
             campaign_data = self._parse_json_response(response.content)
             
             campaign_type = campaign_data.get("campaign_type", "newsletter")
@@ -0,0 +1,180 @@
+import os
+import time
+from typing import Dict, Iterable, List, Sequence, Tuple
+import numpy as np
+from core.tools.match_scoring import PREFERRED_SKILL_WEIGHT, job_requirements, recommendation_for
+
+# Weights of the applicant score components; they sum to 1. "profile" is the
+# candidate's overall resume score, which stands in for text similarity here
+APPLICANT_SCORE_WEIGHTS = {"skills": 0.6, "experience": 0.25, "profile": 0.15}
+# Experience above the job's maximum lowers the fit, but never below this
+OVERQUALIFIED_FLOOR = float(os.getenv("APPLICANT_OVERQUALIFIED_FLOOR", "0.5"))
+
+# An applicant row is (application_id, candidate_id, skills, experience_years, overall_score)
+ApplicantRow = Tuple[int, int, Sequence[str], float, float]
+
+def _normalize(skill) -> str:
+    return str(skill).strip().lower()
+
+def job_skill_columns(job: Dict) -> Dict:
+    """Requirements of a job with its skills in a fixed column order"""
+    requirements = job_requirements(job)
+    max_years = job.get("max_experience_years")
+    return {
+        "required": sorted(requirements["required_skills"]),
+        "preferred": sorted(requirements["preferred_skills"]),
+        "min_years": requirements["min_years"],
+        "max_years": float(max_years) if max_years else 0.0
+    }
+
+def build_applicant_matrix(columns: Dict, rows: Iterable[ApplicantRow]) -> Dict[str, np.ndarray]:
+    """Applicants as arrays: multi-hot skill matrix over the job's skills, years and profile score.
+
+    Only the job's own skills get a column, so the matrix stays narrow however
+    many distinct skills applicants list.
+    """
+    skill_names = columns["required"] + columns["preferred"]
+    column_of = {skill: column for column, skill in enumerate(skill_names)}
+    # Raw spellings repeat across applicants; remember each one's column (or None)
+    raw_column = {}
+    application_ids, candidate_ids, years, profile = [], [], [], []
+    hit_rows, hit_columns = [], []
+    for row_index, (application_id, candidate_id, skills, experience_years, overall_score) in enumerate(rows):
+        application_ids.append(application_id)
+        candidate_ids.append(candidate_id)
+        years.append(experience_years or 0.0)
+        profile.append(overall_score or 0.0)
+        for skill in skills or ():
+            try:
+                column = raw_column[skill]
+            except KeyError:
+                column = raw_column[skill] = column_of.get(_normalize(skill))
+            except TypeError:
+                column = column_of.get(_normalize(skill))
+            if column is not None:
+                hit_rows.append(row_index)
+                hit_columns.append(column)
+
+    skills_matrix = np.zeros((len(application_ids), len(skill_names)), dtype=bool)
+    skills_matrix[hit_rows, hit_columns] = True
+    return {
+        "application_ids": np.asarray(application_ids, dtype=np.int64),
+        "candidate_ids": np.asarray(candidate_ids, dtype=np.int64),
+        "skills": skills_matrix,
+        "years": np.asarray(years, dtype=np.float32),
+        "profile": np.asarray(profile, dtype=np.float32)
+    }
+
+def skill_scores(required_hits, required_count, preferred_hits, preferred_count) -> np.ndarray:
+    """Required skill coverage blended with preferred coverage, as in match_scoring.skill_overlap.
+
+    Arguments broadcast, so this scores many applicants for one job or one
+    candidate for many jobs alike. Jobs listing no skills score 0.5.
+    """
+    required_hits = np.asarray(required_hits, dtype=np.float64)
+    preferred_hits = np.asarray(preferred_hits, dtype=np.float64)
+    required_count = np.asarray(required_count, dtype=np.float64)
+    preferred_count = np.asarray(preferred_count, dtype=np.float64)
+    score = np.where(required_count > 0, required_hits / np.maximum(required_count, 1), 1.0)
+    score = np.where(
+        preferred_count > 0,
+        (1 - PREFERRED_SKILL_WEIGHT) * score + PREFERRED_SKILL_WEIGHT * preferred_hits / np.maximum(preferred_count, 1),
+        score
+    )
+    return np.where((required_count > 0) | (preferred_count > 0), score, 0.5)
+
+def experience_scores(years, min_years, max_years) -> np.ndarray:
+    """Fit of experience to a job's range; broadcasts like ``skill_scores``"""
+    years = np.asarray(years, dtype=np.float32)
+    min_years = np.asarray(min_years, dtype=np.float32)
+    max_years = np.asarray(max_years, dtype=np.float32)
+    score = np.where(min_years > 0, np.minimum(1.0, years / np.maximum(min_years, 1e-6)), 1.0)
+    over = (max_years > 0) & (years > max_years)
+    return np.where(over, np.maximum(OVERQUALIFIED_FLOOR, max_years / np.maximum(years, 1e-6)), score)
+
+def combine_scores(skill_score, experience_score, overall_score) -> np.ndarray:
+    """0-100 match score from the components and the candidate's overall resume score"""
+    profile_score = np.clip(np.asarray(overall_score, dtype=np.float32) / 100.0, 0.0, 1.0)
+    return np.round(100 * (
+        APPLICANT_SCORE_WEIGHTS["skills"] * skill_score
+        + APPLICANT_SCORE_WEIGHTS["experience"] * experience_score
+        + APPLICANT_SCORE_WEIGHTS["profile"] * profile_score
+    ), 1)
+
+def score_applicant_matrix(columns: Dict, matrix: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Score every applicant in one vectorized pass; scores are 0-100"""
+    required_count, preferred_count = len(columns["required"]), len(columns["preferred"])
+    skills = matrix["skills"]
+    skill_score = skill_scores(
+        skills[:, :required_count].sum(axis=1), required_count,
+        skills[:, required_count:].sum(axis=1), preferred_count
+    )
+    experience_score = experience_scores(matrix["years"], columns["min_years"], columns["max_years"])
+    return {
+        "match_score": combine_scores(skill_score, experience_score, matrix["profile"]),
+        "skill_score": skill_score,
+        "experience_score": experience_score
+    }
+
+def applicant_updates(columns: Dict, matrix: Dict[str, np.ndarray], scores: Dict[str, np.ndarray]) -> List[Dict]:
+    """JobApplication rows to write: match score, strengths (matched skills) and gaps (missing required skills).
+
+    Applicants with the same skill pattern share strengths and gaps, so the
+    lists are built once per distinct row of the skill matrix.
+    """
+    skill_names = np.asarray(columns["required"] + columns["preferred"], dtype=object)
+    is_required = np.arange(len(skill_names)) < len(columns["required"])
+    skills = matrix["skills"]
+    if skills.shape[1]:
+        packed = np.ascontiguousarray(np.packbits(skills, axis=1))
+        _, first_row, pattern_of = np.unique(
+            packed.view(np.dtype((np.void, packed.shape[1]))).ravel(), return_index=True, return_inverse=True
+        )
+        explained = [
+            (skill_names[skills[row]].tolist(), skill_names[is_required & ~skills[row]].tolist())
+            for row in first_row.tolist()
+        ]
+        pattern_of = pattern_of.ravel().tolist()
+    else:
+        explained, pattern_of = [([], [])], [0] * skills.shape[0]
+
+    match_scores = scores["match_score"].tolist()
+    return [
+        {
+            "id": application_id,
+            "match_score": match_scores[row],
+            "strengths": explained[pattern_of[row]][0],
+            "gaps": explained[pattern_of[row]][1],
+            "recommendation": recommendation_for(match_scores[row])
+        }
+        for row, application_id in enumerate(matrix["application_ids"].tolist())
+    ]
+
+def top_applicants(matrix: Dict[str, np.ndarray], scores: Dict[str, np.ndarray], limit: int) -> List[int]:
+    """Row indexes of the ``limit`` best applicants, best first, without sorting everyone"""
+    match_score = scores["match_score"]
+    if limit <= 0 or not len(match_score):
+        return []
+    if limit < len(match_score):
+        best = np.argpartition(-match_score, limit - 1)[:limit]
+    else:
+        best = np.arange(len(match_score))
+    return best[np.argsort(-match_score[best], kind="stable")].tolist()
+
+def score_applicants(job: Dict, rows: Iterable[ApplicantRow]) -> Dict:
+    """Build the matrix and score it; returns the arrays, the job columns and timings"""
+    start = time.perf_counter()
+    columns = job_skill_columns(job)
+    matrix = build_applicant_matrix(columns, rows)
+    loaded = time.perf_counter()
+    scores = score_applicant_matrix(columns, matrix)
+    scored = time.perf_counter()
+    return {
+        "columns": columns,
+        "matrix": matrix,
+        "scores": scores,
+        "timings_ms": {
+            "build": round((loaded - start) * 1000, 1),
+            "score": round((scored - loaded) * 1000, 1)
+        }
+    }
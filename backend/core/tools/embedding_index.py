@@ -0,0 +1,251 @@
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from core.tools.embeddings import EMBEDDING_MODEL, embed_texts
+
+DEFAULT_INDEX_DIR = Path(__file__).resolve().parents[2] / ".cache" / "embedding_index"
+# "false" turns off indexing and similarity queries
+EMBEDDING_INDEX_ENABLED = os.getenv("EMBEDDING_INDEX", "true").lower() not in ("0", "false", "no")
+# Characters of resume text embedded per candidate; MiniLM truncates long input anyway
+CANDIDATE_TEXT_CHARS = int(os.getenv("EMBEDDING_INDEX_TEXT_CHARS", "2000"))
+
+# HNSW settings: M and construction_ef trade build time and memory for recall,
+# search_ef trades query latency for recall
+HNSW_SETTINGS = {
+    "hnsw:space": "cosine",
+    "hnsw:M": int(os.getenv("EMBEDDING_INDEX_HNSW_M", "16")),
+    "hnsw:construction_ef": int(os.getenv("EMBEDDING_INDEX_CONSTRUCTION_EF", "128")),
+    "hnsw:search_ef": int(os.getenv("EMBEDDING_INDEX_SEARCH_EF", "64")),
+}
+
+def _field(record, name: str, default=None):
+    """Read a field from an ORM object or a dict"""
+    if isinstance(record, dict):
+        return record.get(name, default)
+    return getattr(record, name, default)
+
+def _join(values) -> str:
+    if not values:
+        return ""
+    if isinstance(values, str):
+        return values
+    if isinstance(values, dict):
+        values = [item for nested in values.values() for item in (nested if isinstance(nested, list) else [nested])]
+    return ", ".join(str(value) for value in values if value)
+
+def candidate_document(candidate) -> str:
+    """Text embedded for a candidate: skill summary first, then the start of the resume"""
+    skills = _join(_field(candidate, "skills"))
+    resume_text = (_field(candidate, "resume_text") or "")[:CANDIDATE_TEXT_CHARS]
+    return f"Skills: {skills}\n{resume_text}".strip()
+
+def job_document(job) -> str:
+    """Text embedded for a job: title, skills and description"""
+    required = _join(_field(job, "required_skills"))
+    preferred = _join(_field(job, "preferred_skills"))
+    parts = [
+        _field(job, "title") or "",
+        f"Required skills: {required}" if required else "",
+        f"Preferred skills: {preferred}" if preferred else "",
+        _field(job, "description") or ""
+    ]
+    return "\n".join(part for part in parts if part.strip())
+
+def _content_hash(document: str) -> str:
+    # The model is part of the hash so switching models re-embeds everything
+    return hashlib.sha256(f"{EMBEDDING_MODEL}\n{document}".encode("utf-8")).hexdigest()[:16]
+
+def _metadata(values: Dict) -> Dict:
+    # Chroma metadata values must be str, int, float or bool
+    return {key: value for key, value in values.items() if isinstance(value, (str, int, float, bool))}
+
+class EmbeddingIndex:
+    """Persistent Chroma index of candidate and job embeddings.
+
+    Documents are embedded with the shared sentence-transformers model and
+    stored with a content hash, so re-indexing an unchanged record is a metadata
+    lookup. Queries reuse the stored vector of the job or candidate they start
+    from, which keeps them to a single HNSW search.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or os.getenv("EMBEDDING_INDEX_DIR") or DEFAULT_INDEX_DIR)
+        self._client = None
+        self._collections: Dict[str, object] = {}
+        self._failed = not EMBEDDING_INDEX_ENABLED
+        self._lock = threading.Lock()
+
+    def _collection(self, name: str):
+        """Chroma collection, opened on first use; None when Chroma is unavailable"""
+        if self._failed:
+            return None
+        if name in self._collections:
+            return self._collections[name]
+        with self._lock:
+            if name not in self._collections and not self._failed:
+                try:
+                    if self._client is None:
+                        import chromadb
+                        self.path.mkdir(parents=True, exist_ok=True)
+                        self._client = chromadb.PersistentClient(path=str(self.path))
+                    # Embeddings are always passed in, so no embedding function is configured
+                    self._collections[name] = self._client.get_or_create_collection(
+                        name, metadata=HNSW_SETTINGS, embedding_function=None
+                    )
+                except Exception as e:
+                    print(f"⚠️ Embedding index unavailable: {e}")
+                    self._failed = True
+                    return None
+        return self._collections.get(name)
+
+    @property
+    def available(self) -> bool:
+        return self._collection("candidates") is not None
+
+    def _upsert(self, name: str, ids: List[str], documents: List[str], metadatas: List[Dict]) -> int:
+        """Embed and store the documents whose content changed; returns how many were embedded"""
+        collection = self._collection(name)
+        if collection is None or not ids:
+            return 0
+
+        hashes = [_content_hash(document) for document in documents]
+        existing = collection.get(ids=ids, include=["metadatas"])
+        stored = {id_: (metadata or {}).get("content_hash") for id_, metadata in zip(existing["ids"], existing["metadatas"])}
+        changed = [i for i, id_ in enumerate(ids) if stored.get(id_) != hashes[i]]
+        unchanged = [i for i, id_ in enumerate(ids) if stored.get(id_) == hashes[i]]
+
+        if changed:
+            embeddings = embed_texts([documents[i] for i in changed])
+            if embeddings is None:
+                return 0
+            collection.upsert(
+                ids=[ids[i] for i in changed],
+                embeddings=embeddings,
+                metadatas=[_metadata({**metadatas[i], "content_hash": hashes[i]}) for i in changed]
+            )
+        if unchanged:
+            # Filters such as availability or job status can change without the text changing
+            collection.update(
+                ids=[ids[i] for i in unchanged],
+                metadatas=[_metadata({**metadatas[i], "content_hash": hashes[i]}) for i in unchanged]
+            )
+        return len(changed)
+
+    def index_candidates(self, candidates: Iterable) -> int:
+        """Add or refresh candidates (ORM objects or dicts with an ``id``)"""
+        candidates = [candidate for candidate in candidates if _field(candidate, "id") is not None]
+        return self._upsert(
+            "candidates",
+            [str(_field(candidate, "id")) for candidate in candidates],
+            [candidate_document(candidate) for candidate in candidates],
+            [{
+                # Stored as 0/1; Chroma filters on ints reliably across versions
+                "is_available": int(bool(_field(candidate, "is_available", True))),
+                "status": _field(candidate, "status") or "new",
+                "experience_years": float(_field(candidate, "experience_years") or 0)
+            } for candidate in candidates]
+        )
+
+    def index_jobs(self, jobs: Iterable) -> int:
+        """Add or refresh jobs (ORM objects or dicts with an ``id``)"""
+        jobs = [job for job in jobs if _field(job, "id") is not None]
+        return self._upsert(
+            "jobs",
+            [str(_field(job, "id")) for job in jobs],
+            [job_document(job) for job in jobs],
+            [{
+                "status": _field(job, "status") or "draft",
+                "title": _field(job, "title") or ""
+            } for job in jobs]
+        )
+
+    def remove_candidate(self, candidate_id: int):
+        collection = self._collection("candidates")
+        if collection is not None:
+            collection.delete(ids=[str(candidate_id)])
+
+    def remove_job(self, job_id: int):
+        collection = self._collection("jobs")
+        if collection is not None:
+            collection.delete(ids=[str(job_id)])
+
+    def _stored_embedding(self, name: str, record_id: int) -> Optional[List[float]]:
+        collection = self._collection(name)
+        if collection is None:
+            return None
+        stored = collection.get(ids=[str(record_id)], include=["embeddings"])
+        embeddings = stored.get("embeddings")
+        return list(embeddings[0]) if embeddings is not None and len(embeddings) else None
+
+    def stored_embeddings(self, name: str, record_ids: Iterable[int]) -> Dict[int, List[float]]:
+        """Stored vectors of these candidates or jobs (``name``); records not indexed yet are left out"""
+        collection = self._collection(name)
+        record_ids = [str(record_id) for record_id in record_ids]
+        if collection is None or not record_ids:
+            return {}
+        stored = collection.get(ids=record_ids, include=["embeddings"])
+        embeddings = stored.get("embeddings")
+        if embeddings is None:
+            return {}
+        return {int(id_): list(embedding) for id_, embedding in zip(stored["ids"], embeddings)}
+
+    def _query(self, name: str, embedding: List[float], k: int, where: Optional[Dict]) -> List[Dict]:
+        collection = self._collection(name)
+        if collection is None or embedding is None or k <= 0:
+            return []
+        result = collection.query(
+            query_embeddings=[embedding], n_results=k, where=where or None, include=["distances", "metadatas"]
+        )
+        return [
+            {
+                "id": int(id_),
+                # Cosine distance is 1 - cosine similarity
+                "similarity": round(1.0 - distance, 4),
+                **{key: value for key, value in (metadata or {}).items() if key != "content_hash"}
+            }
+            for id_, distance, metadata in zip(result["ids"][0], result["distances"][0], result["metadatas"][0])
+        ]
+
+    def candidates_for_job(self, job_id: int, k: int = 20, job=None, available_only: bool = True) -> List[Dict]:
+        """Top-k candidates most similar to a job; ``job`` is indexed first if it is not stored yet"""
+        embedding = self._stored_embedding("jobs", job_id)
+        if embedding is None and job is not None and self.index_jobs([job]):
+            embedding = self._stored_embedding("jobs", job_id)
+        return self._query("candidates", embedding, k, {"is_available": 1} if available_only else None)
+
+    def jobs_for_candidate(self, candidate_id: int, k: int = 20, candidate=None,
+                           status: Optional[str] = "active") -> List[Dict]:
+        """Top-k jobs most similar to a candidate; only jobs with ``status`` unless it is None"""
+        embedding = self._stored_embedding("candidates", candidate_id)
+        if embedding is None and candidate is not None and self.index_candidates([candidate]):
+            embedding = self._stored_embedding("candidates", candidate_id)
+        return self._query("jobs", embedding, k, {"status": status} if status else None)
+
+    def stats(self) -> Dict:
+        if not self.available:
+            return {"available": False}
+        return {
+            "available": True,
+            "path": str(self.path),
+            "model": EMBEDDING_MODEL,
+            "candidates": self._collection("candidates").count(),
+            "jobs": self._collection("jobs").count()
+        }
+
+_index: Optional[EmbeddingIndex] = None
+
+def get_embedding_index() -> EmbeddingIndex:
+    """Shared index for the process"""
+    global _index
+    if _index is None:
+        _index = EmbeddingIndex()
+    return _index
+
+def index_safely(method: str, records) -> None:
+    """Keep the index in step with a database write; index failures never fail the write"""
+    try:
+        getattr(get_embedding_index(), method)(records)
+    except Exception as e:
+        print(f"⚠️ Embedding index update failed ({method}): {e}")
@@ -0,0 +1,35 @@
+import os
+import threading
+from typing import List, Optional
+
+# sentence-transformers model used for semantic similarity; "false" disables embeddings
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+EMBEDDINGS_ENABLED = os.getenv("EMBEDDINGS_ENABLED", "true").lower() not in ("0", "false", "no")
+
+_model = None
+_model_failed = False
+_lock = threading.Lock()
+
+def get_embedding_model():
+    """Shared SentenceTransformer, loaded on first use; None when unavailable"""
+    global _model, _model_failed
+    if _model is not None or _model_failed or not EMBEDDINGS_ENABLED:
+        return _model
+    with _lock:
+        if _model is None and not _model_failed:
+            try:
+                from sentence_transformers import SentenceTransformer
+                _model = SentenceTransformer(EMBEDDING_MODEL)
+                print(f"✅ Embedding model loaded: {EMBEDDING_MODEL}")
+            except Exception as e:
+                print(f"⚠️ Embeddings unavailable, using keyword similarity: {e}")
+                _model_failed = True
+    return _model
+
+def embed_texts(texts: List[str], batch_size: int = 64) -> Optional[List[List[float]]]:
+    """Unit-normalized embeddings (so dot product is cosine similarity), or None"""
+    model = get_embedding_model()
+    if model is None:
+        return None
+    vectors = model.encode(texts, batch_size=batch_size, normalize_embeddings=True, show_progress_bar=False)
+    return [vector.tolist() for vector in vectors]
@@ -1,49 +1,325 @@
 import os
 import base64
 import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage
-import PyPDF2
-import docx
-import io
 import re
 from datetime import datetime
+from core.llm.client import GEMINI_MODEL, get_llm
+from core.tools.parse_cache import ResumeParseCache
+from core.tools.resume_text import estimate_tokens, prepare_resume_text
+from core.tools.skill_matcher import match_skills
+from core.tools.text_extraction import extract_text_isolated
+
+# Bump when the parsing logic changes in a way the prompt hash does not capture
+PARSER_VERSION = "2"
+
+# Packed mode: approximate input tokens and resume count per Gemini request
+PACKED_TOKEN_BUDGET = int(os.getenv("GEMINI_PACKED_TOKEN_BUDGET", "24000"))
+MAX_RESUMES_PER_PACK = int(os.getenv("GEMINI_MAX_RESUMES_PER_PACK", "8"))
+
+RESUME_JSON_SCHEMA = """{{
+    "personal_info": {{
+        "full_name": "Full name of the candidate",
+        "email": "Email address",
+        "phone": "Phone number",
+        "location": "City, State/Country",
+        "linkedin": "LinkedIn profile URL if mentioned",
+        "website": "Personal website if mentioned"
+    }},
+    "professional_summary": "Brief professional summary or objective",
+    "skills": {{
+        "technical_skills": ["List of technical skills"],
+        "soft_skills": ["List of soft skills"],
+        "programming_languages": ["Programming languages if any"],
+        "tools_technologies": ["Tools and technologies"]
+    }},
+    "experience": [
+        {{
+            "company": "Company name",
+            "position": "Job title",
+            "duration": "Employment duration",
+            "description": "Brief description of role and achievements",
+            "years_calculated": 2.5
+        }}
+    ],
+    "education": [
+        {{
+            "institution": "School/University name",
+            "degree": "Degree type and field",
+            "graduation_year": "Year or duration",
+            "gpa": "GPA if mentioned"
+        }}
+    ],
+    "certifications": ["List of certifications"],
+    "projects": [
+        {{
+            "name": "Project name",
+            "description": "Project description",
+            "technologies": ["Technologies used"]
+        }}
+    ],
+    "languages": ["Spoken languages"],
+    "total_experience_years": 5.5,
+    "key_achievements": ["Notable achievements or awards"]
+}}"""
+
+RESUME_PARSING_PROMPT = """
+Analyze this resume text and extract the following information in JSON format:
+
+Resume Text:
+{text}
+
+Extract and return ONLY a valid JSON object with these fields:
+""" + RESUME_JSON_SCHEMA + """
+
+Important:
+- Return ONLY valid JSON, no additional text
+- If information is not found, use null or empty array
+- Calculate total_experience_years from work experience
+- Extract all technical skills mentioned
+- Be precise with company names and job titles
+"""
+
+RESUME_BATCH_PARSING_PROMPT = """
+Analyze each resume below and extract the candidate information.
+
+Return ONLY a valid JSON array with exactly one object per resume. Each object must
+contain "resume_id" copied exactly from the resume header, plus these fields:
+""" + RESUME_JSON_SCHEMA + """
+
+Important:
+- Return ONLY valid JSON, no additional text
+- Never mix information between resumes
+- If information is not found, use null or empty array
+- Calculate total_experience_years from work experience
+- Extract all technical skills mentioned
+
+{resumes}
+"""
+
+def parser_cache_version() -> str:
+    """Cache namespace for the current parser, model and prompt"""
+    prompts = RESUME_PARSING_PROMPT + RESUME_BATCH_PARSING_PROMPT
+    prompt_hash = hashlib.sha256(prompts.encode("utf-8")).hexdigest()[:12]
+    return f"v{PARSER_VERSION}-{GEMINI_MODEL}-{prompt_hash}"
 
 class GeminiResumeParser:
     def __init__(self):
         self.gemini_api_key = os.getenv("GEMINI_API_KEY")
         self.llm = None
         
-        if self.gemini_api_key:
-            try:
-                self.llm = ChatGoogleGenerativeAI(
-                    model="gemini-2.0-flash",
-                    temperature=0.3,
-                    google_api_key=self.gemini_api_key
-                )
-                print("✅ Gemini AI initialized for resume parsing")
-            except Exception as e:
-                print(f"⚠️ Gemini initialization failed: {e}")
-                self.llm = None
+        llm = get_llm(temperature=0.3)
+        if llm.available:
+            self.llm = llm
+            print("✅ Gemini AI initialized for resume parsing")
         else:
             print("⚠️ Gemini API key not found, using fallback parsing")
+        
+        self.cache = ResumeParseCache(parser_cache_version())
     
     def parse_resume(self, file_content: bytes, filename: str) -> Dict:
         """Parse resume using Gemini AI with fallback to basic parsing"""
         try:
+            content_hash = self.cache.content_hash(file_content)
+        except Exception as e:
+            return {"success": False, "error": str(e), "filename": filename}
+        return self._parse_source(file_content, content_hash, filename)
+    
+    def parse_resume_file(self, file_path: str, filename: str) -> Dict:
+        """Parse a resume stored on disk without loading it into memory up front"""
+        try:
+            content_hash = self.cache.file_hash(file_path)
+            return self._parse_source(file_path, content_hash, filename)
+        except Exception as e:
+            print(f"❌ Resume parsing failed for {filename}: {e}")
+            return {"success": False, "error": str(e), "filename": filename}
+    
+    def parse_resumes_packed(self, resumes: List[Dict], max_concurrency: int = 4,
+                             token_budget: int = PACKED_TOKEN_BUDGET) -> List[Dict]:
+        """Parse many resumes, packing several into each Gemini request.
+        
+        Meant for bulk imports: the JSON schema is sent once per pack instead of once
+        per resume. ``resumes`` are upload dicts with ``filename`` and either ``path``
+        or ``content``. Resumes missing from a pack response are retried one at a
+        time. Results are returned in input order, shaped like ``parse_resume``.
+        """
+        results: List[Optional[Dict]] = [None] * len(resumes)
+        
+        def prepare(index: int):
+            resume_data = resumes[index]
+            filename = resume_data["filename"]
+            try:
+                if resume_data.get("path"):
+                    source = resume_data["path"]
+                    content_hash = self.cache.file_hash(source)
+                else:
+                    source = resume_data["content"]
+                    content_hash = self.cache.content_hash(source)
+                
+                cached_result = self.cache.get(content_hash)
+                if cached_result:
+                    print(f"⚡ Parse cache hit for {filename}")
+                    cached_result["filename"] = filename
+                    cached_result["cache"] = "hit"
+                    results[index] = cached_result
+                    return None
+                
+                extracted_text = self._extract_text(source, filename)
+                if not extracted_text or len(extracted_text.strip()) < 50:
+                    raise Exception("Could not extract meaningful text from resume")
+                return {
+                    "index": index,
+                    "text": extracted_text,
+                    "prepared": prepare_resume_text(extracted_text),
+                    "content_hash": content_hash,
+                    "filename": filename
+                }
+            except Exception as e:
+                print(f"❌ Resume parsing failed for {filename}: {e}")
+                results[index] = {"success": False, "error": str(e), "filename": filename}
+                return None
+        
+        workers = max(1, max_concurrency)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = [item for item in pool.map(prepare, range(len(resumes))) if item]
+            
+            if pending and self.llm:
+                packs = self._build_packs(pending, token_budget)
+                print(f"📦 Packed {len(pending)} resumes into {len(packs)} Gemini requests")
+                pack_responses = list(pool.map(self._parse_pack_with_gemini, packs))
+            else:
+                packs, pack_responses = [pending], [{}]
+            
+            retry = []
+            schema_tokens = estimate_tokens(RESUME_BATCH_PARSING_PROMPT)
+            for pack, parsed_by_id in zip(packs, pack_responses):
+                for item in pack:
+                    parsed_data = parsed_by_id.get(self._pack_resume_id(item["index"]))
+                    if not parsed_data:
+                        retry.append(item)
+                        continue
+                    result = {
+                        "success": True,
+                        "source": "gemini",
+                        "filename": item["filename"],
+                        "parsed_data": self._validate_gemini_response(parsed_data, item["text"]),
+                        "raw_text": item["text"],
+                        # Each resume in a pack is charged its share of the schema
+                        "token_usage": self._token_usage(
+                            item["prepared"], item["prepared"]["input_tokens"] + schema_tokens // len(pack)
+                        )
+                    }
+                    self.cache.set(item["content_hash"], result)
+                    result["cache"] = "miss"
+                    results[item["index"]] = result
+            
+            # Split failures out of their pack and parse them on their own
+            if retry and self.llm:
+                print(f"🔁 Retrying {len(retry)} resumes individually")
+            retried = pool.map(
+                lambda item: self._parse_text(item["text"], item["content_hash"], item["filename"]),
+                retry
+            )
+            for item, result in zip(retry, retried):
+                results[item["index"]] = result
+        
+        return results
+    
+    @staticmethod
+    def _pack_resume_id(index: int) -> str:
+        return f"R{index}"
+    
+    @staticmethod
+    def _token_usage(prepared: Dict, input_tokens: int) -> Dict:
+        """Prompt token accounting recorded on each Gemini parse result"""
+        return {
+            "input_tokens": input_tokens,
+            "resume_tokens": prepared["input_tokens"],
+            "original_tokens": prepared["original_tokens"],
+            "truncated": prepared["truncated"],
+            "dropped_sections": prepared["dropped_sections"]
+        }
+    
+    def _build_packs(self, items: List[Dict], token_budget: int) -> List[List[Dict]]:
+        """Greedily group resumes so each request stays within the token budget"""
+        schema_tokens = estimate_tokens(RESUME_BATCH_PARSING_PROMPT)
+        packs, current, current_tokens = [], [], schema_tokens
+        for item in items:
+            item_tokens = item["prepared"]["input_tokens"]
+            if current and (current_tokens + item_tokens > token_budget or len(current) >= MAX_RESUMES_PER_PACK):
+                packs.append(current)
+                current, current_tokens = [], schema_tokens
+            current.append(item)
+            current_tokens += item_tokens
+        if current:
+            packs.append(current)
+        return packs
+    
+    def _parse_pack_with_gemini(self, pack: List[Dict]) -> Dict[str, Dict]:
+        """Send one packed request; returns parsed resumes keyed by resume id"""
+        if len(pack) == 1:
+            # Nothing to share - the single-resume prompt is more reliable
+            return {}
+        try:
+            resumes_block = "\n\n".join(
+                f"=== RESUME {self._pack_resume_id(item['index'])} ===\n{item['prepared']['text']}"
+                for item in pack
+            )
+            prompt = RESUME_BATCH_PARSING_PROMPT.format(resumes=resumes_block)
+            response = self.llm.invoke([HumanMessage(content=prompt)], call_site="resume_parser.parse_pack")
+            
+            parsed_by_id = {}
+            for entry in self._parse_json_array_response(response.content):
+                if isinstance(entry, dict) and entry.get("resume_id"):
+                    parsed_by_id[str(entry.pop("resume_id")).strip()] = entry
+            return parsed_by_id
+        except Exception as e:
+            print(f"Gemini packed parsing error: {e}")
+            return {}
+    
+    def _parse_source(self, source, content_hash: str, filename: str) -> Dict:
+        """Shared parse path for in-memory (bytes) and on-disk (path) resumes"""
+        try:
+            # Identical uploads skip extraction and Gemini entirely
+            cached_result = self.cache.get(content_hash)
+            if cached_result:
+                print(f"⚡ Parse cache hit for {filename}")
+                cached_result["filename"] = filename
+                cached_result["cache"] = "hit"
+                return cached_result
+            
             # Extract text from file
-            extracted_text = self._extract_text_from_content(file_content, filename)
+            extracted_text = self._extract_text(source, filename)
             
             if not extracted_text or len(extracted_text.strip()) < 50:
                 raise Exception("Could not extract meaningful text from resume")
             
+            return self._parse_text(extracted_text, content_hash, filename)
+            
+        except Exception as e:
+            print(f"❌ Resume parsing failed for {filename}: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "filename": filename
+            }
+    
+    def _parse_text(self, extracted_text: str, content_hash: str, filename: str) -> Dict:
+        """Parse extracted text with a single Gemini call, falling back to regex parsing"""
+        try:
             # Try Gemini parsing first
             if self.llm:
                 try:
                     gemini_result = self._parse_with_gemini(extracted_text, filename)
                     if gemini_result and gemini_result.get("success"):
                         print(f"✅ Gemini parsing successful for {filename}")
+                        # Only Gemini results are cached so fallback parses get retried later
+                        self.cache.set(content_hash, gemini_result)
+                        gemini_result["cache"] = "miss"
                         return gemini_result
                     else:
                         print(f"⚠️ Gemini parsing failed, using fallback for {filename}")
@@ -52,7 +328,9 @@ class GeminiResumeParser:
             
             # Fallback to basic parsing
             print(f"🔄 Using fallback parsing for {filename}")
-            return self._parse_with_fallback(extracted_text, filename)
+            fallback_result = self._parse_with_fallback(extracted_text, filename)
+            fallback_result["cache"] = "miss"
+            return fallback_result
             
         except Exception as e:
             print(f"❌ Resume parsing failed for {filename}: {e}")
@@ -65,68 +343,12 @@ class GeminiResumeParser:
     def _parse_with_gemini(self, text: str, filename: str) -> Dict:
         """Parse resume using Gemini AI"""
         try:
-            parsing_prompt = f"""
-            Analyze this resume text and extract the following information in JSON format:
-            
-            Resume Text:
-            {text}
+            # Send normalized text trimmed to the token budget; raw_text keeps everything
+            prepared = prepare_resume_text(text)
+            parsing_prompt = RESUME_PARSING_PROMPT.format(text=prepared["text"])
             
-            Extract and return ONLY a valid JSON object with these fields:
-            {{
-                "personal_info": {{
-                    "full_name": "Full name of the candidate",
-                    "email": "Email address",
-                    "phone": "Phone number",
-                    "location": "City, State/Country",
-                    "linkedin": "LinkedIn profile URL if mentioned",
-                    "website": "Personal website if mentioned"
-                }},
-                "professional_summary": "Brief professional summary or objective",
-                "skills": {{
-                    "technical_skills": ["List of technical skills"],
-                    "soft_skills": ["List of soft skills"],
-                    "programming_languages": ["Programming languages if any"],
-                    "tools_technologies": ["Tools and technologies"]
-                }},
-                "experience": [
-                    {{
-                        "company": "Company name",
-                        "position": "Job title",
-                        "duration": "Employment duration",
-                        "description": "Brief description of role and achievements",
-                        "years_calculated": 2.5
-                    }}
-                ],
-                "education": [
-                    {{
-                        "institution": "School/University name",
-                        "degree": "Degree type and field",
-                        "graduation_year": "Year or duration",
-                        "gpa": "GPA if mentioned"
-                    }}
-                ],
-                "certifications": ["List of certifications"],
-                "projects": [
-                    {{
-                        "name": "Project name",
-                        "description": "Project description",
-                        "technologies": ["Technologies used"]
-                    }}
-                ],
-                "languages": ["Spoken languages"],
-                "total_experience_years": 5.5,
-                "key_achievements": ["Notable achievements or awards"]
-            }}
-            
-            Important:
-            - Return ONLY valid JSON, no additional text
-            - If information is not found, use null or empty array
-            - Calculate total_experience_years from work experience
-            - Extract all technical skills mentioned
-            - Be precise with company names and job titles
-            """
-            
-            response = self.llm.invoke([HumanMessage(content=parsing_prompt)])
+            response = self.llm.invoke([HumanMessage(content=parsing_prompt)], call_site="resume_parser.parse_resume")
+            usage = getattr(response, "usage_metadata", None) or {}
             
             # Parse JSON response
             parsed_data = self._parse_json_response(response.content)
@@ -142,7 +364,10 @@ class GeminiResumeParser:
                 "source": "gemini",
                 "filename": filename,
                 "parsed_data": validated_data,
-                "raw_text": text
+                "raw_text": text,
+                "token_usage": self._token_usage(
+                    prepared, usage.get("input_tokens") or estimate_tokens(parsing_prompt)
+                )
             }
             
         except Exception as e:
@@ -195,55 +420,14 @@ class GeminiResumeParser:
     
     def _extract_text_from_content(self, content: bytes, filename: str) -> str:
         """Extract text from various file formats"""
-        try:
-            file_ext = filename.lower().split('.')[-1]
-            
-            if file_ext == 'pdf':
-                return self._extract_pdf_text(content)
-            elif file_ext in ['doc', 'docx']:
-                return self._extract_docx_text(content)
-            elif file_ext == 'txt':
-                return content.decode('utf-8', errors='ignore')
-            else:
-                # Try to decode as text
-                return content.decode('utf-8', errors='ignore')
-                
-        except Exception as e:
-            print(f"❌ Text extraction failed for {filename}: {e}")
-            # Fallback: try to decode as text
-            try:
-                return content.decode('utf-8', errors='ignore')
-            except:
-                return ""
-    
-    def _extract_pdf_text(self, content: bytes) -> str:
-        """Extract text from PDF content"""
-        try:
-            pdf_file = io.BytesIO(content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            
-            return text
-        except Exception as e:
-            print(f"PDF extraction error: {e}")
-            return ""
+        return self._extract_text(content, filename)
     
-    def _extract_docx_text(self, content: bytes) -> str:
-        """Extract text from DOCX content"""
+    def _extract_text(self, source, filename: str) -> str:
+        """Extract text from resume bytes or a file path in the extraction process pool"""
         try:
-            doc_file = io.BytesIO(content)
-            doc = docx.Document(doc_file)
-            
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            
-            return text
+            return extract_text_isolated(source, filename)
         except Exception as e:
-            print(f"DOCX extraction error: {e}")
+            print(f"❌ Text extraction failed for {filename}: {e}")
             return ""
     
     def _parse_json_response(self, response_text: str) -> Dict:
@@ -270,6 +454,22 @@ class GeminiResumeParser:
             print(f"Error parsing JSON response: {e}")
             return {}
     
+    def _parse_json_array_response(self, response_text: str) -> List[Dict]:
+        """Parse a JSON array (or an object keyed by resume id) from Gemini"""
+        try:
+            cleaned = response_text.strip()
+            start_idx = cleaned.find('[')
+            end_idx = cleaned.rfind(']')
+            
+            if start_idx != -1 and end_idx != -1 and start_idx < cleaned.find('{'):
+                return json.loads(cleaned[start_idx:end_idx + 1])
+            
+            keyed = self._parse_json_response(cleaned)
+            return [{"resume_id": key, **value} for key, value in keyed.items() if isinstance(value, dict)]
+        except Exception as e:
+            print(f"Error parsing JSON array response: {e}")
+            return []
+    
     def _validate_gemini_response(self, data: Dict, original_text: str) -> Dict:
         """Validate and enhance Gemini response"""
         # Ensure required fields exist
@@ -376,75 +576,20 @@ class GeminiResumeParser:
         return None
     
     def _extract_technical_skills_fallback(self, text: str) -> List[str]:
-        """Extract technical skills using keyword matching"""
-        technical_keywords = [
-            'python', 'java', 'javascript', 'react', 'angular', 'vue', 'node.js', 'express',
-            'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch',
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git',
-            'html', 'css', 'bootstrap', 'tailwind', 'sass', 'less',
-            'django', 'flask', 'spring', 'hibernate', 'laravel', 'rails',
-            'machine learning', 'ai', 'data science', 'tensorflow', 'pytorch',
-            'api', 'rest', 'graphql', 'microservices', 'devops', 'ci/cd'
-        ]
-        
-        found_skills = []
-        text_lower = text.lower()
-        
-        for skill in technical_keywords:
-            if skill in text_lower:
-                found_skills.append(skill.title())
-        
-        return list(set(found_skills))  # Remove duplicates
+        """Extract technical skills using the shared skill matcher"""
+        return [skill.title() for skill in match_skills(text).get("technical_skills", ())]
     
     def _extract_soft_skills_fallback(self, text: str) -> List[str]:
-        """Extract soft skills using keyword matching"""
-        soft_skills_keywords = [
-            'leadership', 'communication', 'teamwork', 'problem solving',
-            'analytical', 'creative', 'adaptable', 'organized', 'detail oriented',
-            'time management', 'project management', 'collaboration'
-        ]
-        
-        found_skills = []
-        text_lower = text.lower()
-        
-        for skill in soft_skills_keywords:
-            if skill in text_lower:
-                found_skills.append(skill.title())
-        
-        return list(set(found_skills))
+        """Extract soft skills using the shared skill matcher"""
+        return [skill.title() for skill in match_skills(text).get("soft_skills", ())]
     
     def _extract_programming_languages_fallback(self, text: str) -> List[str]:
         """Extract programming languages"""
-        languages = [
-            'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'php',
-            'ruby', 'go', 'rust', 'swift', 'kotlin', 'scala', 'r', 'matlab'
-        ]
-        
-        found_languages = []
-        text_lower = text.lower()
-        
-        for lang in languages:
-            if lang in text_lower:
-                found_languages.append(lang.title())
-        
-        return list(set(found_languages))
+        return [skill.title() for skill in match_skills(text).get("programming_languages", ())]
     
     def _extract_tools_fallback(self, text: str) -> List[str]:
         """Extract tools and technologies"""
-        tools = [
-            'git', 'github', 'gitlab', 'jira', 'confluence', 'slack',
-            'docker', 'kubernetes', 'jenkins', 'travis', 'circleci',
-            'aws', 'azure', 'gcp', 'heroku', 'netlify', 'vercel'
-        ]
-        
-        found_tools = []
-        text_lower = text.lower()
-        
-        for tool in tools:
-            if tool in text_lower:
-                found_tools.append(tool.title())
-        
-        return list(set(found_tools))
+        return [skill.title() for skill in match_skills(text).get("tools_technologies", ())]
     
     def _extract_summary_fallback(self, text: str) -> Optional[str]:
         """Extract professional summary"""
@@ -520,15 +665,7 @@ class GeminiResumeParser:
     
     def _extract_languages_fallback(self, text: str) -> List[str]:
         """Extract spoken languages"""
-        languages = ['english', 'spanish', 'french', 'german', 'chinese', 'japanese', 'hindi', 'arabic']
-        found_languages = []
-        
-        text_lower = text.lower()
-        for lang in languages:
-            if lang in text_lower:
-                found_languages.append(lang.title())
-        
-        return list(set(found_languages))
+        return [skill.title() for skill in match_skills(text).get("spoken_languages", ())]
     
     def _calculate_total_experience_fallback(self, text: str) -> float:
         """Calculate total experience years"""
@@ -560,4 +697,15 @@ class GeminiResumeParser:
             if any(keyword in line.lower() for keyword in achievement_keywords):
                 achievements.append(line.strip())
         
-        return achievements[:5]  # Limit to 5 achievements
\ No newline at end of file
+        return achievements[:5]  # Limit to 5 achievements
+
+_shared_parser: Optional[GeminiResumeParser] = None
+_shared_parser_lock = threading.Lock()
+
+def get_resume_parser() -> GeminiResumeParser:
+    """Process-wide parser, so requests share one LLM client and parse cache"""
+    global _shared_parser
+    with _shared_parser_lock:
+        if _shared_parser is None:
+            _shared_parser = GeminiResumeParser()
+        return _shared_parser
@@ -1,16 +1,11 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+from core.llm.client import get_llm
 from langchain_core.messages import HumanMessage
-import os
 import json
 from datetime import datetime
 
 class JobDescriptionGenerator:
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            temperature=0.7,
-            google_api_key=os.getenv("GEMINI_API_KEY")
-        )
+        self.llm = get_llm(temperature=0.7)
     
     def generate_job_description(self, requirements: dict) -> dict:
         """Generate comprehensive job description from requirements"""
@@ -51,7 +46,7 @@ class JobDescriptionGenerator:
             }}
             """
             
-            response = self.llm.invoke([HumanMessage(content=generation_prompt)])
+            response = self.llm.invoke([HumanMessage(content=generation_prompt)], call_site="jd_generator.generate_job_description")
             jd_data = self._parse_json_response(response.content)
             
             # Add metadata
@@ -90,7 +85,7 @@ class JobDescriptionGenerator:
         """
         
         try:
-            response = self.llm.invoke([HumanMessage(content=optimization_prompt)])
+            response = self.llm.invoke([HumanMessage(content=optimization_prompt)], call_site="jd_generator.optimize_jd_for_sourcing")
             return self._parse_json_response(response.content)
         except Exception as e:
             return {"error": str(e)}
@@ -0,0 +1,248 @@
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from core.tools.applicant_scoring import (
+    build_applicant_matrix, combine_scores, experience_scores, job_skill_columns, score_applicant_matrix, skill_scores
+)
+from core.tools.match_scoring import recommendation_for
+from core.tools.skill_index import normalize_skill
+
+# Recommended jobs kept per candidate
+RECOMMENDED_JOBS_PER_CANDIDATE = int(os.getenv("RECOMMENDED_JOBS_PER_CANDIDATE", "10"))
+# Share of the recommendation score given to resume/job embedding similarity
+# when both are embedded; the rest is the applicant match score
+RECOMMENDATION_SIMILARITY_WEIGHT = float(os.getenv("RECOMMENDATION_SIMILARITY_WEIGHT", "0.3"))
+# Reload the cached active jobs after this many seconds, which picks up jobs
+# written by other worker processes; 0 keeps them until the process restarts
+JOB_FEATURE_CACHE_MAX_AGE = float(os.getenv("JOB_FEATURE_CACHE_MAX_AGE", "900"))
+
+# A candidate row is (candidate_id, skills, experience_years, overall_score)
+CandidateRow = Tuple[int, Sequence[str], float, float]
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    """Rows scaled to length 1 so a dot product is the cosine; zero rows stay zero"""
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-12)
+
+def blend_similarity(match_score, similarity, has_similarity) -> np.ndarray:
+    """0-100 recommendation score: the match score, mixed with embedding similarity where it is known"""
+    blended = (
+        (1 - RECOMMENDATION_SIMILARITY_WEIGHT) * match_score
+        + RECOMMENDATION_SIMILARITY_WEIGHT * 100 * np.clip(similarity, 0.0, 1.0)
+    )
+    return np.round(np.where(has_similarity, blended, match_score), 1)
+
+def explain(columns: Dict, skills: set) -> Tuple[List[str], List[str]]:
+    """Strengths (the job's skills the candidate has) and gaps (missing required skills)"""
+    return (
+        [skill for skill in columns["required"] + columns["preferred"] if skill in skills],
+        [skill for skill in columns["required"] if skill not in skills]
+    )
+
+def recommendation_row(job: Dict, skills: set, score: float, skill_score: float,
+                       experience_score: float, similarity: Optional[float]) -> Dict:
+    strengths, gaps = explain(job["columns"], skills)
+    return {
+        "job_id": job["id"],
+        "title": job["title"],
+        "score": float(score),
+        "skill_score": round(float(skill_score), 3),
+        "experience_score": round(float(experience_score), 3),
+        "similarity": None if similarity is None else round(float(similarity), 4),
+        "strengths": strengths,
+        "gaps": gaps,
+        "recommendation": recommendation_for(score)
+    }
+
+def job_features(job: Dict, embedding: Optional[Sequence[float]] = None) -> Dict:
+    """What scoring needs of a job: its skill columns, experience range and embedding"""
+    return {
+        "id": job["id"],
+        "title": job.get("title") or "",
+        "columns": job_skill_columns(job),
+        # float64 so both scoring paths round the blended score identically
+        "embedding": None if embedding is None else _unit(np.asarray(embedding, dtype=np.float64))
+    }
+
+def score_job(features: Dict, rows: Iterable[CandidateRow],
+              embeddings: Dict[int, Sequence[float]]) -> Dict[str, np.ndarray]:
+    """Score many candidates against one job; same scores as ``JobFeatureCache.recommend``"""
+    columns = features["columns"]
+    matrix = build_applicant_matrix(columns, (
+        (candidate_id, candidate_id, skills, years, overall_score)
+        for candidate_id, skills, years, overall_score in rows
+    ))
+    scores = score_applicant_matrix(columns, matrix)
+    candidate_ids = matrix["candidate_ids"].tolist()
+
+    similarity = np.zeros(len(candidate_ids), dtype=np.float64)
+    has_similarity = np.zeros(len(candidate_ids), dtype=bool)
+    if features["embedding"] is not None:
+        dimension = len(features["embedding"])
+        present = [
+            row for row, candidate_id in enumerate(candidate_ids)
+            if embeddings.get(candidate_id) is not None and len(embeddings[candidate_id]) == dimension
+        ]
+        if present:
+            vectors = np.asarray([embeddings[candidate_ids[row]] for row in present], dtype=np.float64)
+            similarity[present] = _unit(vectors) @ features["embedding"]
+            has_similarity[present] = True
+    return {
+        "candidate_ids": matrix["candidate_ids"],
+        "score": blend_similarity(scores["match_score"], similarity, has_similarity),
+        "skill_score": scores["skill_score"],
+        "experience_score": scores["experience_score"],
+        "similarity": similarity,
+        "has_similarity": has_similarity
+    }
+
+class JobFeatureCache:
+    """Active jobs as arrays, for scoring candidates against all of them at once.
+
+    Features are kept per job so a published or closed job is a single update;
+    the job x skill matrices are rebuilt from them on the next query. Each
+    candidate's skills are multi-hot over the skills any active job lists, so
+    required and preferred hits for every job come from two matrix products.
+    """
+
+    def __init__(self, max_age: float = JOB_FEATURE_CACHE_MAX_AGE):
+        self.max_age = max_age
+        self.loaded_at: Optional[float] = None
+        self._jobs: Dict[int, Dict] = {}
+        self._arrays: Optional[Dict] = None
+        self._lock = threading.RLock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def stale(self) -> bool:
+        return not self.loaded or (self.max_age > 0 and time.monotonic() - self.loaded_at > self.max_age)
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def load(self, jobs: Iterable[Dict], embeddings: Dict[int, Sequence[float]]):
+        """Replace the cache with these active jobs (dicts of job columns) and their stored embeddings"""
+        features = {job["id"]: job_features(job, embeddings.get(job["id"])) for job in jobs}
+        with self._lock:
+            self._jobs = features
+            self._arrays = None
+            self.loaded_at = time.monotonic()
+
+    def upsert(self, job: Dict, embedding: Optional[Sequence[float]] = None):
+        """Add or refresh an active job; a no-op until the cache has been loaded"""
+        if not self.loaded:
+            return
+        features = job_features(job, embedding)
+        with self._lock:
+            self._jobs[job["id"]] = features
+            self._arrays = None
+
+    def remove(self, job_id: int):
+        with self._lock:
+            if self._jobs.pop(job_id, None) is not None:
+                self._arrays = None
+
+    def features(self, job_id: int) -> Optional[Dict]:
+        return self._jobs.get(job_id)
+
+    def _build_arrays(self) -> Dict:
+        # Jobs in id order, so stable sorts break score ties by job id
+        jobs = [self._jobs[job_id] for job_id in sorted(self._jobs)]
+        vocabulary = sorted({
+            skill for job in jobs for skill in job["columns"]["required"] + job["columns"]["preferred"]
+        })
+        column_of = {skill: column for column, skill in enumerate(vocabulary)}
+        required = np.zeros((len(vocabulary), len(jobs)), dtype=np.float32)
+        preferred = np.zeros((len(vocabulary), len(jobs)), dtype=np.float32)
+        for index, job in enumerate(jobs):
+            required[[column_of[skill] for skill in job["columns"]["required"]], index] = 1
+            preferred[[column_of[skill] for skill in job["columns"]["preferred"]], index] = 1
+
+        embedded = [job["embedding"] for job in jobs if job["embedding"] is not None]
+        dimensions = {len(embedding) for embedding in embedded}
+        embeddings = None
+        if len(dimensions) == 1:
+            embeddings = np.zeros((len(jobs), dimensions.pop()), dtype=np.float64)
+            for index, job in enumerate(jobs):
+                if job["embedding"] is not None:
+                    embeddings[index] = job["embedding"]
+        return {
+            "jobs": jobs,
+            "column_of": column_of,
+            "required": required,
+            "preferred": preferred,
+            "required_count": required.sum(axis=0),
+            "preferred_count": preferred.sum(axis=0),
+            "min_years": np.asarray([job["columns"]["min_years"] for job in jobs], dtype=np.float32),
+            "max_years": np.asarray([job["columns"]["max_years"] for job in jobs], dtype=np.float32),
+            "embeddings": embeddings,
+            "has_embedding": np.asarray([job["embedding"] is not None for job in jobs], dtype=bool)
+        }
+
+    def arrays(self) -> Dict:
+        with self._lock:
+            if self._arrays is None:
+                self._arrays = self._build_arrays()
+            return self._arrays
+
+    def recommend(self, rows: Sequence[CandidateRow], embeddings: Dict[int, Sequence[float]],
+                  limit: int = RECOMMENDED_JOBS_PER_CANDIDATE) -> Dict[int, List[Dict]]:
+        """Top ``limit`` active jobs for each candidate row, best first"""
+        arrays = self.arrays()
+        jobs = arrays["jobs"]
+        if not jobs or not rows:
+            return {row[0]: [] for row in rows}
+
+        column_of = arrays["column_of"]
+        skill_sets = [{normalize_skill(skill) for skill in skills or ()} for _, skills, _, _ in rows]
+        hot = np.zeros((len(rows), len(column_of)), dtype=np.float32)
+        for row, skills in enumerate(skill_sets):
+            hot[row, [column_of[skill] for skill in skills if skill in column_of]] = 1
+
+        # candidates x jobs
+        skill_score = skill_scores(
+            hot @ arrays["required"], arrays["required_count"], hot @ arrays["preferred"], arrays["preferred_count"]
+        )
+        years = np.asarray([row[2] or 0.0 for row in rows], dtype=np.float32)[:, None]
+        experience_score = experience_scores(years, arrays["min_years"], arrays["max_years"])
+        overall = np.asarray([row[3] or 0.0 for row in rows], dtype=np.float32)[:, None]
+        match_score = combine_scores(skill_score, experience_score, overall)
+
+        similarity = np.zeros(match_score.shape, dtype=np.float64)
+        has_similarity = np.zeros(match_score.shape, dtype=bool)
+        if arrays["embeddings"] is not None:
+            dimension = arrays["embeddings"].shape[1]
+            vectors = np.zeros((len(rows), dimension), dtype=np.float64)
+            has_vector = np.zeros(len(rows), dtype=bool)
+            for row, (candidate_id, _, _, _) in enumerate(rows):
+                embedding = embeddings.get(candidate_id)
+                if embedding is not None and len(embedding) == dimension:
+                    vectors[row] = embedding
+                    has_vector[row] = True
+            similarity = _unit(vectors) @ arrays["embeddings"].T
+            has_similarity = has_vector[:, None] & arrays["has_embedding"][None, :]
+        score = blend_similarity(match_score, similarity, has_similarity)
+
+        recommendations = {}
+        for row, (candidate_id, _, _, _) in enumerate(rows):
+            best = np.argsort(-score[row], kind="stable")[:limit].tolist()
+            recommendations[candidate_id] = [
+                recommendation_row(
+                    jobs[column], skill_sets[row], score[row, column], skill_score[row, column],
+                    experience_score[row, column], similarity[row, column] if has_similarity[row, column] else None
+                )
+                for column in best
+            ]
+        return recommendations
+
+_job_feature_cache: Optional[JobFeatureCache] = None
+
+def get_job_feature_cache() -> JobFeatureCache:
+    """Shared cache for the process"""
+    global _job_feature_cache
+    if _job_feature_cache is None:
+        _job_feature_cache = JobFeatureCache()
+    return _job_feature_cache
@@ -0,0 +1,151 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Set, Tuple
+from core.tools.embeddings import embed_texts
+from core.tools.skill_matcher import match_skills
+
+# Weights of the local match score components; they sum to 1
+MATCH_WEIGHTS = {"skills": 0.5, "experience": 0.2, "similarity": 0.3}
+# Preferred skills count for this share of the skill score when a job lists them
+PREFERRED_SKILL_WEIGHT = 0.2
+# Characters of candidate text compared with the job, which keeps embedding cheap
+SIMILARITY_TEXT_CHARS = 2000
+
+JOB_SKILL_FIELDS = ("required_skills", "technical_skills", "skills")
+JOB_PREFERRED_FIELDS = ("preferred_skills",)
+JOB_TEXT_FIELDS = ("title", "job_title", "role_summary", "description", "responsibilities",
+                   "required_qualifications", "preferred_qualifications")
+# Dictionary categories that count as job skills when a job has no skill list
+SKILL_CATEGORIES = ("technical_skills", "programming_languages", "tools_technologies", "soft_skills")
+
+_YEARS = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:(?:-|–|to)\s*\d+(?:\.\d+)?\s*)?\+?\s*(?:years|yrs)", re.IGNORECASE)
+_WORD = re.compile(r"[a-z0-9+#]{2,}")
+STOPWORDS = {
+    "and", "the", "for", "with", "you", "our", "are", "will", "this", "that", "from", "have", "has",
+    "your", "who", "all", "can", "not", "but", "job", "role", "work", "team", "years", "experience",
+}
+
+def _strings(value) -> List[str]:
+    """Flatten str / list / dict values into a list of strings"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [item for nested in value.values() for item in _strings(nested)]
+    if isinstance(value, (list, tuple, set)):
+        return [item for nested in value for item in _strings(nested)]
+    return [str(value)]
+
+def _normalize_skills(values: Iterable[str]) -> Set[str]:
+    return {value.strip().lower() for value in values if value and value.strip()}
+
+def parse_min_years(text: str) -> float:
+    """Lower bound of "3-5 years", "5+ yrs" and the like; 0 when not stated"""
+    match = _YEARS.search(text or "")
+    return float(match.group(1)) if match else 0.0
+
+def job_requirements(job: Dict) -> Dict:
+    """Skills, minimum experience and comparison text of a job dict (DB row or generated JD)"""
+    text = " ".join(item for field in JOB_TEXT_FIELDS for item in _strings(job.get(field)))
+    required = _normalize_skills(item for field in JOB_SKILL_FIELDS for item in _strings(job.get(field)))
+    preferred = _normalize_skills(item for field in JOB_PREFERRED_FIELDS for item in _strings(job.get(field)))
+    if not required:
+        matched = match_skills(text)
+        required = _normalize_skills(name for category in SKILL_CATEGORIES for name in matched.get(category, ()))
+    min_years = job.get("min_experience_years") or parse_min_years(str(job.get("experience_level") or ""))
+    return {
+        "required_skills": required,
+        "preferred_skills": preferred - required,
+        "min_years": float(min_years or 0),
+        "text": " ".join([text, " ".join(sorted(required | preferred))]).strip()
+    }
+
+def candidate_profile(candidate: Dict) -> Dict:
+    """Skills, years and text of an analyzed resume or a candidate dict"""
+    skills = _normalize_skills(_strings(candidate.get("skills")))
+    parsed = candidate.get("parsed_data") or {}
+    skills |= _normalize_skills(_strings(parsed.get("skills")))
+    experience = candidate.get("experience")
+    years = candidate.get("experience_years")
+    if years is None and isinstance(experience, dict):
+        years = experience.get("total_years")
+    text = candidate.get("resume_text") or parsed.get("text") or ""
+    return {
+        "skills": skills,
+        "years": float(years or 0),
+        "text": (text[:SIMILARITY_TEXT_CHARS] + " " + " ".join(sorted(skills))).strip()
+    }
+
+def skill_overlap(required: Set[str], preferred: Set[str], have: Set[str]) -> Tuple[float, List[str], List[str]]:
+    """Score in [0, 1], matched skills and missing required skills"""
+    if not required and not preferred:
+        return 0.5, [], []
+    matched_required = required & have
+    score = len(matched_required) / len(required) if required else 1.0
+    if preferred:
+        score = (1 - PREFERRED_SKILL_WEIGHT) * score + PREFERRED_SKILL_WEIGHT * len(preferred & have) / len(preferred)
+    return score, sorted(matched_required | (preferred & have)), sorted(required - have)
+
+def recommendation_for(score: float) -> str:
+    """Recommendation text for a 0-100 match score"""
+    if score >= 75:
+        return "Strong candidate for interview"
+    if score >= 50:
+        return "Consider for screening"
+    return "Weak match"
+
+def experience_fit(years: float, min_years: float) -> float:
+    if min_years <= 0:
+        return 1.0
+    return min(1.0, years / min_years)
+
+def _keyword_vector(text: str) -> Counter:
+    return Counter(word for word in _WORD.findall(text.lower()) if word not in STOPWORDS)
+
+def _cosine(a: Counter, b: Counter) -> float:
+    if not a or not b:
+        return 0.0
+    dot = sum(count * b[word] for word, count in a.items() if word in b)
+    norm = math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values()))
+    return dot / norm if norm else 0.0
+
+def text_similarities(query: str, texts: List[str]) -> Tuple[List[float], str]:
+    """Similarity of each text to the query in [0, 1], and the method used"""
+    vectors = embed_texts([query] + texts) if texts else None
+    if vectors:
+        query_vector = vectors[0]
+        return [max(0.0, sum(q * v for q, v in zip(query_vector, vector))) for vector in vectors[1:]], "embedding"
+    query_counts = _keyword_vector(query)
+    return [_cosine(query_counts, _keyword_vector(text)) for text in texts], "keyword"
+
+def score_candidates(job: Dict, candidates: List[Dict]) -> List[Dict]:
+    """Cheap local match score (0-100) with its breakdown for every candidate"""
+    requirements = job_requirements(job)
+    profiles = [candidate_profile(candidate) for candidate in candidates]
+    similarities, method = text_similarities(requirements["text"], [profile["text"] for profile in profiles])
+
+    scores = []
+    for profile, similarity in zip(profiles, similarities):
+        skill_score, matched, missing = skill_overlap(
+            requirements["required_skills"], requirements["preferred_skills"], profile["skills"]
+        )
+        experience_score = experience_fit(profile["years"], requirements["min_years"])
+        local_score = 100 * (
+            MATCH_WEIGHTS["skills"] * skill_score
+            + MATCH_WEIGHTS["experience"] * experience_score
+            + MATCH_WEIGHTS["similarity"] * similarity
+        )
+        scores.append({
+            "local_score": round(local_score, 1),
+            "skill_score": round(skill_score, 3),
+            "experience_score": round(experience_score, 3),
+            "similarity": round(similarity, 3),
+            "similarity_method": method,
+            "matched_skills": matched,
+            "missing_skills": missing,
+            "experience_years": profile["years"],
+            "required_years": requirements["min_years"]
+        })
+    return scores
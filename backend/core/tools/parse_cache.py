@@ -0,0 +1,107 @@
+import os
+import json
+import hashlib
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "resume_parse"
+
+class ResumeParseCache:
+    """Content-addressed disk cache for parsed resumes.
+    
+    Entries are keyed by the SHA-256 of the uploaded file bytes and live under a
+    directory named after the parser version, so changing the prompt or model
+    moves lookups to a fresh namespace. ``purge_stale`` removes old namespaces.
+    """
+    
+    def __init__(self, version: str, cache_dir: Optional[str] = None):
+        self.version = version
+        self.root = Path(cache_dir or os.getenv("RESUME_PARSE_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.version_dir = self.root / version
+        self.enabled = os.getenv("RESUME_PARSE_CACHE", "true").lower() not in ("0", "false", "no")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def content_hash(file_content: bytes) -> str:
+        """SHA-256 hex digest of the raw file bytes"""
+        return hashlib.sha256(file_content).hexdigest()
+    
+    @staticmethod
+    def file_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+        """SHA-256 hex digest of a file on disk, read in chunks"""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _entry_path(self, content_hash: str) -> Path:
+        return self.version_dir / content_hash[:2] / f"{content_hash}.json"
+    
+    def get(self, content_hash: str) -> Optional[Dict]:
+        """Return the cached parse result, or None on a miss"""
+        if not self.enabled:
+            return None
+        
+        entry = None
+        path = self._entry_path(content_hash)
+        try:
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Parse cache read failed for {content_hash[:12]}: {e}")
+            entry = None
+        
+        with self._lock:
+            if entry is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry
+    
+    def set(self, content_hash: str, result: Dict) -> None:
+        """Store a parse result; written atomically so readers never see partial files"""
+        if not self.enabled:
+            return
+        
+        path = self._entry_path(content_hash)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(result, f, default=str)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️ Parse cache write failed for {content_hash[:12]}: {e}")
+    
+    def invalidate(self, content_hash: str) -> bool:
+        """Drop a single cached entry"""
+        path = self._entry_path(content_hash)
+        if path.exists():
+            path.unlink()
+            return True
+        return False
+    
+    def purge_stale(self) -> int:
+        """Remove entries written by other parser/prompt versions"""
+        removed = 0
+        if not self.root.exists():
+            return removed
+        for child in self.root.iterdir():
+            if child.is_dir() and child.name != self.version:
+                shutil.rmtree(child, ignore_errors=True)
+                removed += 1
+        return removed
+    
+    def clear(self) -> None:
+        """Remove every entry for the current version"""
+        shutil.rmtree(self.version_dir, ignore_errors=True)
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "version": self.version}
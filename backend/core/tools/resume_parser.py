@@ -1,8 +1,7 @@
-import PyPDF2
-import docx
 import re
 from typing import Dict, Any
-import io
+from core.tools.skill_matcher import match_skills
+from core.tools.text_extraction import extract_text_isolated
 
 class ResumeParser:
     def __init__(self):
@@ -31,24 +30,14 @@ class ResumeParser:
     def _extract_pdf_text(self, file_content: bytes) -> str:
         """Extract text from PDF"""
         try:
-            pdf_file = io.BytesIO(file_content)
-            reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+            return extract_text_isolated(file_content, "resume.pdf")
         except Exception as e:
             raise ValueError(f"Error reading PDF: {str(e)}")
     
     def _extract_docx_text(self, file_content: bytes) -> str:
         """Extract text from DOCX"""
         try:
-            doc_file = io.BytesIO(file_content)
-            doc = docx.Document(doc_file)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            return extract_text_isolated(file_content, "resume.docx")
         except Exception as e:
             raise ValueError(f"Error reading DOCX: {str(e)}")
     
@@ -102,17 +91,4 @@ class ResumeParser:
     
     def _extract_basic_skills(self, text: str) -> list:
         """Extract basic skills (simple keyword matching)"""
-        common_skills = [
-            'python', 'java', 'javascript', 'react', 'node.js', 'sql', 'mongodb',
-            'aws', 'docker', 'kubernetes', 'git', 'machine learning', 'ai',
-            'project management', 'leadership', 'communication', 'teamwork'
-        ]
-        
-        found_skills = []
-        text_lower = text.lower()
-        
-        for skill in common_skills:
-            if skill in text_lower:
-                found_skills.append(skill)
-        
-        return found_skills
\ No newline at end of file
+        return list(match_skills(text).get("common_skills", ()))
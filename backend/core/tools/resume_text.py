@@ -0,0 +1,192 @@
+import os
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# Approximate input tokens of resume text sent in a single-resume prompt
+RESUME_PROMPT_TOKEN_BUDGET = int(os.getenv("RESUME_PROMPT_TOKEN_BUDGET", "6000"))
+# Lines within this many lines of a page edge can be running headers/footers
+PAGE_EDGE_LINES = 3
+REPEATED_LINE_MAX_CHARS = 80
+
+# Section headings and the section they start
+SECTION_HEADINGS = {
+    "contact": ["contact", "contact information", "contact details", "personal information", "personal details"],
+    "summary": ["summary", "professional summary", "profile", "objective", "career objective", "about me", "about"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "competencies",
+               "technologies", "tech stack", "tools", "expertise", "areas of expertise"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history"],
+    "education": ["education", "academic background", "academics", "qualifications", "academic qualifications"],
+    "certifications": ["certifications", "certificates", "licenses", "licenses and certifications"],
+    "projects": ["projects", "personal projects", "key projects"],
+    "achievements": ["achievements", "awards", "honors", "honours", "accomplishments"],
+    "languages": ["languages", "spoken languages"],
+    "other": ["interests", "hobbies", "references", "volunteering", "volunteer experience",
+              "publications", "activities", "extracurricular activities"],
+}
+
+# When the text is over budget the core sections share the budget first, then
+# the rest fill what is left in priority order. The unlabeled top of the resume
+# (name, email, phone) is always treated as contact.
+CORE_SECTIONS = ["contact", "skills", "experience", "education"]
+SECTION_PRIORITY = ["summary", "certifications", "projects", "achievements", "languages", "other"]
+
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+_HEADING_CLEAN = re.compile(r"[^a-z& ]+")
+# "3", "- 3 -", "Page 3", "3 of 5", "Page 3/5" (not years or other long numbers)
+_PAGE_NUMBER = re.compile(r"^(?:page\s*)?[-–—\s]*\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?[-–—\s]*$", re.IGNORECASE)
+# Years and date ranges ("2016 - 2019", "Jan 2020 – Present") are employment history, never running headers
+_YEAR = re.compile(r"\b(?:19|20)\d{2}\b")
+_INLINE_WHITESPACE = re.compile(r"[ \t\f\v\u00a0\u2000-\u200b]+")
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token is close enough for budgeting English resumes
+    return len(text) // 4 + 1
+
+def normalize_resume_text(text: str) -> str:
+    """Clean extracted resume text for LLM prompts.
+
+    Collapses whitespace runs, drops page numbers, keeps only the first copy of
+    running headers/footers (short lines repeated at the edges of several pages,
+    which extraction separates with form feeds) and squeezes blank lines. A
+    repeated line is only dropped where it sits at a page edge; copies in the
+    body of a page are kept.
+    """
+    text = unicodedata.normalize("NFKC", text or "").replace("\r\n", "\n").replace("\r", "\n")
+    pages = []
+    for page in text.split("\f"):
+        lines = [_INLINE_WHITESPACE.sub(" ", line).strip() for line in page.split("\n")]
+        pages.append([line for line in lines if not _PAGE_NUMBER.match(line)])
+
+    boilerplate = _running_lines(pages)
+    seen_boilerplate = set()
+    cleaned: List[str] = []
+    for lines in pages:
+        edges = _edge_positions(lines)
+        for position, line in enumerate(lines):
+            if not line:
+                if cleaned and cleaned[-1]:
+                    cleaned.append("")
+                continue
+            key = line.lower()
+            if key in boilerplate and position in edges:
+                if key in seen_boilerplate:
+                    continue
+                seen_boilerplate.add(key)
+            cleaned.append(line)
+        if cleaned and cleaned[-1]:
+            cleaned.append("")
+
+    return "\n".join(cleaned).strip()
+
+def _edge_positions(lines: List[str]) -> set:
+    """Positions of the first and last ``PAGE_EDGE_LINES`` non-blank lines of a page"""
+    content = [position for position, line in enumerate(lines) if line]
+    return set(content[:PAGE_EDGE_LINES] + content[-PAGE_EDGE_LINES:])
+
+def _running_lines(pages: List[List[str]]) -> set:
+    """Short lines (lowercased) that sit at the top or bottom of at least two pages"""
+    if len(pages) < 2:
+        return set()
+    counts = Counter()
+    for lines in pages:
+        counts.update({
+            lines[position].lower() for position in _edge_positions(lines)
+            if len(lines[position]) <= REPEATED_LINE_MAX_CHARS
+            and not _heading_section(lines[position]) and not _YEAR.search(lines[position])
+        })
+    return {key for key, count in counts.items() if count >= 2}
+
+def _heading_section(line: str) -> Optional[str]:
+    """Section name if the line looks like a section heading"""
+    if len(line) > 40:
+        return None
+    key = _HEADING_CLEAN.sub("", line.lower().replace(" and ", " & ")).replace("&", "and")
+    return _HEADING_LOOKUP.get(" ".join(key.split()))
+
+def segment_sections(text: str) -> List[Tuple[str, str]]:
+    """Split normalized text into ``(section, text)`` pairs in document order"""
+    sections: List[Tuple[str, List[str]]] = [("contact", [])]
+    for line in text.split("\n"):
+        section = _heading_section(line)
+        if section:
+            sections.append((section, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(name, "\n".join(lines).strip()) for name, lines in sections if any(lines)]
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut at a line boundary so the text fits ``max_tokens``"""
+    kept, used = [], 0
+    for line in text.split("\n"):
+        line_tokens = estimate_tokens(line + "\n")
+        if used + line_tokens > max_tokens:
+            break
+        kept.append(line)
+        used += line_tokens
+    return "\n".join(kept).strip()
+
+def _fair_shares(sizes: List[int], budget: int) -> List[int]:
+    """Split ``budget`` so small sections fit whole and large ones share the rest"""
+    shares = [0] * len(sizes)
+    remaining = budget
+    by_size = sorted(range(len(sizes)), key=sizes.__getitem__)
+    for position, i in enumerate(by_size):
+        shares[i] = min(sizes[i], remaining // (len(sizes) - position))
+        remaining -= shares[i]
+    return shares
+
+def prepare_resume_text(text: str, token_budget: int = RESUME_PROMPT_TOKEN_BUDGET) -> Dict:
+    """Normalize resume text and fit it to a token budget, section by section.
+
+    Core sections (``CORE_SECTIONS``) split the budget fairly, then the others are
+    admitted in ``SECTION_PRIORITY`` order while budget remains. Sections that do
+    not fit are trimmed at a line boundary or dropped, and the kept text stays in
+    document order. Returns the prompt text with token accounting.
+    """
+    original_tokens = estimate_tokens(text or "")
+    normalized = normalize_resume_text(text)
+    normalized_tokens = estimate_tokens(normalized)
+    prepared = {
+        "text": normalized,
+        "original_tokens": original_tokens,
+        "normalized_tokens": normalized_tokens,
+        "input_tokens": normalized_tokens,
+        "truncated": False,
+        "trimmed_sections": [],
+        "dropped_sections": []
+    }
+    if normalized_tokens <= token_budget:
+        return prepared
+
+    sections = segment_sections(normalized)
+    sizes = [estimate_tokens(body + "\n\n") for _, body in sections]
+    core = [i for i, (name, _) in enumerate(sections) if name in CORE_SECTIONS]
+    allowance = dict(zip(core, _fair_shares([sizes[i] for i in core], token_budget)))
+
+    remaining = token_budget - sum(allowance.values())
+    rank = {name: i for i, name in enumerate(SECTION_PRIORITY)}
+    rest = sorted((i for i in range(len(sections)) if i not in allowance),
+                  key=lambda i: (rank.get(sections[i][0], len(rank)), i))
+    for i in rest:
+        allowance[i] = min(sizes[i], remaining)
+        remaining -= allowance[i]
+
+    kept: Dict[int, str] = {}
+    for i, (name, body) in enumerate(sections):
+        if allowance[i] >= sizes[i]:
+            kept[i] = body
+            continue
+        partial = _truncate_to_tokens(body, allowance[i]) if allowance[i] > 0 else ""
+        if partial:
+            kept[i] = partial
+            prepared["trimmed_sections"].append(name)
+        else:
+            prepared["dropped_sections"].append(name)
+
+    prepared["text"] = "\n\n".join(kept[i] for i in sorted(kept))
+    prepared["input_tokens"] = estimate_tokens(prepared["text"])
+    prepared["truncated"] = True
+    return prepared
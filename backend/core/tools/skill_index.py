@@ -0,0 +1,370 @@
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Rebuild the in-process index after this many seconds, which picks up writes
+# made by other worker processes; 0 keeps it until the process restarts
+SKILL_INDEX_MAX_AGE = float(os.getenv("SKILL_INDEX_MAX_AGE", "900"))
+SKILL_INDEX_ENABLED = os.getenv("SKILL_INDEX", "true").lower() not in ("0", "false", "no")
+
+CHUNK_BITS = 16
+CHUNK_BYTES = (1 << CHUNK_BITS) // 8
+# Chunks with more members than this are stored as a bitmap, as in Roaring
+ARRAY_MAX = 4096
+
+def normalize_skill(skill) -> str:
+    return str(skill).strip().lower()
+
+def clean_skills(skills):
+    """Skills as stored: surrounding whitespace stripped and blanks dropped.
+
+    The database's ``skill_keys`` column only lowercases, so storing stripped
+    skills keeps it in agreement with ``normalize_skill``.
+    """
+    if not isinstance(skills, (list, tuple)):
+        return skills
+    return [str(skill).strip() for skill in skills if skill is not None and str(skill).strip()]
+
+def _bitmap(offsets: Iterable[int]) -> int:
+    buffer = bytearray(CHUNK_BYTES)
+    for offset in offsets:
+        buffer[offset >> 3] |= 1 << (offset & 7)
+    return int.from_bytes(buffer, "little")
+
+def _offsets(bits: int) -> Iterator[int]:
+    for index, byte in enumerate(bits.to_bytes(CHUNK_BYTES, "little")):
+        while byte:
+            low = byte & -byte
+            yield (index << 3) + low.bit_length() - 1
+            byte ^= low
+
+def _members(container) -> Iterator[int]:
+    return _offsets(container) if isinstance(container, int) else iter(container)
+
+def _cardinality(container) -> int:
+    return container.bit_count() if isinstance(container, int) else len(container)
+
+def _compact(container):
+    """Smallest representation of a chunk; None when it is empty"""
+    if isinstance(container, int):
+        count = container.bit_count()
+        if count == 0:
+            return None
+        return array("H", _offsets(container)) if count <= ARRAY_MAX else container
+    if not container:
+        return None
+    return _bitmap(container) if len(container) > ARRAY_MAX else container
+
+def _and(a, b):
+    if isinstance(a, int) and isinstance(b, int):
+        # Left as a bitmap even when sparse; converting costs more than it saves mid-query
+        return (a & b) or None
+    if isinstance(a, int) or isinstance(b, int):
+        bits, offsets = (a, b) if isinstance(a, int) else (b, a)
+        data = bits.to_bytes(CHUNK_BYTES, "little")
+        return _compact(array("H", (o for o in offsets if data[o >> 3] >> (o & 7) & 1)))
+    return _compact(array("H", sorted(set(a).intersection(b))))
+
+def _or(a, b):
+    if isinstance(a, int) or isinstance(b, int):
+        a = a if isinstance(a, int) else _bitmap(a)
+        b = b if isinstance(b, int) else _bitmap(b)
+        return _compact(a | b)
+    return _compact(array("H", sorted(set(a).union(b))))
+
+class Bitmap:
+    """Set of non-negative ints in Roaring layout.
+
+    Values are split into 65536-wide chunks by their high bits. A chunk is a
+    sorted array of 16-bit offsets while it is sparse and a 65536-bit integer
+    once it has more than ``ARRAY_MAX`` members, so rare and common skills both
+    stay small and AND/OR work chunk by chunk.
+    """
+
+    __slots__ = ("chunks",)
+
+    def __init__(self, chunks: Optional[Dict[int, object]] = None):
+        self.chunks = chunks or {}
+
+    @classmethod
+    def from_ids(cls, values: Iterable[int]) -> "Bitmap":
+        grouped: Dict[int, set] = {}
+        for value in values:
+            grouped.setdefault(value >> CHUNK_BITS, set()).add(value & 0xFFFF)
+        return cls({high: _compact(array("H", sorted(lows))) for high, lows in grouped.items()})
+
+    @classmethod
+    def from_sorted(cls, values: Iterable[int]) -> "Bitmap":
+        """Faster ``from_ids`` for ascending values without duplicates"""
+        chunks: Dict[int, array] = {}
+        high, container = None, None
+        for value in values:
+            if value >> CHUNK_BITS != high:
+                high = value >> CHUNK_BITS
+                container = chunks[high] = array("H")
+            container.append(value & 0xFFFF)
+        return cls({high: _compact(container) for high, container in chunks.items()})
+
+    def add(self, value: int):
+        high, low = value >> CHUNK_BITS, value & 0xFFFF
+        container = self.chunks.get(high)
+        if container is None:
+            self.chunks[high] = array("H", [low])
+        elif isinstance(container, int):
+            self.chunks[high] = container | (1 << low)
+        else:
+            position = bisect_left(container, low)
+            if position == len(container) or container[position] != low:
+                container.insert(position, low)
+                if len(container) > ARRAY_MAX:
+                    self.chunks[high] = _bitmap(container)
+
+    def discard(self, value: int):
+        self.discard_many({value >> CHUNK_BITS: {value & 0xFFFF}})
+
+    def discard_many(self, lows_by_chunk: Dict[int, set], masks: Optional[Dict[int, int]] = None):
+        """Remove values grouped as {chunk: {offset, ...}}; ``masks`` caches their bitmaps across calls"""
+        for high, lows in lows_by_chunk.items():
+            container = self.chunks.get(high)
+            if container is None:
+                continue
+            if isinstance(container, int):
+                mask = masks.get(high) if masks is not None else None
+                if mask is None:
+                    mask = _bitmap(lows)
+                    if masks is not None:
+                        masks[high] = mask
+                if not container & mask:
+                    continue
+                container &= ~mask
+            else:
+                positions = [bisect_left(container, low) for low in lows]
+                present = [p for p, low in zip(positions, lows) if p < len(container) and container[p] == low]
+                if not present:
+                    continue
+                for position in sorted(present, reverse=True):
+                    del container[position]
+            container = _compact(container)
+            if container is None:
+                del self.chunks[high]
+            else:
+                self.chunks[high] = container
+
+    def __contains__(self, value: int) -> bool:
+        container = self.chunks.get(value >> CHUNK_BITS)
+        if container is None:
+            return False
+        low = value & 0xFFFF
+        if isinstance(container, int):
+            return bool(container >> low & 1)
+        position = bisect_left(container, low)
+        return position < len(container) and container[position] == low
+
+    def __len__(self) -> int:
+        return sum(_cardinality(container) for container in self.chunks.values())
+
+    def __iter__(self) -> Iterator[int]:
+        for high in sorted(self.chunks):
+            base = high << CHUNK_BITS
+            for low in _members(self.chunks[high]):
+                yield base | low
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        small, large = (self, other) if len(self.chunks) <= len(other.chunks) else (other, self)
+        chunks = {}
+        for high, container in small.chunks.items():
+            if high in large.chunks:
+                result = _and(container, large.chunks[high])
+                if result is not None:
+                    chunks[high] = result
+        return Bitmap(chunks)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        chunks = dict(self.chunks)
+        for high, container in other.chunks.items():
+            chunks[high] = _or(chunks[high], container) if high in chunks else container
+        return Bitmap(chunks)
+
+    def copy(self) -> "Bitmap":
+        return Bitmap({
+            high: container if isinstance(container, int) else array("H", container)
+            for high, container in self.chunks.items()
+        })
+
+    def first(self, limit: int) -> List[int]:
+        values = []
+        for value in self:
+            if len(values) >= limit:
+                break
+            values.append(value)
+        return values
+
+def _apply(postings: Dict[str, Bitmap], items: Iterable[Tuple[int, set]]):
+    """Set the skills of (candidate_id, normalized skills) pairs in ``postings``.
+
+    Old postings are cleared for the whole batch in one pass over the skills,
+    which costs about the same as clearing a single candidate.
+    """
+    items = list(items)
+    lows_by_chunk: Dict[int, set] = {}
+    for candidate_id, _ in items:
+        lows_by_chunk.setdefault(candidate_id >> CHUNK_BITS, set()).add(candidate_id & 0xFFFF)
+    masks: Dict[int, int] = {}
+    for posting in postings.values():
+        posting.discard_many(lows_by_chunk, masks)
+    for candidate_id, skills in items:
+        for skill in skills:
+            postings.setdefault(skill, Bitmap()).add(candidate_id)
+
+class SkillIndex:
+    """In-process skill -> candidate id index for AND/OR skill filters with counts.
+
+    Skills are matched case-insensitively. The index is built from the database
+    on first use, kept current by the candidate repository's writes, and rebuilt
+    after ``SKILL_INDEX_MAX_AGE`` seconds. Writes that land while a rebuild is
+    loading are replayed onto the new postings before they replace the old.
+    """
+
+    def __init__(self, max_age: float = SKILL_INDEX_MAX_AGE):
+        self.max_age = max_age
+        self.loaded_at: Optional[float] = None
+        self._dirty = False
+        self._postings: Dict[str, Bitmap] = {}
+        # Highest candidate id the index has seen; newer ids were written elsewhere
+        self.max_id = 0
+        # Writes made during a rebuild, by candidate id; None when no rebuild is loading
+        self._pending: Optional[Dict[int, set]] = None
+        self._lock = threading.RLock()
+        # Builds run outside ``_lock`` so queries keep using the old postings meanwhile
+        self._build_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def stale(self) -> bool:
+        return not self.loaded or self._dirty or (
+            self.max_age > 0 and time.monotonic() - self.loaded_at > self.max_age
+        )
+
+    def fresh(self) -> bool:
+        return self.loaded and not self.stale()
+
+    def invalidate(self):
+        """Rebuild on the next refresh; queries keep using the current postings until then"""
+        self._dirty = True
+
+    def build(self, rows: Iterable[Tuple[int, Iterable[str]]]):
+        """Replace the index with (candidate_id, skills) rows in ascending id order"""
+        grouped: Dict[str, List[int]] = {}
+        max_id = 0
+        for candidate_id, skills in rows:
+            max_id = candidate_id
+            for skill in {normalize_skill(skill) for skill in skills or ()}:
+                grouped.setdefault(skill, []).append(candidate_id)
+        postings = {skill: Bitmap.from_sorted(ids) for skill, ids in grouped.items()}
+        with self._lock:
+            # The rows may predate writes made while they loaded; those are applied on top
+            pending, self._pending = self._pending, None
+            if pending:
+                _apply(postings, pending.items())
+                max_id = max(max_id, max(pending))
+            self._postings = postings
+            self.max_id = max_id
+            self.loaded_at = time.monotonic()
+            self._dirty = False
+
+    def _build_from(self, load_rows: Callable[[], Iterable[Tuple[int, Iterable[str]]]]):
+        with self._lock:
+            self._pending = {}
+        try:
+            start = time.perf_counter()
+            self.build(load_rows())
+            print(f"🧭 Skill index built: {len(self._postings)} skills in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            print(f"⚠️ Skill index build failed: {e}")
+            with self._lock:
+                self._pending = None
+        finally:
+            self._build_lock.release()
+
+    def refresh(self, load_rows: Callable[[], Iterable[Tuple[int, Iterable[str]]]], wait: bool = False) -> bool:
+        """Start a rebuild in a background thread when the index is missing or stale.
+
+        Returns whether the index is fresh enough to answer queries now; while
+        it is missing or rebuilding, callers use their database fallback.
+        ``load_rows`` must open its own database session.
+        """
+        if not SKILL_INDEX_ENABLED:
+            return False
+        if self.stale() and self._build_lock.acquire(blocking=False):
+            if wait:
+                self._build_from(load_rows)
+            else:
+                threading.Thread(target=self._build_from, args=(load_rows,), name="skill-index-build",
+                                 daemon=True).start()
+        return self.fresh()
+
+    def update_many(self, items: Iterable[Tuple[int, Iterable[str]]]):
+        """Re-index (candidate_id, skills) pairs.
+
+        Before the first build only a rebuild in progress records them; one that
+        has not started yet reads them from the database anyway.
+        """
+        items = [(candidate_id, {normalize_skill(skill) for skill in skills or ()}) for candidate_id, skills in items]
+        if not items:
+            return
+        with self._lock:
+            if self._pending is not None:
+                self._pending.update(items)
+            if self.loaded:
+                _apply(self._postings, items)
+                self.max_id = max(self.max_id, max(candidate_id for candidate_id, _ in items))
+
+    def update(self, candidate_id: int, skills: Iterable[str]):
+        self.update_many([(candidate_id, skills)])
+
+    def remove(self, candidate_id: int):
+        self.update_many([(candidate_id, ())])
+
+    def match(self, all_of: Iterable[str] = (), any_of: Iterable[str] = ()) -> Bitmap:
+        """Candidates having every skill in ``all_of`` and at least one in ``any_of``"""
+        all_of = [normalize_skill(skill) for skill in all_of or ()]
+        any_of = [normalize_skill(skill) for skill in any_of or ()]
+        with self._lock:
+            postings = [self._postings.get(skill, Bitmap()) for skill in all_of]
+            if any_of:
+                union = Bitmap()
+                for skill in any_of:
+                    union = union | self._postings.get(skill, Bitmap())
+                postings.append(union)
+            if not postings:
+                return Bitmap()
+            # Intersect the smallest sets first so the running result shrinks quickly
+            postings.sort(key=len)
+            # Copied so later writes to the index never change a returned result
+            result = postings[0].copy()
+            for posting in postings[1:]:
+                if not result.chunks:
+                    break
+                result = result & posting
+            return result
+
+    def counts(self, all_of: Iterable[str] = (), any_of: Iterable[str] = ()) -> Dict:
+        """Size of the match and of each requested skill on its own"""
+        skills = [normalize_skill(skill) for skill in list(all_of or ()) + list(any_of or ())]
+        with self._lock:
+            by_skill = {skill: len(self._postings.get(skill, Bitmap())) for skill in skills}
+        return {"total": len(self.match(all_of, any_of)), "by_skill": by_skill}
+
+_skill_index: Optional[SkillIndex] = None
+
+def get_skill_index() -> SkillIndex:
+    """Shared index for the process"""
+    global _skill_index
+    if _skill_index is None:
+        _skill_index = SkillIndex()
+    return _skill_index
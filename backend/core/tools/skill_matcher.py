@@ -0,0 +1,104 @@
+import os
+import re
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+DEFAULT_DICTIONARY_PATH = Path(__file__).with_name("skill_dictionary.json")
+
+# Tokens keep + # & so "c++", "c#" and "r&d" stay whole, and dots or slashes so
+# "node.js" and "ci/cd" do too; compounds are also split into their parts
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9+#&./]+")
+_COMPOUND_SEPARATOR = re.compile(r"[./]+")
+
+def load_skill_dictionary(path: Optional[str] = None) -> Dict[str, List[Union[str, Dict]]]:
+    """Load ``{category: [term or {"term", "name", "case_sensitive"}]}`` from JSON"""
+    with open(path or DEFAULT_DICTIONARY_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _phrase_found(pattern: "re.Pattern", text: str) -> bool:
+    """True if ``pattern`` matches somewhere not preceded by a word character"""
+    for m in pattern.finditer(text):
+        start = m.start()
+        if start == 0 or not (text[start - 1].isalnum() or text[start - 1] == "_"):
+            return True
+    return False
+
+class SkillMatcher:
+    """Finds every dictionary skill in a text with a single tokenizing pass.
+
+    Tokens are looked up in hash sets, so matches always fall on whole words and
+    short names like "go" or "r" never fire inside ordinary words. Ambiguous terms
+    can be marked ``case_sensitive`` (e.g. "Go", "R", "AI") to only match their
+    usual written form. Multi-word terms are confirmed with a per-phrase regex,
+    which only runs once all of their words have been seen.
+    """
+
+    def __init__(self, dictionary: Dict[str, List[Union[str, Dict]]]):
+        self.categories: Dict[str, List[str]] = {}
+        self._insensitive: Dict[str, str] = {}
+        self._sensitive: Dict[str, str] = {}
+        self._phrases: List[Tuple[frozenset, "re.Pattern", bool, str]] = []
+        self._order: Dict[str, int] = {}
+
+        for category, entries in dictionary.items():
+            for entry in entries:
+                if isinstance(entry, str):
+                    entry = {"term": entry}
+                self._add(category, entry)
+
+    def _add(self, category: str, entry: Dict):
+        term = entry["term"]
+        case_sensitive = entry.get("case_sensitive", False)
+        name = entry.get("name", term.lower())
+
+        self._order.setdefault(name, len(self._order))
+        if category not in self.categories.setdefault(name, []):
+            self.categories[name].append(category)
+
+        if " " in term:
+            words = term.split() if case_sensitive else term.lower().split()
+            pattern = r"\s+".join(re.escape(w) for w in words) + r"(?![\w+#])"
+            # No IGNORECASE (case-insensitive phrases search the lowercased text) and
+            # no leading lookbehind, which keeps the engine's fast literal prefix scan
+            self._phrases.append((frozenset(words), re.compile(pattern), case_sensitive, name))
+        elif case_sensitive:
+            self._sensitive[term] = name
+        else:
+            self._insensitive[term.lower()] = name
+
+    def match(self, text: str) -> Dict[str, List[str]]:
+        """Return matched skill names per category, in dictionary order"""
+        tokens = {token.strip("./") for token in set(_TOKEN_PATTERN.findall(text))}
+        for compound in [t for t in tokens if "." in t or "/" in t]:
+            tokens.update(_COMPOUND_SEPARATOR.split(compound))
+        lowered = {token.lower() for token in tokens}
+        seen = lowered | tokens
+        text_lower = None
+
+        found = {self._insensitive[t] for t in lowered.intersection(self._insensitive)}
+        found.update(self._sensitive[t] for t in tokens.intersection(self._sensitive))
+        for words, pattern, case_sensitive, name in self._phrases:
+            if name in found or not words <= seen:
+                continue
+            if case_sensitive:
+                haystack = text
+            else:
+                text_lower = text_lower if text_lower is not None else text.lower()
+                haystack = text_lower
+            if _phrase_found(pattern, haystack):
+                found.add(name)
+
+        by_category: Dict[str, List[str]] = {}
+        for name in sorted(found, key=self._order.__getitem__):
+            for category in self.categories[name]:
+                by_category.setdefault(category, []).append(name)
+        return by_category
+
+SKILL_MATCHER = SkillMatcher(load_skill_dictionary(os.getenv("SKILL_DICTIONARY_PATH")))
+
+@lru_cache(maxsize=64)
+def match_skills(text: str) -> Dict[str, Tuple[str, ...]]:
+    """Cached scan so the fallback extractors for one resume share a single pass"""
+    return {category: tuple(names) for category, names in SKILL_MATCHER.match(text).items()}
@@ -0,0 +1,175 @@
+import io
+import itertools
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Union
+import PyPDF2
+import docx
+
+try:
+    import resource
+except ImportError:  # Windows has no per-process CPU rlimits
+    resource = None
+
+# Worker processes used for PDF/DOCX extraction (0 runs extraction in-process)
+EXTRACTION_PROCESSES = int(os.getenv("RESUME_EXTRACTION_PROCESSES", str(min(4, os.cpu_count() or 1))))
+# Wall-clock and CPU limits for a single document
+EXTRACTION_TIMEOUT_SECONDS = float(os.getenv("RESUME_EXTRACTION_TIMEOUT", "30"))
+EXTRACTION_CPU_SECONDS = int(os.getenv("RESUME_EXTRACTION_CPU_SECONDS", "20"))
+# Early exit: resumes rarely need more than this many pages/characters
+MAX_PDF_PAGES = int(os.getenv("RESUME_MAX_PDF_PAGES", "20"))
+MAX_TEXT_CHARS = int(os.getenv("RESUME_MAX_TEXT_CHARS", "100000"))
+# "pypdf2", "pdfplumber" or "auto" (PyPDF2 first, pdfplumber when the text is sparse)
+PDF_ENGINE = os.getenv("RESUME_PDF_ENGINE", "auto")
+SPARSE_CHARS_PER_PAGE = 200
+# PDF pages are separated by a form feed line, like pdftotext does
+PAGE_BREAK = "\n\f\n"
+
+Source = Union[bytes, str]
+
+class ExtractionLimitExceeded(Exception):
+    """Raised when a document exceeds its CPU or wall-clock budget"""
+
+def _open_source(source: Source):
+    """Binary handle for raw bytes or a file path"""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    return open(source, "rb")
+
+def _collect_pages(page_texts, max_pages: int, max_chars: int, separator: str = "\n"):
+    """Join page texts, stopping at the page or character budget.
+    
+    Returns the text and the number of pages read. Pages are pulled lazily, so
+    pages past the budget are never parsed.
+    """
+    parts: List[str] = []
+    total_chars = 0
+    # islice stops before pulling (and so parsing) the page after the last one allowed
+    for page_text in itertools.islice(page_texts, max(max_pages, 0)):
+        page_text = page_text or ""
+        parts.append(page_text)
+        total_chars += len(page_text)
+        if total_chars >= max_chars:
+            break
+    return separator.join(parts), len(parts)
+
+def _read_pdf_pypdf2(source: Source, max_pages: int, max_chars: int):
+    with _open_source(source) as pdf_file:
+        reader = PyPDF2.PdfReader(pdf_file)
+        return _collect_pages((page.extract_text() for page in reader.pages), max_pages, max_chars, PAGE_BREAK)
+
+def _read_pdf_pdfplumber(source: Source, max_pages: int, max_chars: int):
+    import pdfplumber
+
+    with _open_source(source) as pdf_file:
+        with pdfplumber.open(pdf_file) as pdf:
+            return _collect_pages((page.extract_text() for page in pdf.pages), max_pages, max_chars, PAGE_BREAK)
+
+def extract_pdf_text(source: Source, max_pages: int = MAX_PDF_PAGES,
+                     max_chars: int = MAX_TEXT_CHARS, engine: str = PDF_ENGINE) -> str:
+    """Extract PDF text with PyPDF2, pdfplumber, or PyPDF2 falling back to pdfplumber"""
+    if engine == "pdfplumber":
+        return _read_pdf_pdfplumber(source, max_pages, max_chars)[0]
+
+    text, pages = _read_pdf_pypdf2(source, max_pages, max_chars)
+    if engine != "auto":
+        return text
+
+    # PyPDF2 struggles with multi-column and table layouts; retry when output is thin
+    if len(text.strip()) < SPARSE_CHARS_PER_PAGE * max(pages, 1):
+        try:
+            plumber_text = _read_pdf_pdfplumber(source, max_pages, max_chars)[0]
+            if len(plumber_text.strip()) > len(text.strip()):
+                return plumber_text
+        except Exception as e:
+            print(f"⚠️ pdfplumber extraction failed: {e}")
+    return text
+
+def extract_docx_text(source: Source, max_chars: int = MAX_TEXT_CHARS) -> str:
+    with _open_source(source) as doc_file:
+        doc = docx.Document(doc_file)
+        return _collect_pages((p.text for p in doc.paragraphs), len(doc.paragraphs), max_chars)[0]
+
+def extract_text(source: Source, filename: str) -> str:
+    """Extract text in the current process; raises on unreadable documents"""
+    file_ext = filename.lower().split('.')[-1]
+    if file_ext == 'pdf':
+        return extract_pdf_text(source)
+    if file_ext in ['doc', 'docx']:
+        return extract_docx_text(source)
+    with _open_source(source) as f:
+        return f.read().decode('utf-8', errors='ignore')
+
+def _on_cpu_limit(signum, frame):
+    raise ExtractionLimitExceeded("CPU time limit exceeded")
+
+def _init_worker():
+    if resource is not None and hasattr(signal, "SIGXCPU"):
+        signal.signal(signal.SIGXCPU, _on_cpu_limit)
+
+def _extract_with_cpu_limit(source: Source, filename: str, cpu_seconds: int) -> str:
+    """Runs inside a pool worker with a soft RLIMIT_CPU for this document only"""
+    previous = None
+    if resource is not None and cpu_seconds:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        previous = resource.getrlimit(resource.RLIMIT_CPU)
+        soft = int(usage.ru_utime + usage.ru_stime + cpu_seconds) + 1
+        if previous[1] != resource.RLIM_INFINITY:
+            soft = min(soft, previous[1])
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, previous[1]))
+    try:
+        return extract_text(source, filename)
+    finally:
+        if previous is not None:
+            resource.setrlimit(resource.RLIMIT_CPU, previous)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=EXTRACTION_PROCESSES, initializer=_init_worker)
+        return _pool
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+def shutdown_extraction_pool(wait: bool = True):
+    """Stop the extraction worker processes (a new pool starts on next use)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=wait)
+            _pool = None
+
+def extract_text_isolated(source: Source, filename: str,
+                          timeout: float = EXTRACTION_TIMEOUT_SECONDS,
+                          cpu_seconds: int = EXTRACTION_CPU_SECONDS) -> str:
+    """Extract text in the worker process pool, enforcing per-document limits.
+
+    Blocks the calling thread, so call it from a worker thread rather than the
+    event loop. Plain text files and ``RESUME_EXTRACTION_PROCESSES=0`` skip the pool.
+    """
+    file_ext = filename.lower().split('.')[-1]
+    if EXTRACTION_PROCESSES <= 0 or file_ext not in ('pdf', 'doc', 'docx'):
+        return extract_text(source, filename)
+
+    future = _get_pool().submit(_extract_with_cpu_limit, source, filename, cpu_seconds)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise ExtractionLimitExceeded(f"Extraction timed out after {timeout}s")
+    except BrokenProcessPool:
+        # A worker died (e.g. hard CPU kill); start a fresh pool for later documents
+        _reset_pool()
+        raise ExtractionLimitExceeded("Extraction worker terminated")
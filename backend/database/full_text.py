@@ -0,0 +1,43 @@
+import re
+from typing import Optional
+from sqlalchemy import func, literal_column
+
+# Text search configuration baked into the generated tsvector columns; changing
+# it needs the columns (and their GIN indexes) to be recreated
+TEXT_SEARCH_CONFIG = "english"
+# ts_headline options for result snippets
+HEADLINE_OPTIONS = 'MaxFragments=2, MaxWords=18, MinWords=6, FragmentDelimiter=" … ", StartSel=<mark>, StopSel=</mark>'
+
+CANDIDATE_SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(full_name, '')), 'A') || "
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(resume_text, '')), 'B')"
+)
+JOB_SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+def prefix_tsquery_text(text: str) -> Optional[str]:
+    """to_tsquery input matching every word of ``text``, the last one as a prefix.
+
+    "senior pyth" becomes "senior & pyth:*", so results update while the user
+    is still typing. Only word characters are kept, so user input can never be
+    a tsquery syntax error. Returns None when there is nothing to search for.
+    """
+    terms = _TERM.findall(text.lower())
+    if not terms:
+        return None
+    return " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+
+def tsquery(text: str):
+    """to_tsquery expression for ``text``; None when it has no searchable words"""
+    query_text = prefix_tsquery_text(text)
+    if query_text is None:
+        return None
+    return func.to_tsquery(literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig"), query_text)
+
+def headline(column, query):
+    """Highlighted snippet of ``column`` around the matches of ``query``"""
+    return func.ts_headline(literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig"), column, query, HEADLINE_OPTIONS)
@@ -0,0 +1,115 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from database.full_text import CANDIDATE_SEARCH_VECTOR_SQL, JOB_SEARCH_VECTOR_SQL
+
+# Schema changes that create_all cannot apply to existing tables. Each step is
+# idempotent and runs on startup after create_all.
+SCHEMA_UPGRADES = [
+    (
+        "candidates.skills to jsonb",
+        """
+        DO $$ BEGIN
+            IF (SELECT data_type FROM information_schema.columns
+                WHERE table_name = 'candidates' AND column_name = 'skills') = 'json' THEN
+                ALTER TABLE candidates ALTER COLUMN skills TYPE jsonb USING skills::jsonb;
+            END IF;
+        END $$
+        """
+    ),
+    (
+        "candidates.skill_keys",
+        """
+        ALTER TABLE candidates ADD COLUMN IF NOT EXISTS skill_keys jsonb
+            GENERATED ALWAYS AS (lower(skills::text)::jsonb) STORED
+        """
+    ),
+    # skill_keys only lowercases; skills are stored stripped so it agrees with the skill index
+    (
+        "candidates.skills stripped",
+        """
+        UPDATE candidates SET skills = (
+            SELECT coalesce(jsonb_agg(btrim(value) ORDER BY position), '[]'::jsonb)
+            FROM jsonb_array_elements_text(skills) WITH ORDINALITY AS item(value, position)
+            WHERE btrim(value) <> ''
+        )
+        WHERE jsonb_typeof(skills) = 'array' AND EXISTS (
+            SELECT 1 FROM jsonb_array_elements_text(skills) AS item(value) WHERE value <> btrim(value) OR value = ''
+        )
+        """
+    ),
+    (
+        "ix_candidates_skill_keys",
+        "CREATE INDEX IF NOT EXISTS ix_candidates_skill_keys ON candidates USING gin (skill_keys)"
+    ),
+    # Adding a stored generated column rewrites the table once
+    (
+        "candidates.search_vector",
+        f"""
+        ALTER TABLE candidates ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS ({CANDIDATE_SEARCH_VECTOR_SQL}) STORED
+        """
+    ),
+    (
+        "ix_candidates_search_vector",
+        "CREATE INDEX IF NOT EXISTS ix_candidates_search_vector ON candidates USING gin (search_vector)"
+    ),
+    (
+        "jobs.search_vector",
+        f"""
+        ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS ({JOB_SEARCH_VECTOR_SQL}) STORED
+        """
+    ),
+    (
+        "ix_jobs_search_vector",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING gin (search_vector)"
+    ),
+    # Keyset pagination compares (sort key, id) row values, which never match a NULL key
+    (
+        "candidates NULL sort keys",
+        """
+        UPDATE candidates SET overall_score = coalesce(overall_score, 0), created_at = coalesce(created_at, now())
+        WHERE overall_score IS NULL OR created_at IS NULL
+        """
+    ),
+    (
+        "jobs NULL sort keys",
+        "UPDATE jobs SET created_at = now() WHERE created_at IS NULL"
+    ),
+    (
+        "ix_candidates_created_at_id",
+        "CREATE INDEX IF NOT EXISTS ix_candidates_created_at_id ON candidates (created_at, id)"
+    ),
+    (
+        "ix_candidates_overall_score_id",
+        "CREATE INDEX IF NOT EXISTS ix_candidates_overall_score_id ON candidates (overall_score, id)"
+    ),
+    (
+        "ix_candidates_status_created_at_id",
+        "CREATE INDEX IF NOT EXISTS ix_candidates_status_created_at_id ON candidates (status, created_at, id)"
+    ),
+    (
+        "ix_jobs_created_at_id",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_created_at_id ON jobs (created_at, id)"
+    ),
+    (
+        "ix_jobs_status_created_at_id",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_status_created_at_id ON jobs (status, created_at, id)"
+    ),
+    (
+        "ix_job_applications_job_id_id",
+        "CREATE INDEX IF NOT EXISTS ix_job_applications_job_id_id ON job_applications (job_id, id)"
+    ),
+]
+
+def upgrade_schema(engine: Engine) -> int:
+    """Apply ``SCHEMA_UPGRADES``; a failing step is reported and the rest still run"""
+    applied = 0
+    for name, statement in SCHEMA_UPGRADES:
+        try:
+            with engine.begin() as connection:
+                connection.execute(text(statement))
+            applied += 1
+        except Exception as e:
+            print(f"⚠️ Schema upgrade '{name}' failed: {e}")
+    return applied
@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, Float, Boolean, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, Float, Boolean, ForeignKey, Computed, Index
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred, validates
 from sqlalchemy.sql import func
 from database.base import Base
+from database.full_text import CANDIDATE_SEARCH_VECTOR_SQL
+from core.tools.skill_index import clean_skills
 
 class Candidate(Base):
     __tablename__ = "candidates"
@@ -14,7 +17,9 @@ class Candidate(Base):
     resume_filename = Column(String(500))
     resume_url = Column(String(1000))
     resume_text = Column(Text)
-    skills = Column(JSON, default=[])
+    skills = Column(JSONB, default=[])
+    # Lowercased copy of skills for case-insensitive ?& / ?| filters; GIN indexed
+    skill_keys = deferred(Column(JSONB, Computed("lower(skills::text)::jsonb", persisted=True)))
     experience_years = Column(Float, default=0.0)
     education = Column(JSON, default=[])
     certifications = Column(JSON, default=[])
@@ -28,6 +33,21 @@ class Candidate(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     last_contacted = Column(DateTime(timezone=True))
+    # Weighted full-text vector of name (A) and resume text (B); GIN indexed, never loaded by default
+    search_vector = deferred(Column(TSVECTOR, Computed(CANDIDATE_SEARCH_VECTOR_SQL, persisted=True)))
+    
+    __table_args__ = (
+        Index("ix_candidates_skill_keys", "skill_keys", postgresql_using="gin"),
+        Index("ix_candidates_search_vector", "search_vector", postgresql_using="gin"),
+        # Keyset pagination orders
+        Index("ix_candidates_created_at_id", "created_at", "id"),
+        Index("ix_candidates_overall_score_id", "overall_score", "id"),
+        Index("ix_candidates_status_created_at_id", "status", "created_at", "id"),
+    )
+    
+    @validates("skills")
+    def _clean_skills(self, key, skills):
+        return clean_skills(skills)
 
 class JobApplication(Base):
     __tablename__ = "job_applications"
@@ -45,4 +65,30 @@ class JobApplication(Base):
     interview_feedback = Column(Text)
     interview_score = Column(Float)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    __table_args__ = (
+        # A job's applicants, paged and streamed in id order
+        Index("ix_job_applications_job_id_id", "job_id", "id"),
+    )
+
+class JobRecommendation(Base):
+    """One of a candidate's top recommended active jobs"""
+    __tablename__ = "job_recommendations"
+    
+    candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"), primary_key=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Float, nullable=False)
+    skill_score = Column(Float)
+    experience_score = Column(Float)
+    # Embedding similarity of resume and job; None when either was not embedded
+    similarity = Column(Float)
+    strengths = Column(JSON, default=[])
+    gaps = Column(JSON, default=[])
+    recommendation = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_job_recommendations_candidate_id_score", "candidate_id", "score"),
+        Index("ix_job_recommendations_job_id", "job_id"),
+    )
\ No newline at end of file
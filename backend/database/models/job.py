@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, Float, Boolean, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, Float, Boolean, ForeignKey, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from database.base import Base
+from database.full_text import JOB_SEARCH_VECTOR_SQL
 
 class Job(Base):
     __tablename__ = "jobs"
@@ -35,4 +37,13 @@ class Job(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     published_at = Column(DateTime(timezone=True))
-    deadline = Column(DateTime(timezone=True))
\ No newline at end of file
+    deadline = Column(DateTime(timezone=True))
+    # Weighted full-text vector of title (A) and description (B); GIN indexed, never loaded by default
+    search_vector = deferred(Column(TSVECTOR, Computed(JOB_SEARCH_VECTOR_SQL, persisted=True)))
+    
+    __table_args__ = (
+        Index("ix_jobs_search_vector", "search_vector", postgresql_using="gin"),
+        # Keyset pagination orders
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+        Index("ix_jobs_status_created_at_id", "status", "created_at", "id"),
+    )
\ No newline at end of file
@@ -0,0 +1,103 @@
+import base64
+import hashlib
+import json
+import os
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+
+class InvalidCursor(ValueError):
+    pass
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+def encode_cursor(values: Sequence, scope: str = "") -> str:
+    """Opaque cursor holding the sort key of the last row of a page and the ordering (``scope``) it belongs to"""
+    payload = json.dumps({"s": scope, "v": [_encode_value(value) for value in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, scope: Optional[str] = None) -> List:
+    """Sort key values of a cursor; raises InvalidCursor unless it was made for ``scope`` (any when None)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise InvalidCursor(f"Invalid cursor: {e}")
+    if not isinstance(payload, dict) or not isinstance(payload.get("v"), list):
+        raise InvalidCursor("Invalid cursor")
+    if scope is not None and payload.get("s") != scope:
+        raise InvalidCursor("Cursor does not match this listing")
+    return [_decode_value(value) for value in payload["v"]]
+
+def keys_scope(keys: Sequence, filters: Sequence = ()) -> str:
+    """Short fingerprint of a sort order and the listing's ``filters``.
+
+    A cursor is only accepted by the ordering and filters that made it. SQL
+    expressions render bound values as parameter names, so a search's query
+    text has to be passed in ``filters`` to tell two searches apart.
+    """
+    description = "|".join(str(key) for key in keys) + "|" + json.dumps(list(filters), default=str)
+    return hashlib.sha1(description.encode("utf-8")).hexdigest()[:12]
+
+def _check_types(keys: Sequence, values: List):
+    # A value of the wrong type would fail in the database rather than as a bad cursor
+    for key, value in zip(keys, values):
+        try:
+            expected = key.type.python_type
+        except NotImplementedError:
+            continue
+        if expected is float:
+            expected = (int, float)
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise InvalidCursor("Cursor does not match this listing")
+
+def keyset_page(db_query, keys: Sequence, cursor: Optional[str] = None,
+                limit: int = DEFAULT_PAGE_SIZE, descending: bool = True, filters: Sequence = ()) -> Dict:
+    """One page of ``db_query`` ordered by ``keys``, continuing after ``cursor``.
+
+    ``keys`` are columns or SQL expressions that together are unique, ending
+    with the primary key (e.g. ``(Candidate.created_at, Candidate.id)``). The
+    next page starts with a row-value comparison on them, so with a matching
+    composite index every page costs the same however deep it is, unlike OFFSET.
+    Sort keys are expected to be non-null. ``db_query`` must select a single
+    entity; the page items are those entities. A cursor from a different
+    ordering, or made with other ``filters`` (JSON-serializable values such as
+    the search text), raises InvalidCursor.
+    """
+    limit = max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+    scope = keys_scope(keys, filters)
+    labelled = [key.label(f"_page_key_{index}") for index, key in enumerate(keys)]
+    db_query = db_query.add_columns(*labelled)
+    if cursor:
+        values = decode_cursor(cursor, scope)
+        if len(values) != len(keys):
+            raise InvalidCursor("Cursor does not match this listing")
+        _check_types(keys, values)
+        comparison = tuple_(*keys) < tuple_(*values) if descending else tuple_(*keys) > tuple_(*values)
+        db_query = db_query.filter(comparison)
+    db_query = db_query.order_by(*[key.desc() if descending else key.asc() for key in keys]).limit(limit + 1)
+
+    rows = db_query.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "items": [row[0] for row in rows],
+        "next_cursor": encode_cursor(list(rows[-1][1:]), scope) if has_more and rows else None,
+        "has_more": has_more
+    }
@@ -1,8 +1,42 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+from sqlalchemy.orm import Session, defer
+from sqlalchemy import and_, or_, desc, asc, func, update
+from sqlalchemy import Float, Text, cast
+from sqlalchemy.dialects.postgresql import array, insert as pg_insert
+from config.database import get_database_session, close_database_session
 from database.models.candidate import Candidate, JobApplication
-from typing import List, Optional, Dict
+from database.full_text import headline, prefix_tsquery_text, tsquery
+from database.pagination import DEFAULT_PAGE_SIZE, keyset_page
+from core.tools.embedding_index import index_safely
+from core.tools.skill_index import clean_skills, get_skill_index, normalize_skill
+from typing import Iterator, List, Optional, Dict
 from datetime import datetime, timedelta
+import os
+
+# Skill filters matching at most this many candidates become an id IN (...) list
+# from the in-process skill index; broader ones use the GIN-indexed skill_keys column
+SKILL_INDEX_MAX_IN_IDS = int(os.getenv("SKILL_INDEX_MAX_IN_IDS", "5000"))
+
+# Columns list pages and bulk consumers never need; loaded on access if they do
+CANDIDATE_LIST_DEFERRED = (Candidate.resume_text, Candidate.education, Candidate.certifications,
+                           Candidate.source_details)
+# Keyset sort orders for candidate listings, each backed by a composite index
+CANDIDATE_ORDERS = {
+    "recent": (Candidate.created_at, Candidate.id),
+    "score": (Candidate.overall_score, Candidate.id),
+}
+
+def load_skill_rows():
+    """(id, skills) for every candidate in id order, on a session of its own"""
+    db = get_database_session()
+    try:
+        yield from db.query(Candidate.id, Candidate.skills).order_by(Candidate.id).yield_per(10000)
+    finally:
+        close_database_session(db)
+
+def sync_search_indexes(candidates: List[Candidate]):
+    """Reflect written candidates in the embedding and skill indexes"""
+    index_safely("index_candidates", candidates)
+    get_skill_index().update_many((candidate.id, candidate.skills or []) for candidate in candidates)
 
 class CandidateRepository:
     def __init__(self, db: Session):
@@ -14,6 +48,7 @@ class CandidateRepository:
         self.db.add(candidate)
         self.db.commit()
         self.db.refresh(candidate)
+        sync_search_indexes([candidate])
         return candidate
     
     def get_candidate_by_id(self, candidate_id: int) -> Optional[Candidate]:
@@ -24,26 +59,85 @@ class CandidateRepository:
         """Get candidate by email"""
         return self.db.query(Candidate).filter(Candidate.email == email).first()
     
-    def get_all_candidates(self, skip: int = 0, limit: int = 100) -> List[Candidate]:
-        """Get all candidates with pagination"""
-        return self.db.query(Candidate).offset(skip).limit(limit).all()
+    def _list_query(self):
+        """Candidate query without the heavy columns"""
+        return self.db.query(Candidate).options(*[defer(column) for column in CANDIDATE_LIST_DEFERRED])
+    
+    def get_all_candidates(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None,
+                           order: str = "recent") -> Dict:
+        """Page of all candidates, newest (or best scored) first.
+        
+        Returns ``{"items", "next_cursor", "has_more"}``; pass ``next_cursor``
+        back to get the following page.
+        """
+        return keyset_page(self._list_query(), CANDIDATE_ORDERS[order], cursor, limit)
     
     def search_candidates(self, query: str, skills: List[str] = None, 
-                         min_experience: float = None, location: str = None) -> List[Candidate]:
-        """Search candidates with filters"""
-        db_query = self.db.query(Candidate)
-        
-        if query:
-            db_query = db_query.filter(
-                or_(
-                    Candidate.full_name.ilike(f"%{query}%"),
-                    Candidate.resume_text.ilike(f"%{query}%")
-                )
-            )
+                         min_experience: float = None, location: str = None,
+                         status: str = None, match_any: bool = False,
+                         limit: int = DEFAULT_PAGE_SIZE, cursor: str = None) -> Dict:
+        """Page of candidates matching the filters; ``skills`` must all match unless ``match_any``.
+        
+        ``query`` is a full-text search over name and resume text (the last word
+        matches as a prefix); matches come back best ranked first, otherwise
+        newest first.
+        """
+        db_query = self._filter_candidates(
+            self._list_query(), skills, min_experience, location, status, match_any
+        )
+        
+        keys = CANDIDATE_ORDERS["recent"]
+        ts_query = tsquery(query) if query else None
+        if ts_query is not None:
+            db_query = db_query.filter(Candidate.search_vector.op("@@")(ts_query))
+            # ts_rank is a float4; as float8 its value survives the trip through the cursor exactly
+            keys = (cast(func.ts_rank(Candidate.search_vector, ts_query), Float), Candidate.id)
+        
+        filters = (prefix_tsquery_text(query or ""), sorted({normalize_skill(skill) for skill in skills or () if skill}),
+                   min_experience, location, status, match_any)
+        return keyset_page(db_query, keys, cursor, limit, filters=filters)
+    
+    def iter_candidates(self, skills: List[str] = None, min_experience: float = None,
+                        location: str = None, status: str = None, match_any: bool = False,
+                        chunk_size: int = 1000) -> Iterator[Candidate]:
+        """Stream every candidate matching the filters in id order, ``chunk_size`` rows at a time"""
+        return self._filter_candidates(
+            self._list_query(), skills, min_experience, location, status, match_any
+        ).order_by(Candidate.id).yield_per(chunk_size)
+    
+    def search_candidates_ranked(self, query: str, limit: int = 20, skills: List[str] = None,
+                                 min_experience: float = None, location: str = None,
+                                 status: str = None, match_any: bool = False,
+                                 with_snippets: bool = True) -> List[Dict]:
+        """Top ``limit`` full-text matches with their rank and a highlighted resume snippet.
+        
+        Snippets are built in a second query for the returned rows only, since
+        ts_headline re-parses the whole resume text.
+        """
+        ts_query = tsquery(query or "")
+        if ts_query is None:
+            return []
         
+        rank = func.ts_rank(Candidate.search_vector, ts_query).label("rank")
+        rows = self._filter_candidates(
+            self._list_query().add_columns(rank), skills, min_experience, location, status, match_any
+        ).filter(Candidate.search_vector.op("@@")(ts_query)).order_by(desc(rank), Candidate.id).limit(limit).all()
+        
+        snippets = {}
+        if with_snippets and rows:
+            snippets = dict(self.db.query(Candidate.id, headline(Candidate.resume_text, ts_query)).filter(
+                Candidate.id.in_([candidate.id for candidate, _ in rows])
+            ))
+        return [
+            {"candidate": candidate, "rank": round(float(score), 4), "snippet": snippets.get(candidate.id)}
+            for candidate, score in rows
+        ]
+    
+    def _filter_candidates(self, db_query, skills: List[str] = None, min_experience: float = None,
+                           location: str = None, status: str = None, match_any: bool = False):
+        """Apply the structured search filters shared by the search methods"""
         if skills:
-            for skill in skills:
-                db_query = db_query.filter(Candidate.skills.op('?')(skill))
+            db_query = db_query.filter(self.skill_filter(skills, match_any))
         
         if min_experience:
             db_query = db_query.filter(Candidate.experience_years >= min_experience)
@@ -51,16 +145,61 @@ class CandidateRepository:
         if location:
             db_query = db_query.filter(Candidate.location.ilike(f"%{location}%"))
         
-        return db_query.all()
+        if status:
+            db_query = db_query.filter(Candidate.status == status)
+        
+        return db_query
+    
+    def skill_filter(self, skills: List[str], match_any: bool = False):
+        """Case-insensitive filter for candidates with all (or any) of ``skills``.
+        
+        Narrow filters are answered by the in-process skill index as an id list;
+        broad ones, or any filter while the index is missing or stale, use a single
+        ?& / ?| test on the GIN-indexed ``skill_keys`` column. Candidates newer
+        than the index (written by another worker) always take the column test.
+        """
+        keys = sorted({normalize_skill(skill) for skill in skills if skill})
+        keys_array = array(keys, type_=Text)
+        keys_filter = Candidate.skill_keys.has_any(keys_array) if match_any else Candidate.skill_keys.has_all(keys_array)
+        skill_index = get_skill_index()
+        if skill_index.refresh(load_skill_rows):
+            max_id = skill_index.max_id
+            matches = skill_index.match(any_of=keys) if match_any else skill_index.match(all_of=keys)
+            if len(matches) <= SKILL_INDEX_MAX_IN_IDS:
+                return or_(Candidate.id.in_(list(matches)), and_(Candidate.id > max_id, keys_filter))
+        return keys_filter
+    
+    def count_candidates_by_skills(self, all_of: List[str] = None, any_of: List[str] = None) -> Dict:
+        """Candidates matching all of ``all_of`` and one of ``any_of``, plus each skill's own count"""
+        skill_index = get_skill_index()
+        if skill_index.refresh(load_skill_rows):
+            return {**skill_index.counts(all_of or [], any_of or []), "source": "skill_index"}
+        
+        db_query = self.db.query(Candidate.id)
+        if all_of:
+            db_query = db_query.filter(self.skill_filter(all_of))
+        if any_of:
+            db_query = db_query.filter(self.skill_filter(any_of, match_any=True))
+        skills = [normalize_skill(skill) for skill in (all_of or []) + (any_of or [])]
+        return {
+            "total": db_query.count() if skills else 0,
+            "by_skill": {
+                skill: self.db.query(Candidate.id).filter(Candidate.skill_keys.has_key(skill)).count()
+                for skill in skills
+            },
+            "source": "database"
+        }
     
     def get_top_candidates(self, limit: int = 10) -> List[Candidate]:
         """Get top candidates by overall score"""
-        return self.db.query(Candidate).order_by(desc(Candidate.overall_score)).limit(limit).all()
+        return self.get_all_candidates(limit, order="score")["items"]
     
-    def get_recent_candidates(self, days: int = 30) -> List[Candidate]:
-        """Get candidates added in recent days"""
+    def get_recent_candidates(self, days: int = 30, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None) -> Dict:
+        """Page of candidates added in recent days, newest first"""
         cutoff_date = datetime.now() - timedelta(days=days)
-        return self.db.query(Candidate).filter(Candidate.created_at >= cutoff_date).all()
+        return keyset_page(
+            self._list_query().filter(Candidate.created_at >= cutoff_date), CANDIDATE_ORDERS["recent"], cursor, limit
+        )
     
     def update_candidate(self, candidate_id: int, update_data: Dict) -> Optional[Candidate]:
         """Update candidate information"""
@@ -70,6 +209,8 @@ class CandidateRepository:
                 setattr(candidate, key, value)
             self.db.commit()
             self.db.refresh(candidate)
+            # Only re-embedded when the resume text or skills changed
+            sync_search_indexes([candidate])
         return candidate
     
     def delete_candidate(self, candidate_id: int) -> bool:
@@ -78,12 +219,17 @@ class CandidateRepository:
         if candidate:
             self.db.delete(candidate)
             self.db.commit()
+            index_safely("remove_candidate", candidate_id)
+            get_skill_index().remove(candidate_id)
             return True
         return False
     
-    def get_candidates_by_status(self, status: str) -> List[Candidate]:
-        """Get candidates by status"""
-        return self.db.query(Candidate).filter(Candidate.status == status).all()
+    def get_candidates_by_status(self, status: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None,
+                                 order: str = "recent") -> Dict:
+        """Page of candidates with this status, newest (or best scored) first"""
+        return keyset_page(
+            self._list_query().filter(Candidate.status == status), CANDIDATE_ORDERS[order], cursor, limit
+        )
     
     def get_candidate_applications(self, candidate_id: int) -> List[JobApplication]:
         """Get all applications for a candidate"""
@@ -97,17 +243,180 @@ class CandidateRepository:
         self.db.refresh(application)
         return application
     
-    def get_candidates_for_job(self, job_id: int) -> List[Candidate]:
-        """Get all candidates who applied for a specific job"""
-        return self.db.query(Candidate).join(JobApplication).filter(
+    def bulk_upsert_candidates(self, candidates: List[Dict], commit: bool = True,
+                               chunk_size: int = 500) -> List[int]:
+        """Insert or update many candidates keyed on email in one transaction.
+        
+        Uses INSERT ... ON CONFLICT (email) DO UPDATE. Returns candidate ids in the
+        same order as ``candidates``; rows sharing an email resolve to one id.
+        """
+        ids: List[Optional[int]] = [None] * len(candidates)
+        if not candidates:
+            return []
+        
+        # ON CONFLICT cannot touch the same row twice in one statement - last row wins
+        by_email: Dict[str, int] = {}
+        without_email = []
+        for index, candidate_data in enumerate(candidates):
+            email = candidate_data.get("email")
+            if email:
+                by_email[email] = index
+            else:
+                without_email.append(index)
+        
+        columns = sorted({key for candidate_data in candidates for key in candidate_data})
+        update_columns = [c for c in columns if c not in ("id", "email", "created_at")]
+        
+        try:
+            unique_rows = [candidates[index] for index in by_email.values()]
+            email_ids: Dict[str, int] = {}
+            for start in range(0, len(unique_rows), chunk_size):
+                # Core inserts skip the model's validators, so skills are cleaned here
+                chunk = [
+                    {column: clean_skills(row.get(column)) if column == "skills" else row.get(column) for column in columns}
+                    for row in unique_rows[start:start + chunk_size]
+                ]
+                stmt = pg_insert(Candidate).values(chunk)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Candidate.email],
+                    set_={
+                        **{column: stmt.excluded[column] for column in update_columns},
+                        "updated_at": func.now()
+                    }
+                ).returning(Candidate.id, Candidate.email)
+                for candidate_id, email in self.db.execute(stmt):
+                    email_ids[email] = candidate_id
+            
+            # Rows without an email can never conflict; plain inserts, flushed for ids
+            new_candidates = [(index, Candidate(**candidates[index])) for index in without_email]
+            self.db.add_all([candidate for _, candidate in new_candidates])
+            self.db.flush()
+            
+            if commit:
+                self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        for index, candidate_data in enumerate(candidates):
+            if candidate_data.get("email"):
+                ids[index] = email_ids.get(candidate_data["email"])
+        for index, candidate in new_candidates:
+            ids[index] = candidate.id
+        return ids
+    
+    def bulk_create_applications(self, applications: List[Dict], commit: bool = True) -> List[int]:
+        """Create many job applications in one statement, skipping existing pairs.
+        
+        Returns application ids in input order; an existing application for the same
+        candidate and job is reused instead of creating a duplicate.
+        """
+        if not applications:
+            return []
+        
+        try:
+            job_ids = {application["job_id"] for application in applications}
+            existing = {
+                (candidate_id, job_id): application_id
+                for application_id, candidate_id, job_id in self.db.query(
+                    JobApplication.id, JobApplication.candidate_id, JobApplication.job_id
+                ).filter(
+                    JobApplication.job_id.in_(job_ids),
+                    JobApplication.candidate_id.in_({a["candidate_id"] for a in applications})
+                )
+            }
+            
+            new_rows = {}
+            for application in applications:
+                key = (application["candidate_id"], application["job_id"])
+                if key not in existing and key not in new_rows:
+                    new_rows[key] = application
+            
+            if new_rows:
+                columns = sorted({key for row in new_rows.values() for key in row})
+                stmt = pg_insert(JobApplication).values([
+                    {column: row.get(column) for column in columns} for row in new_rows.values()
+                ]).returning(JobApplication.id, JobApplication.candidate_id, JobApplication.job_id)
+                for application_id, candidate_id, job_id in self.db.execute(stmt):
+                    existing[(candidate_id, job_id)] = application_id
+            
+            if commit:
+                self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return [existing.get((a["candidate_id"], a["job_id"])) for a in applications]
+    
+    def reindex_candidates(self, candidate_ids: Optional[List[int]] = None, chunk_size: int = 500) -> int:
+        """Bring the search indexes up to date for these candidates (all when None).
+        
+        Bulk writes call this after their commit; unchanged candidates are skipped
+        by content hash, so a full run after a restore only embeds what is new.
+        A full run rebuilds the skill index instead of updating it row by row.
+        """
+        db_query = self.db.query(Candidate).order_by(Candidate.id)
+        if candidate_ids is not None:
+            db_query = db_query.filter(Candidate.id.in_({i for i in candidate_ids if i is not None}))
+            sync = sync_search_indexes
+        else:
+            sync = lambda candidates: index_safely("index_candidates", candidates)
+        
+        indexed = 0
+        chunk = []
+        for candidate in db_query.yield_per(chunk_size):
+            chunk.append(candidate)
+            if len(chunk) >= chunk_size:
+                sync(chunk)
+                indexed += len(chunk)
+                chunk = []
+        if chunk:
+            sync(chunk)
+            indexed += len(chunk)
+        if candidate_ids is None:
+            get_skill_index().invalidate()
+        return indexed
+    
+    def iter_applicant_features(self, job_id: int, chunk_size: int = 5000):
+        """Stream (application_id, candidate_id, skills, experience_years, overall_score) for a job.
+        
+        Selects only the columns scoring needs, so resume text is never loaded.
+        """
+        return self.db.query(
+            JobApplication.id, Candidate.id, Candidate.skills, Candidate.experience_years, Candidate.overall_score
+        ).join(Candidate, Candidate.id == JobApplication.candidate_id).filter(
             JobApplication.job_id == job_id
-        ).all()
+        ).yield_per(chunk_size)
+    
+    def bulk_update_application_scores(self, updates: List[Dict], commit: bool = True,
+                                       chunk_size: int = 1000) -> int:
+        """Write match_score, strengths, gaps and recommendation for many applications.
+        
+        Each dict carries the application ``id``; rows are sent as executemany
+        UPDATE ... WHERE id = ? batches of ``chunk_size``.
+        """
+        try:
+            for start in range(0, len(updates), chunk_size):
+                self.db.execute(update(JobApplication), updates[start:start + chunk_size])
+            if commit:
+                self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return len(updates)
+    
+    def get_candidates_for_job(self, job_id: int, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None) -> Dict:
+        """Page of candidates who applied for a specific job, latest application first"""
+        db_query = self._list_query().join(JobApplication).filter(JobApplication.job_id == job_id)
+        return keyset_page(db_query, (JobApplication.id,), cursor, limit)
     
     def get_candidate_statistics(self) -> Dict:
         """Get candidate statistics"""
         total_candidates = self.db.query(Candidate).count()
         active_candidates = self.db.query(Candidate).filter(Candidate.is_available == True).count()
-        recent_candidates = len(self.get_recent_candidates(30))
+        recent_candidates = self.db.query(Candidate).filter(
+            Candidate.created_at >= datetime.now() - timedelta(days=30)
+        ).count()
         
         status_counts = {}
         statuses = ['new', 'screened', 'interviewed', 'hired', 'rejected']
@@ -1,10 +1,21 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+from sqlalchemy.orm import Session, defer
+from sqlalchemy import and_, desc, asc, func, cast, Float
 from database.models.job import Job
 from database.models.candidate import JobApplication
+from database.full_text import headline, prefix_tsquery_text, tsquery
+from database.pagination import DEFAULT_PAGE_SIZE, keyset_page
+from database.repositories.recommendation_repo import RecommendationRepository, refresh_in_background
+from core.tools.embedding_index import index_safely
+from core.tools.job_recommendations import get_job_feature_cache
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 
+# Columns job listings never need; loaded on access if they do
+JOB_LIST_DEFERRED = (Job.description, Job.generation_prompt, Job.responsibilities, Job.required_qualifications,
+                     Job.preferred_qualifications, Job.benefits)
+# Keyset sort order for job listings, backed by a composite index
+JOB_ORDER = (Job.created_at, Job.id)
+
 class JobRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -15,33 +26,71 @@ class JobRepository:
         self.db.add(job)
         self.db.commit()
         self.db.refresh(job)
+        index_safely("index_jobs", [job])
+        if job.status == "active":
+            refresh_in_background("refresh_for_job", job.id)
         return job
     
     def get_job_by_id(self, job_id: int) -> Optional[Job]:
         """Get job by ID"""
         return self.db.query(Job).filter(Job.id == job_id).first()
     
-    def get_all_jobs(self, skip: int = 0, limit: int = 100) -> List[Job]:
-        """Get all jobs with pagination"""
-        return self.db.query(Job).offset(skip).limit(limit).all()
+    def _list_query(self):
+        """Job query without the long text and JSON columns"""
+        return self.db.query(Job).options(*[defer(column) for column in JOB_LIST_DEFERRED])
+    
+    def get_all_jobs(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None) -> Dict:
+        """Page of all jobs, newest first.
+        
+        Returns ``{"items", "next_cursor", "has_more"}``; pass ``next_cursor``
+        back to get the following page.
+        """
+        return keyset_page(self._list_query(), JOB_ORDER, cursor, limit)
     
     def get_active_jobs(self) -> List[Job]:
         """Get all active jobs"""
         return self.db.query(Job).filter(Job.status == "active").all()
     
     def search_jobs(self, query: str = None, department: str = None, 
-                   location: str = None, employment_type: str = None) -> List[Job]:
-        """Search jobs with filters"""
-        db_query = self.db.query(Job)
+                   location: str = None, employment_type: str = None, status: str = None,
+                   limit: int = DEFAULT_PAGE_SIZE, cursor: str = None) -> Dict:
+        """Page of jobs matching the filters; ``query`` is a ranked full-text search over title and description"""
+        db_query = self._filter_jobs(self._list_query(), department, location, employment_type, status)
         
-        if query:
-            db_query = db_query.filter(
-                or_(
-                    Job.title.ilike(f"%{query}%"),
-                    Job.description.ilike(f"%{query}%")
-                )
-            )
+        keys = JOB_ORDER
+        ts_query = tsquery(query) if query else None
+        if ts_query is not None:
+            db_query = db_query.filter(Job.search_vector.op("@@")(ts_query))
+            keys = (cast(func.ts_rank(Job.search_vector, ts_query), Float), Job.id)
+        
+        filters = (prefix_tsquery_text(query or ""), department, location, employment_type, status)
+        return keyset_page(db_query, keys, cursor, limit, filters=filters)
+    
+    def search_jobs_ranked(self, query: str, limit: int = 20, department: str = None,
+                           location: str = None, employment_type: str = None,
+                           with_snippets: bool = True) -> List[Dict]:
+        """Top ``limit`` full-text matches with their rank and a highlighted description snippet"""
+        ts_query = tsquery(query or "")
+        if ts_query is None:
+            return []
+        
+        rank = func.ts_rank(Job.search_vector, ts_query).label("rank")
+        rows = self._filter_jobs(self._list_query().add_columns(rank), department, location, employment_type).filter(
+            Job.search_vector.op("@@")(ts_query)
+        ).order_by(desc(rank), Job.id).limit(limit).all()
         
+        snippets = {}
+        if with_snippets and rows:
+            snippets = dict(self.db.query(Job.id, headline(Job.description, ts_query)).filter(
+                Job.id.in_([job.id for job, _ in rows])
+            ))
+        return [
+            {"job": job, "rank": round(float(score), 4), "snippet": snippets.get(job.id)}
+            for job, score in rows
+        ]
+    
+    def _filter_jobs(self, db_query, department: str = None, location: str = None, employment_type: str = None,
+                     status: str = None):
         if department:
             db_query = db_query.filter(Job.department == department)
         
@@ -51,44 +100,75 @@ class JobRepository:
         if employment_type:
             db_query = db_query.filter(Job.employment_type == employment_type)
         
-        return db_query.all()
+        if status:
+            db_query = db_query.filter(Job.status == status)
+        
+        return db_query
     
-    def get_jobs_by_status(self, status: str) -> List[Job]:
-        """Get jobs by status"""
-        return self.db.query(Job).filter(Job.status == status).all()
+    def get_jobs_by_status(self, status: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None) -> Dict:
+        """Page of jobs with this status, newest first"""
+        return keyset_page(self._list_query().filter(Job.status == status), JOB_ORDER, cursor, limit)
     
     def get_urgent_jobs(self) -> List[Job]:
         """Get urgent priority jobs"""
-        return self.db.query(Job).filter(
+        return self._list_query().filter(
             and_(Job.priority == "urgent", Job.status == "active")
         ).all()
     
-    def get_jobs_by_hiring_manager(self, manager_id: int) -> List[Job]:
-        """Get jobs by hiring manager"""
-        return self.db.query(Job).filter(Job.hiring_manager_id == manager_id).all()
+    def get_jobs_by_hiring_manager(self, manager_id: int, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None) -> Dict:
+        """Page of a hiring manager's jobs, newest first"""
+        return keyset_page(self._list_query().filter(Job.hiring_manager_id == manager_id), JOB_ORDER, cursor, limit)
     
     def update_job(self, job_id: int, update_data: Dict) -> Optional[Job]:
         """Update job information"""
         job = self.get_job_by_id(job_id)
         if job:
+            was_active = job.status == "active"
             for key, value in update_data.items():
                 setattr(job, key, value)
             self.db.commit()
             self.db.refresh(job)
+            index_safely("index_jobs", [job])
+            # Published, closed, or changed while active
+            if was_active or job.status == "active":
+                refresh_in_background("refresh_for_job", job.id)
         return job
     
     def delete_job(self, job_id: int) -> bool:
         """Delete job"""
         job = self.get_job_by_id(job_id)
         if job:
+            affected = RecommendationRepository(self.db).remove_job(job_id)
             self.db.delete(job)
             self.db.commit()
+            index_safely("remove_job", job_id)
+            get_job_feature_cache().remove(job_id)
+            # Candidates who had this job get their lists refilled from the remaining jobs
+            if affected:
+                refresh_in_background("recommend_for_candidates", affected)
             return True
         return False
     
-    def get_job_applications(self, job_id: int) -> List[JobApplication]:
-        """Get all applications for a job"""
-        return self.db.query(JobApplication).filter(JobApplication.job_id == job_id).all()
+    def reindex_jobs(self, chunk_size: int = 500) -> int:
+        """Bring the embedding index up to date for every job"""
+        indexed = 0
+        chunk = []
+        for job in self.db.query(Job).order_by(Job.id).yield_per(chunk_size):
+            chunk.append(job)
+            if len(chunk) >= chunk_size:
+                index_safely("index_jobs", chunk)
+                indexed += len(chunk)
+                chunk = []
+        if chunk:
+            index_safely("index_jobs", chunk)
+            indexed += len(chunk)
+        return indexed
+    
+    def get_job_applications(self, job_id: int, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None) -> Dict:
+        """Page of a job's applications, latest first"""
+        return keyset_page(
+            self.db.query(JobApplication).filter(JobApplication.job_id == job_id), (JobApplication.id,), cursor, limit
+        )
     
     def get_job_application_count(self, job_id: int) -> int:
         """Get application count for a job"""
@@ -97,7 +177,7 @@ class JobRepository:
     def get_jobs_expiring_soon(self, days: int = 7) -> List[Job]:
         """Get jobs expiring within specified days"""
         cutoff_date = datetime.now() + timedelta(days=days)
-        return self.db.query(Job).filter(
+        return self._list_query().filter(
             and_(
                 Job.deadline <= cutoff_date,
                 Job.status == "active"
@@ -135,10 +215,14 @@ class JobRepository:
     
     def get_hiring_pipeline(self, job_id: int) -> Dict:
         """Get hiring pipeline statistics for a job"""
-        applications = self.get_job_applications(job_id)
+        status_counts = dict(
+            self.db.query(JobApplication.status, func.count(JobApplication.id)).filter(
+                JobApplication.job_id == job_id
+            ).group_by(JobApplication.status).all()
+        )
         
         pipeline = {
-            "total_applications": len(applications),
+            "total_applications": sum(status_counts.values()),
             "screening": 0,
             "interview": 0,
             "offer": 0,
@@ -146,8 +230,8 @@ class JobRepository:
             "rejected": 0
         }
         
-        for app in applications:
-            if app.status in pipeline:
-                pipeline[app.status] += 1
+        for status, count in status_counts.items():
+            if status in pipeline:
+                pipeline[status] += count
         
         return pipeline
\ No newline at end of file
@@ -0,0 +1,238 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from config.database import get_database_session, close_database_session
+from database.models.candidate import Candidate, JobRecommendation
+from database.models.job import Job
+from core.tools.embedding_index import get_embedding_index
+from core.tools.job_recommendations import (
+    RECOMMENDED_JOBS_PER_CANDIDATE, get_job_feature_cache, recommendation_row, score_job
+)
+from core.tools.skill_index import normalize_skill
+from typing import Dict, Iterable, List, Optional
+import os
+import threading
+
+# "false" turns off storing and refreshing recommended jobs
+JOB_RECOMMENDATIONS_ENABLED = os.getenv("JOB_RECOMMENDATIONS", "true").lower() not in ("0", "false", "no")
+# Candidates scored per chunk, both for an ingested batch and when a job is published
+RECOMMENDATION_CHUNK_SIZE = int(os.getenv("RECOMMENDATION_CHUNK_SIZE", "1000"))
+
+# Job columns the recommender reads; selected directly so jobs are never loaded whole
+JOB_FEATURE_COLUMNS = (
+    Job.id, Job.title, Job.status, Job.description, Job.responsibilities, Job.required_qualifications,
+    Job.preferred_qualifications, Job.required_skills, Job.preferred_skills, Job.experience_level,
+    Job.min_experience_years, Job.max_experience_years
+)
+CANDIDATE_FEATURE_COLUMNS = (Candidate.id, Candidate.skills, Candidate.experience_years, Candidate.overall_score)
+STORED_FIELDS = ("job_id", "score", "skill_score", "experience_score", "similarity", "strengths", "gaps",
+                 "recommendation")
+
+# Job refreshes run one at a time so two changes never re-rank the same lists at once
+_refresh_lock = threading.Lock()
+
+def _stored_embeddings(name: str, record_ids: List[int]) -> Dict[int, List[float]]:
+    """Stored embeddings, or none when the index is unavailable; scores then use skills and experience only"""
+    try:
+        return get_embedding_index().stored_embeddings(name, record_ids)
+    except Exception as e:
+        print(f"⚠️ Embedding lookup failed ({name}): {e}")
+        return {}
+
+class RecommendationRepository:
+    """Each candidate's top recommended active jobs, kept current as candidates arrive and jobs change"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _job_cache(self):
+        cache = get_job_feature_cache()
+        if cache.stale():
+            jobs = [row._asdict() for row in self.db.query(*JOB_FEATURE_COLUMNS).filter(Job.status == "active")]
+            cache.load(jobs, _stored_embeddings("jobs", [job["id"] for job in jobs]))
+        return cache
+
+    def _insert(self, rows: List[Dict], chunk_size: int = 1000):
+        for start in range(0, len(rows), chunk_size):
+            stmt = pg_insert(JobRecommendation).values(rows[start:start + chunk_size])
+            self.db.execute(stmt.on_conflict_do_update(
+                index_elements=[JobRecommendation.candidate_id, JobRecommendation.job_id],
+                set_={field: stmt.excluded[field] for field in STORED_FIELDS if field != "job_id"}
+            ))
+
+    def _trim(self, candidate_ids: List[int], limit: int):
+        """Keep only the best ``limit`` recommendations of these candidates"""
+        self.db.execute(text("""
+            DELETE FROM job_recommendations r
+            USING (
+                SELECT candidate_id, job_id,
+                       row_number() OVER (PARTITION BY candidate_id ORDER BY score DESC, job_id) AS position
+                FROM job_recommendations
+                WHERE candidate_id = ANY(:candidate_ids)
+            ) ranked
+            WHERE r.candidate_id = ranked.candidate_id AND r.job_id = ranked.job_id AND ranked.position > :limit
+        """), {"candidate_ids": candidate_ids, "limit": limit})
+
+    def recommend_for_candidates(self, candidate_ids: Iterable[int],
+                                 limit: int = RECOMMENDED_JOBS_PER_CANDIDATE) -> Dict[int, List[Dict]]:
+        """Score these candidates against every active job and store their top ``limit``.
+
+        Jobs come from the shared feature cache, so a batch costs one query for
+        the candidates' features and one embedding lookup per chunk.
+        """
+        candidate_ids = sorted({candidate_id for candidate_id in candidate_ids if candidate_id is not None})
+        if not JOB_RECOMMENDATIONS_ENABLED or not candidate_ids:
+            return {}
+
+        cache = self._job_cache()
+        recommendations = {}
+        try:
+            for start in range(0, len(candidate_ids), RECOMMENDATION_CHUNK_SIZE):
+                chunk = candidate_ids[start:start + RECOMMENDATION_CHUNK_SIZE]
+                rows = self.db.query(*CANDIDATE_FEATURE_COLUMNS).filter(Candidate.id.in_(chunk)).all()
+                scored = cache.recommend(rows, _stored_embeddings("candidates", chunk), limit)
+                self.db.execute(delete(JobRecommendation).where(JobRecommendation.candidate_id.in_(chunk)))
+                self._insert([
+                    {"candidate_id": candidate_id, **{field: row[field] for field in STORED_FIELDS}}
+                    for candidate_id, jobs in scored.items() for row in jobs
+                ])
+                recommendations.update(scored)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return recommendations
+
+    def remove_job(self, job_id: int) -> List[int]:
+        """Drop a job from every candidate's list, without committing; returns the candidates affected"""
+        removed = self.db.execute(
+            delete(JobRecommendation).where(JobRecommendation.job_id == job_id).returning(JobRecommendation.candidate_id)
+        )
+        return [row[0] for row in removed]
+
+    def refresh_for_job(self, job_id: int, limit: int = RECOMMENDED_JOBS_PER_CANDIDATE) -> Dict:
+        """Bring recommendations up to date after a job was published, changed or closed.
+
+        The job's old entries are dropped and the candidates who had it are
+        re-scored. An active job is then scored against every available
+        candidate and enters the lists it now belongs in; no other pair is
+        re-scored.
+        """
+        job = self.db.query(*JOB_FEATURE_COLUMNS).filter(Job.id == job_id).first()
+        active = job is not None and job.status == "active"
+        cache = self._job_cache()
+        if active:
+            cache.upsert(job._asdict(), _stored_embeddings("jobs", [job_id]).get(job_id))
+        else:
+            cache.remove(job_id)
+
+        try:
+            affected = self.remove_job(job_id)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self.recommend_for_candidates(affected, limit)
+
+        added = self._add_job(cache.features(job_id), limit) if active else 0
+        print(f"🧭 Recommendations refreshed for job {job_id}: {len(affected)} re-scored, {added} added")
+        return {"job_id": job_id, "active": active, "candidates_rescored": len(affected), "candidates_added": added}
+
+    def _add_job(self, features: Optional[Dict], limit: int) -> int:
+        """Score one job against every available candidate, chunk by chunk, and insert it where it makes the top ``limit``"""
+        if features is None:
+            return 0
+
+        added = []
+        query = self.db.query(*CANDIDATE_FEATURE_COLUMNS).filter(Candidate.is_available == True).order_by(Candidate.id)
+        chunk = []
+        try:
+            for row in query.yield_per(RECOMMENDATION_CHUNK_SIZE):
+                chunk.append(row)
+                if len(chunk) >= RECOMMENDATION_CHUNK_SIZE:
+                    added.extend(self._qualifying(features, chunk, limit))
+                    chunk = []
+            if chunk:
+                added.extend(self._qualifying(features, chunk, limit))
+
+            self._insert(added)
+            for start in range(0, len(added), RECOMMENDATION_CHUNK_SIZE):
+                self._trim([row["candidate_id"] for row in added[start:start + RECOMMENDATION_CHUNK_SIZE]], limit)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return len(added)
+
+    def _qualifying(self, features: Dict, rows: List, limit: int) -> List[Dict]:
+        """Rows to insert for the candidates whose current list this job would enter"""
+        candidate_ids = [row[0] for row in rows]
+        scores = score_job(features, rows, _stored_embeddings("candidates", candidate_ids))
+        # (count, lowest score) of each candidate's current list
+        current = {
+            candidate_id: (count, lowest) for candidate_id, count, lowest in self.db.query(
+                JobRecommendation.candidate_id, func.count(), func.min(JobRecommendation.score)
+            ).filter(JobRecommendation.candidate_id.in_(candidate_ids)).group_by(JobRecommendation.candidate_id)
+        }
+
+        skills_of = {row[0]: row[1] for row in rows}
+        qualifying = []
+        for index, candidate_id in enumerate(scores["candidate_ids"].tolist()):
+            score = scores["score"][index]
+            count, lowest = current.get(candidate_id, (0, None))
+            # Ties are kept here and settled by the trim, which orders them by job id
+            if count >= limit and score < lowest:
+                continue
+            row = recommendation_row(
+                features, {normalize_skill(skill) for skill in skills_of[candidate_id] or ()}, score,
+                scores["skill_score"][index], scores["experience_score"][index],
+                scores["similarity"][index] if scores["has_similarity"][index] else None
+            )
+            qualifying.append({"candidate_id": candidate_id, **{field: row[field] for field in STORED_FIELDS}})
+        return qualifying
+
+    def get_recommendations(self, candidate_id: int, limit: int = RECOMMENDED_JOBS_PER_CANDIDATE) -> List[Dict]:
+        """Stored recommended jobs of a candidate, best first"""
+        rows = self.db.query(JobRecommendation, Job.title, Job.department, Job.location).join(
+            Job, Job.id == JobRecommendation.job_id
+        ).filter(
+            JobRecommendation.candidate_id == candidate_id, Job.status == "active"
+        ).order_by(JobRecommendation.score.desc(), JobRecommendation.job_id).limit(limit).all()
+        return [
+            {
+                "job_id": recommendation.job_id,
+                "title": title,
+                "department": department,
+                "location": location,
+                "score": recommendation.score,
+                "skill_score": recommendation.skill_score,
+                "experience_score": recommendation.experience_score,
+                "similarity": recommendation.similarity,
+                "strengths": recommendation.strengths or [],
+                "gaps": recommendation.gaps or [],
+                "recommendation": recommendation.recommendation
+            }
+            for recommendation, title, department, location in rows
+        ]
+
+def _run_refresh(method: str, *args):
+    db = get_database_session()
+    try:
+        with _refresh_lock:
+            getattr(RecommendationRepository(db), method)(*args)
+    except Exception as e:
+        print(f"⚠️ Recommendation refresh failed ({method}): {e}")
+    finally:
+        close_database_session(db)
+
+def refresh_in_background(method: str, *args, wait: bool = False):
+    """Run a RecommendationRepository method on its own session, off the request path.
+
+    Used by job writes; failures are reported and never fail the write.
+    """
+    if not JOB_RECOMMENDATIONS_ENABLED:
+        return
+    if wait:
+        _run_refresh(method, *args)
+    else:
+        threading.Thread(target=_run_refresh, args=(method, *args), name="job-recommendations", daemon=True).start()
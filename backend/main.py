@@ -240,9 +240,18 @@ from database.models.candidate import Candidate, JobApplication
 from database.models.job import Job
 from database.models.assessment import TestTemplate, ScheduledTest
 from services.hr_service import HRService
+from services.ingestion_job_service import IngestionJobManager
 import json
 import uuid
 from core.agents.supervisor import NaviHireSupervisor
+from core.llm.cache import response_cache
+from core.llm.client import get_llm
+from core.llm.metrics import LLM_METRICS_DEBUG, llm_metrics, llm_usage_scope
+from core.tools.embedding_index import get_embedding_index
+from database.repositories.candidate_repo import CandidateRepository
+from database.repositories.job_repo import JobRepository
+from database.repositories.recommendation_repo import RecommendationRepository
+from database.pagination import DEFAULT_PAGE_SIZE, InvalidCursor
 from core.graph.state import NaviHireState
 from langchain_core.messages import HumanMessage
 from typing import List
@@ -253,7 +262,12 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import serpapi
 import asyncio, re
-import google.generativeai as genai
+import contextvars
+import shutil
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 app = FastAPI(
@@ -314,6 +328,41 @@ class ConnectionManager:
 
 manager = ConnectionManager()
 
+# Graph turns run on their own bounded pool so slow LLM chains never block the event loop
+GRAPH_MAX_WORKERS = int(os.getenv("GRAPH_MAX_WORKERS", "8"))
+# Chat turns one user may have in flight at once, across all of their sockets
+CHAT_MAX_TURNS_PER_USER = int(os.getenv("CHAT_MAX_TURNS_PER_USER", "1"))
+
+graph_executor = ThreadPoolExecutor(max_workers=GRAPH_MAX_WORKERS, thread_name_prefix="navihire-graph")
+
+class TurnLimiter:
+    """Per-user cap on in-flight chat turns; only used from the event loop, so no locking"""
+    
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.active: dict = defaultdict(int)
+    
+    def try_acquire(self, user_id: str) -> bool:
+        if self.active[user_id] >= self.limit:
+            return False
+        self.active[user_id] += 1
+        return True
+    
+    def release(self, user_id: str):
+        self.active[user_id] -= 1
+        if self.active[user_id] <= 0:
+            del self.active[user_id]
+
+turn_limiter = TurnLimiter(CHAT_MAX_TURNS_PER_USER)
+
+async def send_ingestion_event(user_id: str, event: dict):
+    """Push background ingestion progress to the user's chat socket if connected"""
+    websocket = manager.active_connections.get(user_id)
+    if websocket:
+        await websocket.send_text(json.dumps(event, default=str))
+
+ingestion_jobs = IngestionJobManager(notifier=send_ingestion_event)
+
 @app.on_event("startup")
 async def startup_event():
     """Create database tables on startup"""
@@ -321,6 +370,8 @@ async def startup_event():
         
         print("**** Creating Database tables")
         Base.metadata.create_all(bind=engine)
+        from database.migrations import upgrade_schema
+        upgrade_schema(engine)
         
         db = get_database_session()
         try:
@@ -343,6 +394,18 @@ async def startup_event():
         
         print("✅ Database initialization completed successfully")
         
+        # Drop parse cache entries written by an older prompt/parser version
+        from core.tools.gemini_resume_parser import parser_cache_version
+        from core.tools.parse_cache import ResumeParseCache
+        purged = ResumeParseCache(parser_cache_version()).purge_stale()
+        if purged:
+            print(f"🧹 Purged {purged} stale resume parse cache version(s)")
+        
+        # Build the skill index in the background; skill filters use the GIN index until it is ready
+        from core.tools.skill_index import get_skill_index
+        from database.repositories.candidate_repo import load_skill_rows
+        get_skill_index().refresh(load_skill_rows)
+        
     except Exception as e:
         print(f"❌ Database initialization failed: {e}")
 
@@ -740,14 +803,12 @@ async def search_flights(request: dict):
 #     }
 #     return codes.get(city_name.lower(), city_name.upper()[:3])
 
-async def call_gemini(prompt: str, temperature: float = 0.1, model_name: str = 'gemini-1.5-flash') -> str:
+async def call_gemini(prompt: str, temperature: float = 0.1, model_name: str = 'gemini-1.5-flash',
+                      call_site: str = "main.call_gemini") -> str:
     try:
-        model = genai.GenerativeModel(
-            model_name,
-            generation_config={"temperature": temperature}
-        )
-        response = model.generate_content(prompt)
-        return response.text.strip()
+        llm = get_llm(temperature=temperature, model=model_name)
+        response = await llm.ainvoke(prompt, call_site=call_site)
+        return response.content.strip()
     except Exception as e:
         print("Gemini API Error:", e)
         return "Unable to generate response at this time"
@@ -778,7 +839,7 @@ async def get_airport_code(city_name: str) -> str:
 
     try:
         prompt = f'Analyze the city name "{city_name}" and return ONLY its IATA airport code in uppercase. Example responses: DEL, BOM, BLR. No other text.'
-        response_text = await call_gemini(prompt, temperature=0.1)
+        response_text = await call_gemini(prompt, temperature=0.1, call_site="main.get_airport_code")
 
         match = re.search(r'\b[A-Z]{3}\b', response_text)
         if match:
@@ -882,13 +943,74 @@ def get_fallback_flights(origin: str, destination: str) -> List[dict]:
 from config.database import get_database_session, close_database_session
 from sqlalchemy.orm import Session
 
+ALLOWED_RESUME_EXTENSIONS = ('.pdf', '.doc', '.docx', '.txt')
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+try:
+    from config.settings import settings
+    MAX_RESUME_FILE_SIZE = settings.max_file_size
+except Exception:
+    MAX_RESUME_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", str(10 * 1024 * 1024)))
+
+class UploadRejected(Exception):
+    """Raised when an uploaded file fails validation before processing"""
+
+async def spool_upload_to_disk(file: UploadFile, upload_dir: str) -> dict:
+    """Stream an upload to a temp file in chunks, enforcing type and size limits"""
+    filename = file.filename or "unnamed"
+    
+    # Validate file type before reading any bytes
+    if not filename.lower().endswith(ALLOWED_RESUME_EXTENSIONS):
+        raise UploadRejected("Unsupported file type")
+    
+    declared_size = getattr(file, "size", None)
+    if declared_size and declared_size > MAX_RESUME_FILE_SIZE:
+        raise UploadRejected(f"File exceeds maximum size of {MAX_RESUME_FILE_SIZE} bytes")
+    
+    suffix = Path(filename).suffix.lower()
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=upload_dir)
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > MAX_RESUME_FILE_SIZE:
+                    raise UploadRejected(f"File exceeds maximum size of {MAX_RESUME_FILE_SIZE} bytes")
+                out.write(chunk)
+    except Exception:
+        os.remove(path)
+        raise
+    finally:
+        await file.close()
+    
+    return {
+        "filename": filename,
+        "path": path,
+        "size": size,
+        "content_type": file.content_type
+    }
+
 @app.post("/api/v1/resumes/upload")
 async def upload_and_analyze_resumes(
     files: List[UploadFile] = File(...), 
     job_id: str = Form(None),
+    async_mode: bool = Form(False),
+    packed_extraction: bool = Form(False),
+    user_id: str = Form(None),
     db: Session = Depends(get_db)
 ):
-    """Upload and analyze resumes with proper processing"""
+    """Upload and analyze resumes with proper processing.
+    
+    With ``async_mode`` the files are queued as a background ingestion job and the
+    response returns immediately with an id to poll at /api/v1/resumes/jobs/{id}.
+    Progress is also pushed to /ws/chat/{user_id} when ``user_id`` is given.
+    ``packed_extraction`` parses several resumes per Gemini call for bulk imports.
+    """
+    upload_dir = tempfile.mkdtemp(prefix="navihire_upload_")
+    keep_upload_dir = False
     try:
         print(f"📄 Received {len(files)} files for processing")
         print(f"🎯 Job ID: {job_id}")
@@ -899,38 +1021,50 @@ async def upload_and_analyze_resumes(
         # Initialize HR service
         hr_service = HRService(db)
         
-        # Process uploaded files
+        # Spool uploaded files to disk; only file paths are kept for the batch
         uploaded_resumes = []
+        rejected_files = []
         for file in files:
             try:
-                # Read file content
-                content = await file.read()
-                print(f"📖 Read file: {file.filename} ({len(content)} bytes)")
-                
-                # Validate file type
-                if not file.filename.lower().endswith(('.pdf', '.doc', '.docx', '.txt')):
-                    print(f"⚠️ Skipping unsupported file: {file.filename}")
-                    continue
-                
-                uploaded_resumes.append({
-                    "filename": file.filename,
-                    "content": content,
-                    "size": len(content),
-                    "content_type": file.content_type
-                })
+                resume_file = await spool_upload_to_disk(file, upload_dir)
+                print(f"📖 Spooled file: {resume_file['filename']} ({resume_file['size']} bytes)")
+                uploaded_resumes.append(resume_file)
                 
+            except UploadRejected as e:
+                print(f"⚠️ Skipping {file.filename}: {e}")
+                rejected_files.append({"filename": file.filename, "error": str(e)})
             except Exception as e:
                 print(f"❌ Error reading file {file.filename}: {e}")
-                continue
+                rejected_files.append({"filename": file.filename, "error": str(e)})
         
         if not uploaded_resumes:
             raise HTTPException(status_code=400, detail="No valid resume files found")
         
         print(f"✅ Successfully prepared {len(uploaded_resumes)} resumes for processing")
         
-        # Process resumes using HR service
         job_id_int = int(job_id) if job_id and job_id.isdigit() else None
-        result = await hr_service.process_resume_batch(uploaded_resumes, job_id_int)
+        
+        if async_mode:
+            # Worker owns the spooled files from here and removes them when done
+            job = ingestion_jobs.submit(
+                uploaded_resumes, upload_dir, job_id=job_id_int,
+                user_id=user_id, rejected_files=rejected_files, packed=packed_extraction
+            )
+            keep_upload_dir = True
+            return {
+                "success": True,
+                "message": f"Queued {len(uploaded_resumes)} resumes for processing",
+                "ingestion_job_id": job["ingestion_job_id"],
+                "status": job["status"],
+                "status_url": f"/api/v1/resumes/jobs/{job['ingestion_job_id']}",
+                "total_uploaded": len(files),
+                "rejected_files": rejected_files
+            }
+        
+        # Process resumes using HR service
+        result = await hr_service.process_resume_batch(
+            uploaded_resumes, job_id_int, packed=packed_extraction
+        )
         
         print(f"🎉 Processing result: {result}")
         
@@ -942,7 +1076,10 @@ async def upload_and_analyze_resumes(
             "failed_count": len(result.get('failed_resumes', [])),
             "processed_resumes": result.get('processed_resumes', []),
             "failed_resumes": result.get('failed_resumes', []),
-            "matching_results": result.get('matching_results')
+            "rejected_files": rejected_files,
+            "parsing_method_stats": result.get('parsing_method_stats', {}),
+            "matching_results": result.get('matching_results'),
+            "recommendation_results": result.get('recommendation_results')
         }
         
     except HTTPException:
@@ -950,6 +1087,229 @@ async def upload_and_analyze_resumes(
     except Exception as e:
         print(f"💥 Resume upload processing failed: {e}")
         raise HTTPException(status_code=500, detail=f"Resume processing failed: {str(e)}")
+    finally:
+        if not keep_upload_dir:
+            shutil.rmtree(upload_dir, ignore_errors=True)
+
+@app.get("/api/v1/resumes/jobs/{ingestion_job_id}")
+async def get_ingestion_job_status(ingestion_job_id: str):
+    """Get progress, partial results and failures of a background upload"""
+    job = ingestion_jobs.get_job(ingestion_job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return {"success": True, "job": job}
+
+@app.get("/api/v1/llm/cache")
+async def get_llm_cache_stats():
+    """LLM response cache hit rates, overall and per call site"""
+    return {"success": True, "cache": response_cache.get_stats()}
+
+@app.get("/api/v1/llm/metrics")
+async def get_llm_metrics(session_id: str = None):
+    """LLM calls, tokens, latency and estimated cost per node, call site and model.
+    
+    Pass ``session_id`` for the totals of one chat session.
+    """
+    return {"success": True, "metrics": llm_metrics.get_stats(session_id)}
+
+def _candidate_summary(candidate: Candidate) -> dict:
+    return {
+        "id": candidate.id,
+        "full_name": candidate.full_name,
+        "email": candidate.email,
+        "location": candidate.location,
+        "skills": candidate.skills or [],
+        "experience_years": candidate.experience_years,
+        "overall_score": candidate.overall_score,
+        "status": candidate.status,
+        "created_at": candidate.created_at.isoformat() if candidate.created_at else None
+    }
+
+def _job_summary(job: Job) -> dict:
+    return {
+        "id": job.id,
+        "title": job.title,
+        "department": job.department,
+        "location": job.location,
+        "employment_type": job.employment_type,
+        "status": job.status,
+        "priority": job.priority,
+        "created_at": job.created_at.isoformat() if job.created_at else None
+    }
+
+@app.get("/api/v1/candidates")
+async def list_candidates(q: str = None, skills: str = "", min_experience: float = None, location: str = None,
+                          status: str = None, order: str = "recent", limit: int = DEFAULT_PAGE_SIZE,
+                          cursor: str = None, db: Session = Depends(get_db)):
+    """Cursor-paginated candidate list; pass ``next_cursor`` back as ``cursor`` for the next page.
+    
+    With ``q`` results are ordered by full-text rank, otherwise by ``order``
+    ("recent" or "score").
+    """
+    repo = CandidateRepository(db)
+    skill_list = [skill for skill in skills.split(",") if skill.strip()]
+    try:
+        if q or skill_list or min_experience or location:
+            page = await asyncio.to_thread(
+                repo.search_candidates, q, skill_list or None, min_experience, location, status,
+                limit=limit, cursor=cursor
+            )
+        elif order not in ("recent", "score"):
+            raise HTTPException(status_code=400, detail="order must be 'recent' or 'score'")
+        elif status:
+            page = await asyncio.to_thread(repo.get_candidates_by_status, status, limit, cursor, order)
+        else:
+            page = await asyncio.to_thread(repo.get_all_candidates, limit, cursor, order)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "success": True,
+        "candidates": [_candidate_summary(candidate) for candidate in page["items"]],
+        "next_cursor": page["next_cursor"],
+        "has_more": page["has_more"]
+    }
+
+@app.get("/api/v1/jobs")
+async def list_jobs(q: str = None, status: str = None, department: str = None, location: str = None,
+                    employment_type: str = None, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None,
+                    db: Session = Depends(get_db)):
+    """Cursor-paginated job list, newest first (best ranked first with ``q``)"""
+    repo = JobRepository(db)
+    try:
+        if q or department or location or employment_type:
+            page = await asyncio.to_thread(
+                repo.search_jobs, q, department, location, employment_type, status, limit=limit, cursor=cursor
+            )
+        elif status:
+            page = await asyncio.to_thread(repo.get_jobs_by_status, status, limit, cursor)
+        else:
+            page = await asyncio.to_thread(repo.get_all_jobs, limit, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "success": True,
+        "jobs": [_job_summary(job) for job in page["items"]],
+        "next_cursor": page["next_cursor"],
+        "has_more": page["has_more"]
+    }
+
+@app.get("/api/v1/candidates/search")
+async def search_candidate_profiles(q: str, skills: str = "", min_experience: float = None, location: str = None,
+                                    status: str = None, limit: int = 20, db: Session = Depends(get_db)):
+    """Ranked full-text search over candidate names and resumes, with highlighted snippets"""
+    results = await asyncio.to_thread(
+        CandidateRepository(db).search_candidates_ranked, q, min(limit, 100),
+        [skill for skill in skills.split(",") if skill.strip()] or None, min_experience, location, status
+    )
+    return {
+        "success": True,
+        "query": q,
+        "results": [
+            {
+                "id": result["candidate"].id,
+                "full_name": result["candidate"].full_name,
+                "email": result["candidate"].email,
+                "location": result["candidate"].location,
+                "experience_years": result["candidate"].experience_years,
+                "overall_score": result["candidate"].overall_score,
+                "status": result["candidate"].status,
+                "rank": result["rank"],
+                "snippet": result["snippet"]
+            }
+            for result in results
+        ]
+    }
+
+@app.get("/api/v1/jobs/search")
+async def search_job_postings(q: str, department: str = None, location: str = None, employment_type: str = None,
+                              limit: int = 20, db: Session = Depends(get_db)):
+    """Ranked full-text search over job titles and descriptions, with highlighted snippets"""
+    results = await asyncio.to_thread(
+        JobRepository(db).search_jobs_ranked, q, min(limit, 100), department, location, employment_type
+    )
+    return {
+        "success": True,
+        "query": q,
+        "results": [
+            {
+                "id": result["job"].id,
+                "title": result["job"].title,
+                "department": result["job"].department,
+                "location": result["job"].location,
+                "employment_type": result["job"].employment_type,
+                "status": result["job"].status,
+                "rank": result["rank"],
+                "snippet": result["snippet"]
+            }
+            for result in results
+        ]
+    }
+
+@app.get("/api/v1/candidates/skill-counts")
+async def get_candidate_skill_counts(all_of: str = "", any_of: str = "", db: Session = Depends(get_db)):
+    """Candidates having every skill in ``all_of`` and one of ``any_of`` (comma separated), with per-skill counts"""
+    counts = await asyncio.to_thread(
+        CandidateRepository(db).count_candidates_by_skills,
+        [skill for skill in all_of.split(",") if skill.strip()],
+        [skill for skill in any_of.split(",") if skill.strip()]
+    )
+    return {"success": True, **counts}
+
+@app.get("/api/v1/jobs/{job_id}/similar-candidates")
+async def get_similar_candidates(job_id: int, k: int = 20, available_only: bool = True, db: Session = Depends(get_db)):
+    """Top-k candidates by embedding similarity to the job"""
+    job = JobRepository(db).get_job_by_id(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    index = get_embedding_index()
+    if not index.available:
+        raise HTTPException(status_code=503, detail="Embedding index unavailable")
+    
+    matches = await asyncio.to_thread(index.candidates_for_job, job_id, min(k, 200), job, available_only)
+    names = dict(db.query(Candidate.id, Candidate.full_name).filter(Candidate.id.in_([m["id"] for m in matches])))
+    return {
+        "success": True,
+        "job_id": job_id,
+        "candidates": [{**match, "full_name": names.get(match["id"])} for match in matches if match["id"] in names]
+    }
+
+@app.get("/api/v1/candidates/{candidate_id}/similar-jobs")
+async def get_similar_jobs(candidate_id: int, k: int = 20, status: str = "active", db: Session = Depends(get_db)):
+    """Top-k jobs by embedding similarity to the candidate; ``status=any`` includes every job"""
+    candidate = CandidateRepository(db).get_candidate_by_id(candidate_id)
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    index = get_embedding_index()
+    if not index.available:
+        raise HTTPException(status_code=503, detail="Embedding index unavailable")
+    
+    matches = await asyncio.to_thread(
+        index.jobs_for_candidate, candidate_id, min(k, 200), candidate, None if status == "any" else status
+    )
+    return {"success": True, "candidate_id": candidate_id, "jobs": matches}
+
+@app.get("/api/v1/candidates/{candidate_id}/recommended-jobs")
+async def get_recommended_jobs(candidate_id: int, limit: int = 10, refresh: bool = False,
+                               db: Session = Depends(get_db)):
+    """Stored top active jobs for a candidate; computed now if they were never computed or ``refresh``"""
+    if not CandidateRepository(db).get_candidate_by_id(candidate_id):
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    repo = RecommendationRepository(db)
+    jobs = [] if refresh else await asyncio.to_thread(repo.get_recommendations, candidate_id, limit)
+    if not jobs:
+        await asyncio.to_thread(repo.recommend_for_candidates, [candidate_id])
+        jobs = await asyncio.to_thread(repo.get_recommendations, candidate_id, limit)
+    return {"success": True, "candidate_id": candidate_id, "jobs": jobs}
+
+@app.post("/api/v1/embeddings/reindex")
+async def reindex_embeddings(db: Session = Depends(get_db)):
+    """Backfill the embedding index; records whose text is unchanged are skipped"""
+    index = get_embedding_index()
+    if not index.available:
+        raise HTTPException(status_code=503, detail="Embedding index unavailable")
+    candidates = await asyncio.to_thread(CandidateRepository(db).reindex_candidates)
+    jobs = await asyncio.to_thread(JobRepository(db).reindex_jobs)
+    return {"success": True, "candidates_checked": candidates, "jobs_checked": jobs, "index": index.stats()}
 
 
 # @app.websocket("/ws/chat/{user_id}")
@@ -1020,6 +1380,149 @@ async def upload_and_analyze_resumes(
 #         print(f"WebSocket error: {e}")
 #         manager.disconnect(user_id)
 
+# Clients opt in per message with {"stream": true}; this sets the default
+CHAT_STREAMING_DEFAULT = os.getenv("CHAT_STREAMING_DEFAULT", "false").lower() in ("1", "true", "yes")
+
+async def run_graph(state: NaviHireState) -> dict:
+    """Run the supervisor graph to completion on the graph pool"""
+    loop = asyncio.get_running_loop()
+    # The copied context carries the turn's LLM usage scope into the worker thread
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(graph_executor, context.run, supervisor.graph.invoke, state)
+
+async def stream_graph(state: NaviHireState, stream_mode: List[str]):
+    """Async iterator over ``supervisor.graph.stream``, which runs on the graph pool"""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    finished = object()
+    stopped = threading.Event()
+    
+    def produce():
+        try:
+            for item in supervisor.graph.stream(state, stream_mode=stream_mode):
+                if stopped.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, finished)
+    
+    loop.run_in_executor(graph_executor, contextvars.copy_context().run, produce)
+    try:
+        while True:
+            item = await queue.get()
+            if item is finished:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # A disconnected client stops the producer at its next chunk
+        stopped.set()
+
+async def stream_chat_turn(websocket: WebSocket, state: NaviHireState) -> dict:
+    """Run the graph in streaming mode and return its final state.
+
+    Sends a ``node_complete`` event as each node finishes and ``token`` events
+    while the response is generated. The final message is sent by the caller.
+    """
+    result = state
+    node_started = datetime.now()
+    async for mode, chunk in stream_graph(state, ["updates", "custom", "values"]):
+        if mode == "values":
+            result = chunk
+        elif mode == "custom":
+            await websocket.send_text(json.dumps({
+                **chunk,
+                "timestamp": datetime.now().isoformat()
+            }))
+        elif mode == "updates":
+            now = datetime.now()
+            for node, update in chunk.items():
+                await websocket.send_text(json.dumps({
+                    "type": "node_complete",
+                    "node": node,
+                    "agent": (update or {}).get("current_task"),
+                    "routing": (update or {}).get("intent_routing") if node == "intent_analysis" else None,
+                    "duration_ms": round((now - node_started).total_seconds() * 1000, 1),
+                    "timestamp": now.isoformat()
+                }, default=str))
+            node_started = now
+    return result
+
+async def handle_chat_turn(websocket: WebSocket, user_id: str, session_id: str,
+                           user_message: str, message_data: dict):
+    """Run one chat turn and send its result; releases the user's turn slot when done.
+    
+    With ``{"debug": true}`` (or LLM_METRICS_DEBUG) the turn's LLM calls, tokens,
+    latency and cost per node are attached to ``task_progress["llm_usage"]``.
+    """
+    try:
+        # Send typing indicator
+        await websocket.send_text(json.dumps({
+            "type": "typing",
+            "content": "NaviHire is thinking...",
+            "timestamp": datetime.now().isoformat()
+        }))
+        
+        # Create state
+        state = NaviHireState(
+            messages=[HumanMessage(content=user_message)],
+            user_id=user_id,
+            session_id=session_id,
+            user_role="hr_manager",
+            current_job_id=None,
+            uploaded_resumes=[],
+            candidate_matches=[],
+            job_description=None,
+            travel_requests=[],
+            flight_results=None,
+            travel_policy=None,
+            current_task=None,
+            next_action=None,
+            intent_routing=None,
+            task_progress={},
+            hr_metrics={},
+            travel_metrics={},
+            conversation_history=[],
+            user_preferences={}
+        )
+        
+        # Process with supervisor
+        with llm_usage_scope(session_id=session_id) as usage:
+            if message_data.get("stream", CHAT_STREAMING_DEFAULT):
+                result = await stream_chat_turn(websocket, state)
+            else:
+                result = await run_graph(state)
+        
+        if message_data.get("debug", LLM_METRICS_DEBUG):
+            result.setdefault("task_progress", {})["llm_usage"] = usage.summary(include_calls=True)
+        
+        # Send response
+        response = result["messages"][-1].content
+        await websocket.send_text(json.dumps({
+            "type": "message",
+            "content": response,
+            "agent": result.get("current_task", "general"),
+            "task_progress": result.get("task_progress", {}),
+            "routing": result.get("intent_routing"),
+            "timestamp": datetime.now().isoformat()
+        }))
+    except Exception as e:
+        print(f"❌ Chat turn failed for user {user_id}: {e}")
+        try:
+            await websocket.send_text(json.dumps({
+                "type": "error",
+                "content": "Sorry, something went wrong while processing your request.",
+                "agent": "system",
+                "timestamp": datetime.now().isoformat()
+            }))
+        except Exception:
+            pass
+    finally:
+        turn_limiter.release(user_id)
+
 @app.websocket("/ws/chat/{user_id}")
 async def websocket_endpoint(websocket: WebSocket, user_id: str):
     await manager.connect(websocket, user_id)
@@ -1034,6 +1537,9 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
     
     # Set up ping/pong for connection health
     last_pong = datetime.now()
+    turns = set()
+    # One session per connection; LLM usage is also aggregated per session
+    session_id = str(uuid.uuid4())
     
     try:
         while True:
@@ -1065,47 +1571,19 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
                     }))
                     continue
                 
-                # Send typing indicator
-                await websocket.send_text(json.dumps({
-                    "type": "typing",
-                    "content": "NaviHire is thinking...",
-                    "timestamp": datetime.now().isoformat()
-                }))
-                
-                # Create state
-                state = NaviHireState(
-                    messages=[HumanMessage(content=user_message)],
-                    user_id=user_id,
-                    session_id=str(uuid.uuid4()),
-                    user_role="hr_manager",
-                    current_job_id=None,
-                    uploaded_resumes=[],
-                    candidate_matches=[],
-                    job_description=None,
-                    travel_requests=[],
-                    flight_results=None,
-                    travel_policy=None,
-                    current_task=None,
-                    next_action=None,
-                    task_progress={},
-                    hr_metrics={},
-                    travel_metrics={},
-                    conversation_history=[],
-                    user_preferences={}
-                )
-                
-                # Process with supervisor
-                result = supervisor.graph.invoke(state)
+                if not turn_limiter.try_acquire(user_id):
+                    await websocket.send_text(json.dumps({
+                        "type": "error",
+                        "content": "Still working on your previous request. Please wait for it to finish.",
+                        "agent": "system",
+                        "timestamp": datetime.now().isoformat()
+                    }))
+                    continue
                 
-                # Send response
-                response = result["messages"][-1].content
-                await websocket.send_text(json.dumps({
-                    "type": "message",
-                    "content": response,
-                    "agent": result.get("current_task", "general"),
-                    "task_progress": result.get("task_progress", {}),
-                    "timestamp": datetime.now().isoformat()
-                }))
+                # The turn runs as its own task so this loop keeps answering pings
+                turn = asyncio.create_task(handle_chat_turn(websocket, user_id, session_id, user_message, message_data))
+                turns.add(turn)
+                turn.add_done_callback(turns.discard)
                 
                 last_pong = datetime.now()
                 
@@ -1132,6 +1610,8 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
         print(f"❌ WebSocket error for user {user_id}: {e}")
         manager.disconnect(user_id)
     finally:
+        for turn in list(turns):
+            turn.cancel()
         manager.disconnect(user_id)
 
 
@@ -1,4 +1,4 @@
-from typing import List, Dict, Optional, Any
+from typing import Iterable, List, Dict, Optional, Any
 from database.models.email_templates import EmailTemplate, EmailSignature, EmailAddon, EmailCampaign
 from database.repositories.candidate_repo import CandidateRepository
 from core.tools.email_automation import EmailAutomation
@@ -363,21 +363,14 @@ class EmailAutomationService:
         
         return recipients
     
-    def _get_filtered_candidates(self, filter_criteria: Dict) -> List:
-        """Get candidates based on filter criteria"""
-        query = self.db.query(self.candidate_repo.db.query(Candidate))
-        
-        if filter_criteria.get("status"):
-            query = query.filter(Candidate.status == filter_criteria["status"])
-        
-        if filter_criteria.get("skills"):
-            for skill in filter_criteria["skills"]:
-                query = query.filter(Candidate.skills.op('?')(skill))
-        
-        if filter_criteria.get("min_experience"):
-            query = query.filter(Candidate.experience_years >= filter_criteria["min_experience"])
-        
-        return query.all()
+    def _get_filtered_candidates(self, filter_criteria: Dict) -> Iterable:
+        """Stream candidates matching the filter criteria"""
+        return self.candidate_repo.iter_candidates(
+            skills=filter_criteria.get("skills"),
+            min_experience=filter_criteria.get("min_experience"),
+            status=filter_criteria.get("status"),
+            match_any=filter_criteria.get("skills_match") == "any"
+        )
     
     def _get_recipient_variables(self, recipient: Dict) -> Dict:
         """Get personalized variables for recipient"""
@@ -281,110 +281,111 @@
 #         return {"matches": [], "job_id": job_id}
 
 import asyncio
-from typing import List, Dict, Optional
+import os
+import time
+from typing import Awaitable, Callable, List, Dict, Optional
+from database.models.candidate import Candidate
+from database.models.job import Job
 from database.repositories.candidate_repo import CandidateRepository
 from database.repositories.job_repo import JobRepository
-from core.tools.gemini_resume_parser import GeminiResumeParser  # Updated import
+from database.repositories.recommendation_repo import RecommendationRepository
+from core.tools.applicant_scoring import applicant_updates, score_applicants, top_applicants
+from core.tools.gemini_resume_parser import get_resume_parser
 from core.tools.email_automation import EmailAutomation
 from datetime import datetime
 
+# Maximum number of resumes parsed at the same time within one batch
+RESUME_PARSE_CONCURRENCY = int(os.getenv("RESUME_PARSE_CONCURRENCY", "5"))
+# Ranked applicants returned with matching results; every applicant is still scored and stored
+MATCH_RESULTS_LIMIT = int(os.getenv("MATCH_RESULTS_LIMIT", "50"))
+
 class HRService:
     def __init__(self, db_session):
         self.db = db_session
         self.candidate_repo = CandidateRepository(db_session)
         self.job_repo = JobRepository(db_session)
-        self.resume_parser = GeminiResumeParser()  # Use Gemini parser
+        self.recommendation_repo = RecommendationRepository(db_session)
+        self.resume_parser = get_resume_parser()  # Shared Gemini parser
         self.email_automation = EmailAutomation()
     
-    async def process_resume_batch(self, resumes: List[Dict], job_id: Optional[int] = None) -> Dict:
-        """Process multiple resumes with Gemini AI and fallback"""
+    async def process_resume_batch(self, resumes: List[Dict], job_id: Optional[int] = None,
+                                   max_concurrency: Optional[int] = None,
+                                   progress_callback: Optional[Callable[[int, Dict], Awaitable[None]]] = None,
+                                   packed: bool = False) -> Dict:
+        """Process multiple resumes with Gemini AI and fallback.
+        
+        Resumes are parsed concurrently (at most ``max_concurrency`` at a time) in
+        worker threads so the event loop stays responsive. Parsed candidates are
+        then written with one bulk upsert per batch. Results keep upload order.
+        ``progress_callback(index, outcome)`` is awaited as each resume is parsed
+        (status ``parsed``, or ``failed``) and again for every parsed resume with
+        its final status and ``candidate_id`` once the batch is saved.
+        
+        ``packed=True`` sends several resumes per Gemini request, which suits bulk
+        imports; single-resume requests (the default) give the lowest latency.
+        """
         results = {
             "processed_resumes": [],
             "failed_resumes": [],
             "total_processed": 0,
-            "parsing_method_stats": {"gemini": 0, "fallback": 0},
-            "matching_results": None
+            "parsing_method_stats": {"gemini": 0, "fallback": 0, "cache_hits": 0, "cache_misses": 0, "input_tokens": 0},
+            "matching_results": None,
+            "recommendation_results": None
         }
         
-        print(f"🔄 Starting batch processing of {len(resumes)} resumes with Gemini AI")
-        
-        for i, resume_data in enumerate(resumes):
-            try:
-                print(f"📝 Processing resume {i+1}/{len(resumes)}: {resume_data['filename']}")
-                
-                # Parse resume using Gemini with fallback
-                parse_result = self.resume_parser.parse_resume(
-                    resume_data["content"], 
-                    resume_data["filename"]
-                )
-                
-                if not parse_result.get("success"):
-                    raise Exception(f"Resume parsing failed: {parse_result.get('error', 'Unknown error')}")
-                
-                parsed_data = parse_result["parsed_data"]
-                parsing_source = parse_result["source"]
-                
-                # Update stats
-                results["parsing_method_stats"][parsing_source] += 1
-                
-                print(f"✅ Parsed with {parsing_source}: {parsed_data['personal_info'].get('full_name', 'Unknown')}")
-                
-                # Create candidate record from parsed data
-                candidate_data = self._convert_parsed_data_to_candidate(parsed_data, resume_data)
-                
-                print(f"👤 Candidate data prepared: {candidate_data['full_name']} ({candidate_data.get('email', 'No email')})")
-                
-                # Check if candidate already exists
-                existing_candidate = None
-                if candidate_data.get("email"):
-                    existing_candidate = self.candidate_repo.get_candidate_by_email(candidate_data["email"])
-                
-                if existing_candidate:
-                    print(f"🔄 Updating existing candidate: {existing_candidate.id}")
-                    candidate = self.candidate_repo.update_candidate(
-                        existing_candidate.id, 
-                        candidate_data
-                    )
+        concurrency = max(1, max_concurrency or RESUME_PARSE_CONCURRENCY)
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        print(f"🔄 Starting batch processing of {len(resumes)} resumes with Gemini AI (concurrency: {concurrency})")
+        
+        parse_results = [None] * len(resumes)
+        if packed:
+            print(f"📦 Using packed Gemini extraction")
+            parse_results = await asyncio.to_thread(
+                self.resume_parser.parse_resumes_packed, resumes, concurrency
+            )
+        
+        async def report(index: int, outcome: Dict):
+            if progress_callback:
+                try:
+                    await progress_callback(index, outcome)
+                except Exception as e:
+                    print(f"⚠️ Progress callback failed for {resumes[index]['filename']}: {e}")
+        
+        async def run(index: int, resume_data: Dict) -> Dict:
+            outcome = await self._prepare_resume(
+                index, len(resumes), resume_data, semaphore, parse_result=parse_results[index]
+            )
+            if outcome["status"] == "success":
+                # Not saved yet, so there is no candidate_id to report
+                result = {key: value for key, value in outcome["result"].items() if key != "candidate_id"}
+                await report(index, {"status": "parsed", "result": {**result, "status": "parsed"}})
+            else:
+                await report(index, outcome)
+            return outcome
+        
+        outcomes = await asyncio.gather(*[
+            run(i, resume_data) for i, resume_data in enumerate(resumes)
+        ])
+        
+        # Single bulk write for the whole batch; the session is only touched here
+        parsed_indexes = [i for i, outcome in enumerate(outcomes) if outcome["status"] == "success"]
+        await asyncio.to_thread(self._persist_candidates, outcomes, job_id)
+        for index in parsed_indexes:
+            await report(index, outcomes[index])
+        
+        for outcome in outcomes:
+            if outcome["status"] == "success":
+                results["processed_resumes"].append(outcome["result"])
+                results["parsing_method_stats"][outcome["parsing_method"]] += 1
+                if outcome["cache"] == "hit":
+                    results["parsing_method_stats"]["cache_hits"] += 1
                 else:
-                    print(f"➕ Creating new candidate")
-                    candidate = self.candidate_repo.create_candidate(candidate_data)
-                
-                results["processed_resumes"].append({
-                    "candidate_id": candidate.id,
-                    "filename": resume_data["filename"],
-                    "candidate_name": candidate.full_name,
-                    "email": candidate.email,
-                    "status": "success",
-                    "score": candidate.overall_score,
-                    "skills_count": len(candidate.skills) if candidate.skills else 0,
-                    "experience_years": candidate.experience_years,
-                    "parsing_method": parsing_source,
-                    "technical_skills": parsed_data["skills"].get("technical_skills", []),
-                    "programming_languages": parsed_data["skills"].get("programming_languages", [])
-                })
-                
-                # Create job application if job_id provided
-                if job_id and candidate:
-                    try:
-                        application = self.candidate_repo.create_job_application({
-                            "candidate_id": candidate.id,
-                            "job_id": job_id,
-                            "status": "applied",
-                            "application_date": datetime.utcnow()
-                        })
-                        print(f"📋 Created job application: {application.id}")
-                    except Exception as e:
-                        print(f"⚠️ Failed to create job application: {e}")
-                
-                print(f"✅ Successfully processed: {candidate.full_name}")
-                
-            except Exception as e:
-                print(f"❌ Error processing {resume_data['filename']}: {e}")
-                results["failed_resumes"].append({
-                    "filename": resume_data["filename"],
-                    "error": str(e),
-                    "error_type": type(e).__name__
-                })
+                    results["parsing_method_stats"]["cache_misses"] += 1
+                    # Cache hits reuse an earlier parse, so only misses spent tokens
+                    results["parsing_method_stats"]["input_tokens"] += outcome["result"]["input_tokens"]
+            else:
+                results["failed_resumes"].append(outcome["result"])
         
         results["total_processed"] = len(results["processed_resumes"])
         
@@ -393,6 +394,8 @@ class HRService:
         print(f"   ❌ Failed: {len(results['failed_resumes'])}")
         print(f"   🤖 Gemini parsed: {results['parsing_method_stats']['gemini']}")
         print(f"   🔄 Fallback parsed: {results['parsing_method_stats']['fallback']}")
+        print(f"   ⚡ Cache hits: {results['parsing_method_stats']['cache_hits']}")
+        print(f"   🔢 Prompt input tokens: {results['parsing_method_stats']['input_tokens']}")
         
         # Perform matching if job specified and we have processed resumes
         if job_id and results["processed_resumes"]:
@@ -405,8 +408,189 @@ class HRService:
                 print(f"⚠️ Matching failed: {e}")
                 results["matching_error"] = str(e)
         
+        # Without a job, recommend active jobs to the new candidates instead
+        if not job_id and results["processed_resumes"]:
+            try:
+                results["recommendation_results"] = await asyncio.to_thread(
+                    self.recommend_jobs, [result["candidate_id"] for result in results["processed_resumes"]]
+                )
+            except Exception as e:
+                print(f"⚠️ Job recommendations failed: {e}")
+                results["recommendation_error"] = str(e)
+        
         return results
     
+    async def _prepare_resume(self, index: int, total: int, resume_data: Dict,
+                              semaphore: asyncio.Semaphore, parse_result: Optional[Dict] = None) -> Dict:
+        """Parse one resume into candidate data; failures are returned, never raised"""
+        try:
+            if parse_result is None:
+                parse_result = await self._parse_resume(index, total, resume_data, semaphore)
+            
+            if not parse_result.get("success"):
+                raise Exception(f"Resume parsing failed: {parse_result.get('error', 'Unknown error')}")
+            
+            parsed_data = parse_result["parsed_data"]
+            parsing_source = parse_result["source"]
+            
+            print(f"✅ Parsed with {parsing_source}: {parsed_data['personal_info'].get('full_name', 'Unknown')}")
+            
+            # Create candidate record from parsed data
+            candidate_data = self._convert_parsed_data_to_candidate(parsed_data, resume_data)
+            
+            print(f"👤 Candidate data prepared: {candidate_data['full_name']} ({candidate_data.get('email', 'No email')})")
+            
+            return {
+                "status": "success",
+                "parsing_method": parsing_source,
+                "cache": parse_result.get("cache", "miss"),
+                "candidate_data": candidate_data,
+                "result": {
+                    "candidate_id": None,
+                    "filename": resume_data["filename"],
+                    "candidate_name": candidate_data["full_name"],
+                    "email": candidate_data.get("email"),
+                    "status": "success",
+                    "score": candidate_data["overall_score"],
+                    "skills_count": len(candidate_data["skills"]),
+                    "experience_years": candidate_data["experience_years"],
+                    "parsing_method": parsing_source,
+                    "cache": parse_result.get("cache", "miss"),
+                    "input_tokens": parse_result.get("token_usage", {}).get("input_tokens", 0),
+                    "technical_skills": parsed_data["skills"].get("technical_skills", []),
+                    "programming_languages": parsed_data["skills"].get("programming_languages", [])
+                }
+            }
+            
+        except Exception as e:
+            print(f"❌ Error processing {resume_data['filename']}: {e}")
+            return self._failed_outcome(resume_data["filename"], e)
+    
+    @staticmethod
+    def _failed_outcome(filename: str, error: Exception) -> Dict:
+        return {
+            "status": "failed",
+            "result": {
+                "filename": filename,
+                "error": str(error),
+                "error_type": type(error).__name__
+            }
+        }
+    
+    async def _parse_resume(self, index: int, total: int, resume_data: Dict,
+                            semaphore: asyncio.Semaphore) -> Dict:
+        """Parse a single resume in a worker thread, bounded by the batch semaphore"""
+        async with semaphore:
+            print(f"📝 Processing resume {index+1}/{total}: {resume_data['filename']}")
+            
+            # Parse resume using Gemini with fallback (blocking I/O, run off the event loop).
+            # Spooled uploads are read from disk here so only in-flight files occupy memory.
+            if resume_data.get("path"):
+                return await asyncio.to_thread(
+                    self.resume_parser.parse_resume_file,
+                    resume_data["path"],
+                    resume_data["filename"]
+                )
+            return await asyncio.to_thread(
+                self.resume_parser.parse_resume,
+                resume_data["content"], 
+                resume_data["filename"]
+            )
+    
+    def _persist_candidates(self, outcomes: List[Dict], job_id: Optional[int] = None):
+        """Upsert parsed candidates (and applications) in one transaction.
+        
+        Fills in ``candidate_id`` on successful outcomes. If the bulk write fails,
+        rows are retried one by one so a single bad record only fails itself.
+        """
+        parsed = [outcome for outcome in outcomes if outcome["status"] == "success"]
+        if not parsed:
+            return
+        
+        bulk_saved = False
+        try:
+            candidate_ids = self.candidate_repo.bulk_upsert_candidates(
+                [outcome["candidate_data"] for outcome in parsed], commit=False
+            )
+            if job_id:
+                self.candidate_repo.bulk_create_applications([
+                    {
+                        "candidate_id": candidate_id,
+                        "job_id": job_id,
+                        "status": "applied",
+                        "application_date": datetime.utcnow()
+                    }
+                    for candidate_id in dict.fromkeys(candidate_ids)
+                ], commit=False)
+            self.db.commit()
+            bulk_saved = True
+            print(f"💾 Bulk upserted {len(parsed)} candidates")
+        except Exception as e:
+            self.db.rollback()
+            print(f"⚠️ Bulk upsert failed ({e}), saving candidates individually")
+            candidate_ids = []
+            for outcome in parsed:
+                try:
+                    candidate = self._save_candidate(outcome["candidate_data"], job_id)
+                    candidate_ids.append(candidate.id)
+                except Exception as row_error:
+                    print(f"❌ Error saving {outcome['result']['filename']}: {row_error}")
+                    failed = self._failed_outcome(outcome["result"]["filename"], row_error)
+                    outcome.clear()
+                    outcome.update(failed)
+                    candidate_ids.append(None)
+        
+        # Outside the write's try: the rows are committed, so an index failure must never re-save them
+        if bulk_saved:
+            try:
+                self.candidate_repo.reindex_candidates(candidate_ids)
+            except Exception as e:
+                self.db.rollback()
+                print(f"⚠️ Search index update failed after bulk upsert: {e}")
+        
+        for outcome, candidate_id in zip(parsed, candidate_ids):
+            if outcome["status"] == "success":
+                outcome["result"]["candidate_id"] = candidate_id
+            outcome.pop("candidate_data", None)
+    
+    def _save_candidate(self, candidate_data: Dict, job_id: Optional[int] = None):
+        """Create or update the candidate and optionally attach a job application"""
+        try:
+            # Check if candidate already exists
+            existing_candidate = None
+            if candidate_data.get("email"):
+                existing_candidate = self.candidate_repo.get_candidate_by_email(candidate_data["email"])
+            
+            if existing_candidate:
+                print(f"🔄 Updating existing candidate: {existing_candidate.id}")
+                candidate = self.candidate_repo.update_candidate(
+                    existing_candidate.id, 
+                    candidate_data
+                )
+            else:
+                print(f"➕ Creating new candidate")
+                candidate = self.candidate_repo.create_candidate(candidate_data)
+        except Exception:
+            # Keep the shared session usable for the rest of the batch
+            self.db.rollback()
+            raise
+        
+        # Create job application if job_id provided
+        if job_id and candidate:
+            try:
+                application = self.candidate_repo.create_job_application({
+                    "candidate_id": candidate.id,
+                    "job_id": job_id,
+                    "status": "applied",
+                    "application_date": datetime.utcnow()
+                })
+                print(f"📋 Created job application: {application.id}")
+            except Exception as e:
+                self.db.rollback()
+                print(f"⚠️ Failed to create job application: {e}")
+        
+        return candidate
+    
     def _convert_parsed_data_to_candidate(self, parsed_data: Dict, resume_data: Dict) -> Dict:
         """Convert parsed resume data to candidate database format"""
         personal_info = parsed_data.get("personal_info", {})
@@ -487,8 +671,72 @@ class HRService:
         
         return min(score, 100.0)
     
-    # Keep existing methods for job matching, etc.
+    def recommend_jobs(self, candidate_ids: List[int], shown: int = 3) -> Dict:
+        """Store each candidate's top active jobs; returns the best ``shown`` per candidate"""
+        start = time.perf_counter()
+        recommendations = self.recommendation_repo.recommend_for_candidates(candidate_ids)
+        print(f"🧭 Recommended jobs for {len(recommendations)} candidates in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return {
+            "candidates": len(recommendations),
+            "top_jobs": {
+                candidate_id: [
+                    {"job_id": job["job_id"], "title": job["title"], "score": job["score"]} for job in jobs[:shown]
+                ]
+                for candidate_id, jobs in recommendations.items()
+            }
+        }
+    
     async def _match_candidates_to_job(self, job_id: int) -> Dict:
-        """Match processed candidates to job"""
-        # Implementation would use the matching node
-        return {"matches": [], "job_id": job_id}
\ No newline at end of file
+        """Score every applicant of the job and store match_score, strengths and gaps"""
+        return await asyncio.to_thread(self.score_job_applicants, job_id)
+    
+    def score_job_applicants(self, job_id: int, limit: int = MATCH_RESULTS_LIMIT) -> Dict:
+        """Vectorized scoring of all applicants of a job against its skills and experience range.
+        
+        Applicants are loaded as arrays (skills multi-hot over the job's skills,
+        years, profile score) and scored in one pass; the scores are then written
+        back to the job applications in bulk. Returns the top ``limit`` matches.
+        """
+        job = self.job_repo.get_job_by_id(job_id)
+        if not job:
+            return {"matches": [], "job_id": job_id, "error": "Job not found"}
+        
+        job_data = {column.name: getattr(job, column.name) for column in Job.__table__.columns}
+        scoring = score_applicants(job_data, self.candidate_repo.iter_applicant_features(job_id))
+        columns, matrix, scores = scoring["columns"], scoring["matrix"], scoring["scores"]
+        
+        start = time.perf_counter()
+        updates = applicant_updates(columns, matrix, scores)
+        self.candidate_repo.bulk_update_application_scores(updates)
+        scoring["timings_ms"]["write"] = round((time.perf_counter() - start) * 1000, 1)
+        
+        best = top_applicants(matrix, scores, limit)
+        candidate_ids = matrix["candidate_ids"]
+        names = dict(self.db.query(Candidate.id, Candidate.full_name).filter(
+            Candidate.id.in_([int(candidate_ids[row]) for row in best])
+        )) if best else {}
+        
+        matches = [
+            {
+                "application_id": updates[row]["id"],
+                "candidate_id": int(candidate_ids[row]),
+                "candidate_name": names.get(int(candidate_ids[row])),
+                "match_score": updates[row]["match_score"],
+                "skill_score": round(float(scores["skill_score"][row]), 3),
+                "experience_score": round(float(scores["experience_score"][row]), 3),
+                "strengths": updates[row]["strengths"],
+                "gaps": updates[row]["gaps"],
+                "recommendation": updates[row]["recommendation"],
+                "rank": rank
+            }
+            for rank, row in enumerate(best, 1)
+        ]
+        print(f"📊 Scored {len(updates)} applicants for job {job_id} in {scoring['timings_ms']}")
+        return {
+            "job_id": job_id,
+            "total_applicants": len(updates),
+            "required_skills": columns["required"],
+            "preferred_skills": columns["preferred"],
+            "matches": matches,
+            "timings_ms": scoring["timings_ms"]
+        }
\ No newline at end of file
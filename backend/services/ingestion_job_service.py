@@ -0,0 +1,177 @@
+import asyncio
+import os
+import shutil
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+from config.database import get_database_session, close_database_session
+from services.hr_service import HRService
+
+# Number of upload batches processed at the same time
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "2"))
+# Finished jobs kept in memory for status polling
+INGESTION_JOB_HISTORY = int(os.getenv("INGESTION_JOB_HISTORY", "200"))
+
+class IngestionJobManager:
+    """In-process queue of resume ingestion jobs.
+
+    Uploads are queued with their spooled files and processed by a fixed pool of
+    asyncio workers running ``HRService.process_resume_batch``. Job state lives in
+    memory, so status is only available on the worker that accepted the upload.
+    """
+
+    def __init__(self, notifier: Optional[Callable[[str, Dict], Awaitable[None]]] = None,
+                 workers: int = INGESTION_WORKERS):
+        self.notifier = notifier
+        self.worker_count = max(1, workers)
+        self.jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[asyncio.Task] = []
+
+    def start(self):
+        """Start the worker pool (idempotent, must be called from the event loop)"""
+        if self.workers:
+            return
+        self.queue = asyncio.Queue()
+        self.workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self.worker_count)
+        ]
+        print(f"✅ Ingestion worker pool started with {self.worker_count} workers")
+
+    async def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    def submit(self, resumes: List[Dict], upload_dir: str, job_id: Optional[int] = None,
+               user_id: Optional[str] = None, rejected_files: Optional[List[Dict]] = None,
+               packed: bool = False) -> Dict:
+        """Queue a spooled batch and return its initial status"""
+        self.start()
+
+        ingestion_job_id = str(uuid.uuid4())
+        job = {
+            "ingestion_job_id": ingestion_job_id,
+            "status": "queued",
+            "user_id": user_id,
+            "job_id": job_id,
+            "packed": packed,
+            "total_files": len(resumes),
+            "completed_files": 0,
+            "files": [{"filename": r["filename"], "status": "pending"} for r in resumes],
+            "processed_resumes": [],
+            "failed_resumes": [],
+            "rejected_files": rejected_files or [],
+            "parsing_method_stats": {},
+            "matching_results": None,
+            "recommendation_results": None,
+            "error": None,
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None
+        }
+        self.jobs[ingestion_job_id] = job
+        self._trim_history()
+
+        self.queue.put_nowait((ingestion_job_id, resumes, upload_dir))
+        print(f"📥 Queued ingestion job {ingestion_job_id} ({len(resumes)} files)")
+        return self.get_job(ingestion_job_id)
+
+    def get_job(self, ingestion_job_id: str) -> Optional[Dict]:
+        job = self.jobs.get(ingestion_job_id)
+        if not job:
+            return None
+        return {**job, "files": [dict(f) for f in job["files"]]}
+
+    async def _worker(self, worker_id: int):
+        while True:
+            ingestion_job_id, resumes, upload_dir = await self.queue.get()
+            try:
+                await self._run_job(ingestion_job_id, resumes, upload_dir)
+            except Exception as e:
+                print(f"❌ Ingestion worker {worker_id} crashed on {ingestion_job_id}: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def _run_job(self, ingestion_job_id: str, resumes: List[Dict], upload_dir: str):
+        job = self.jobs.get(ingestion_job_id)
+        if job is None:
+            shutil.rmtree(upload_dir, ignore_errors=True)
+            return
+
+        job["status"] = "running"
+        job["started_at"] = datetime.now().isoformat()
+        await self._notify(job, {"type": "ingestion_started", "total_files": job["total_files"]})
+
+        async def on_progress(index: int, outcome: Dict):
+            # A parsed file is reported again with its final status once the batch is saved,
+            # which replaces the parse-time entry
+            job["files"][index] = {
+                "filename": job["files"][index]["filename"], "status": outcome["status"], **outcome["result"]
+            }
+            if outcome["status"] == "success":
+                job["completed_files"] += 1
+                job["processed_resumes"].append(outcome["result"])
+            elif outcome["status"] == "failed":
+                job["completed_files"] += 1
+                job["failed_resumes"].append(outcome["result"])
+            await self._notify(job, {
+                "type": "ingestion_progress",
+                "file_index": index,
+                "file": job["files"][index],
+                "completed_files": job["completed_files"],
+                "total_files": job["total_files"]
+            })
+
+        db = get_database_session()
+        try:
+            hr_service = HRService(db)
+            result = await hr_service.process_resume_batch(
+                resumes, job["job_id"], progress_callback=on_progress, packed=job["packed"]
+            )
+            # Batch result is authoritative and ordered by upload position
+            job["processed_resumes"] = result.get("processed_resumes", [])
+            job["failed_resumes"] = result.get("failed_resumes", [])
+            job["parsing_method_stats"] = result.get("parsing_method_stats", {})
+            job["matching_results"] = result.get("matching_results")
+            job["recommendation_results"] = result.get("recommendation_results")
+            job["status"] = "completed"
+        except Exception as e:
+            print(f"💥 Ingestion job {ingestion_job_id} failed: {e}")
+            job["status"] = "failed"
+            job["error"] = str(e)
+        finally:
+            close_database_session(db)
+            shutil.rmtree(upload_dir, ignore_errors=True)
+            job["finished_at"] = datetime.now().isoformat()
+
+        await self._notify(job, {
+            "type": "ingestion_completed" if job["status"] == "completed" else "ingestion_failed",
+            "total_processed": len(job["processed_resumes"]),
+            "failed_count": len(job["failed_resumes"]),
+            "error": job["error"]
+        })
+
+    async def _notify(self, job: Dict, event: Dict):
+        if not self.notifier or not job.get("user_id"):
+            return
+        try:
+            await self.notifier(job["user_id"], {
+                **event,
+                "ingestion_job_id": job["ingestion_job_id"],
+                "status": job["status"],
+                "timestamp": datetime.now().isoformat()
+            })
+        except Exception as e:
+            print(f"⚠️ Failed to notify {job['user_id']} about {job['ingestion_job_id']}: {e}")
+
+    def _trim_history(self):
+        """Forget the oldest finished jobs once the history limit is reached"""
+        finished = [
+            job_id for job_id, job in self.jobs.items()
+            if job["status"] in ("completed", "failed")
+        ]
+        for job_id in finished[:max(0, len(self.jobs) - INGESTION_JOB_HISTORY)]:
+            del self.jobs[job_id]
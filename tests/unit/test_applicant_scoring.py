@@ -0,0 +1,65 @@
+import random
+import numpy as np
+from core.tools.applicant_scoring import (
+    APPLICANT_SCORE_WEIGHTS, applicant_updates, build_applicant_matrix, job_skill_columns, score_applicant_matrix,
+    top_applicants
+)
+from core.tools.match_scoring import experience_fit, recommendation_for, skill_overlap
+
+JOB = {
+    "required_skills": ["Python", "SQL", "Docker"],
+    "preferred_skills": ["Kubernetes", "AWS"],
+    "min_experience_years": 4,
+    "max_experience_years": 10
+}
+
+def _reference_score(columns, skills, years, overall_score):
+    """The per-applicant loop the vectorized engine replaces"""
+    have = {skill.strip().lower() for skill in skills}
+    skill_score, matched, gaps = skill_overlap(set(columns["required"]), set(columns["preferred"]), have)
+    experience_score = experience_fit(years, columns["min_years"])
+    if columns["max_years"] and years > columns["max_years"]:
+        experience_score = max(0.5, columns["max_years"] / years)
+    score = 100 * (
+        APPLICANT_SCORE_WEIGHTS["skills"] * skill_score
+        + APPLICANT_SCORE_WEIGHTS["experience"] * experience_score
+        + APPLICANT_SCORE_WEIGHTS["profile"] * min(max(overall_score / 100, 0), 1)
+    )
+    return score, matched, gaps
+
+def test_scores_match_the_per_applicant_loop():
+    rng = random.Random(11)
+    pool = ["python", "SQL", "docker", "kubernetes", "aws", "java", "go", " Python "]
+    rows = [
+        (1000 + i, i, rng.sample(pool, rng.randint(0, 5)), round(rng.uniform(0, 15), 1), rng.uniform(0, 100))
+        for i in range(300)
+    ]
+    columns = job_skill_columns(JOB)
+    matrix = build_applicant_matrix(columns, rows)
+    scores = score_applicant_matrix(columns, matrix)
+    updates = applicant_updates(columns, matrix, scores)
+
+    assert [update["id"] for update in updates] == [row[0] for row in rows]
+    for (_, _, skills, years, overall_score), update in zip(rows, updates):
+        expected, matched, gaps = _reference_score(columns, skills, years, overall_score)
+        assert abs(update["match_score"] - expected) <= 0.051
+        assert sorted(update["strengths"]) == matched
+        assert update["gaps"] == sorted(gaps)
+        assert update["recommendation"] == recommendation_for(update["match_score"])
+
+def test_job_without_skills_scores_half_on_skills():
+    columns = job_skill_columns({"title": "", "required_skills": [], "preferred_skills": []})
+    matrix = build_applicant_matrix(columns, [(1, 1, ["python"], 2.0, 50.0), (2, 2, None, None, None)])
+    scores = score_applicant_matrix(columns, matrix)
+    assert scores["skill_score"].tolist() == [0.5, 0.5]
+    assert applicant_updates(columns, matrix, scores)[0]["strengths"] == []
+
+def test_top_applicants_orders_best_first():
+    columns = job_skill_columns(JOB)
+    matrix = build_applicant_matrix(columns, [
+        (1, 1, [], 0, 0), (2, 2, ["python", "sql", "docker"], 5, 90), (3, 3, ["python"], 5, 50)
+    ])
+    scores = score_applicant_matrix(columns, matrix)
+    assert top_applicants(matrix, scores, 2) == [1, 2]
+    assert top_applicants(matrix, scores, 10) == [1, 2, 0]
+    assert top_applicants(matrix, {"match_score": np.zeros(0)}, 5) == []
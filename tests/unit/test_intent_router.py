@@ -0,0 +1,51 @@
+import pytest
+from core.agents.intent_router import (
+    DEFAULT_INTENT, RULE_BASE_CONFIDENCE, RULE_MAX_CONFIDENCE, IntentRouter, parse_intent_label
+)
+
+@pytest.fixture
+def router():
+    return IntentRouter(examples={})
+
+@pytest.mark.parametrize("message, intent", [
+    ("Please parse these resumes", "resume_analysis"),
+    ("Find the best candidates for the backend role", "candidate_matching"),
+    ("Show flights from BLR to DEL next week", "travel_optimization"),
+    ("Send a follow-up email to the shortlisted candidates", "workflow_automation"),
+    ("hello there", "direct_response"),
+])
+def test_rules_route_unambiguous_requests(router, message, intent):
+    matched = router.match_rules(message)
+    assert matched is not None and matched[0] == intent
+    assert RULE_BASE_CONFIDENCE < matched[1] <= RULE_MAX_CONFIDENCE
+
+def test_rules_skip_requests_that_hit_several_intents(router):
+    assert router.match_rules("Match these resumes to the job") is None
+
+def test_greeting_opening_a_longer_request_is_not_a_direct_response(router):
+    assert router.match_rules("hello can you tell me how the hiring pipeline looks this quarter") is None
+
+def test_airport_codes_must_be_upper_case(router):
+    assert router.match_rules("blr to del") is None
+
+def test_route_without_a_decision_defaults_and_is_not_confident(router, monkeypatch):
+    monkeypatch.setattr(router, "classify", lambda message: None)
+    decision = router.route("what is the weather like on mars")
+    assert decision["intent"] == DEFAULT_INTENT
+    assert decision["path"] == "default"
+    assert not decision["confident"]
+
+def test_route_trusts_confident_rules(router, monkeypatch):
+    monkeypatch.setattr(router, "classify", lambda message: pytest.fail("classifier should not run"))
+    decision = router.route("Book a flight and hotel for the trip")
+    assert decision["intent"] == "travel_optimization"
+    assert decision["path"] == "rules" and decision["confident"]
+
+@pytest.mark.parametrize("reply, intent", [
+    ("candidate_matching", "candidate_matching"),
+    ("2. Candidate Matching", "candidate_matching"),
+    ("I think workflow_automation, not resume_analysis", "workflow_automation"),
+    ("no idea", None),
+])
+def test_parse_intent_label(reply, intent):
+    assert parse_intent_label(reply) == intent
@@ -0,0 +1,75 @@
+import random
+import numpy as np
+from core.tools.job_recommendations import JobFeatureCache, blend_similarity, job_features, score_job
+
+SKILLS = [f"skill{i}" for i in range(40)]
+
+def _jobs(rng, count):
+    jobs = []
+    for job_id in range(1, count + 1):
+        skills = rng.sample(SKILLS, 8)
+        jobs.append({
+            "id": job_id,
+            "title": f"Job {job_id}",
+            "required_skills": skills[:5],
+            "preferred_skills": skills[5:],
+            "min_experience_years": rng.choice([0, 2, 5]),
+            "max_experience_years": rng.choice([None, 8])
+        })
+    return jobs
+
+def _candidates(rng, count):
+    return [
+        (candidate_id, [skill.upper() if rng.random() < 0.3 else skill for skill in rng.sample(SKILLS, 10)],
+         round(rng.uniform(0, 12), 1), rng.uniform(20, 95))
+        for candidate_id in range(1, count + 1)
+    ]
+
+def _vectors(rng, ids, dimension=16):
+    return {record_id: [rng.gauss(0, 1) for _ in range(dimension)] for record_id in ids}
+
+def test_batch_and_single_job_scores_agree():
+    rng = random.Random(5)
+    jobs, rows = _jobs(rng, 30), _candidates(rng, 60)
+    job_vectors = _vectors(rng, [job["id"] for job in jobs if job["id"] % 3])
+    candidate_vectors = _vectors(rng, [row[0] for row in rows if row[0] % 4])
+
+    cache = JobFeatureCache(max_age=0)
+    cache.load(jobs, job_vectors)
+    batch = cache.recommend(rows, candidate_vectors, limit=len(jobs))
+    batch_scores = {
+        (candidate_id, entry["job_id"]): entry["score"] for candidate_id, entries in batch.items() for entry in entries
+    }
+
+    for job in jobs:
+        single = score_job(job_features(job, job_vectors.get(job["id"])), rows, candidate_vectors)
+        for candidate_id, score in zip(single["candidate_ids"].tolist(), single["score"].tolist()):
+            assert batch_scores[(candidate_id, job["id"])] == score
+
+def test_recommend_returns_the_best_jobs_first():
+    rng = random.Random(8)
+    cache = JobFeatureCache(max_age=0)
+    cache.load(_jobs(rng, 25), {})
+    recommendations = cache.recommend(_candidates(rng, 5), {}, limit=4)
+    for entries in recommendations.values():
+        scores = [entry["score"] for entry in entries]
+        assert len(entries) == 4 and scores == sorted(scores, reverse=True)
+        for entry in entries:
+            assert entry["similarity"] is None
+            assert not set(entry["strengths"]) & set(entry["gaps"])
+
+def test_upsert_and_remove_change_the_candidate_pool():
+    cache = JobFeatureCache(max_age=0)
+    cache.upsert({"id": 1, "required_skills": ["python"]})
+    assert len(cache) == 0
+    cache.load([{"id": 1, "title": "Backend", "required_skills": ["python"]}], {})
+    cache.upsert({"id": 2, "title": "Data", "required_skills": ["sql"]})
+    row = (7, ["SQL"], 3.0, 50.0)
+    assert [entry["job_id"] for entry in cache.recommend([row], {})[7]] == [2, 1]
+    cache.remove(2)
+    assert [entry["job_id"] for entry in cache.recommend([row], {})[7]] == [1]
+
+def test_similarity_only_blends_where_known():
+    blended = blend_similarity(np.array([50.0, 50.0]), np.array([1.0, 1.0]), np.array([True, False]))
+    assert blended[1] == 50.0
+    assert blended[0] > 50.0
@@ -0,0 +1,44 @@
+from datetime import date, datetime, timezone
+import pytest
+from sqlalchemy import Column, DateTime, Float, Integer
+from sqlalchemy.orm import declarative_base
+from database.pagination import InvalidCursor, _check_types, decode_cursor, encode_cursor, keys_scope
+
+Base = declarative_base()
+
+class Row(Base):
+    __tablename__ = "rows"
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime)
+    score = Column(Float)
+
+def test_cursor_round_trips_values():
+    values = [datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc), date(2024, 5, 1), 0.1234567891, "text", 42]
+    cursor = encode_cursor(values, "recent")
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "recent") == values
+    assert decode_cursor(cursor) == values
+
+def test_cursor_from_another_listing_is_rejected():
+    cursor = encode_cursor([datetime(2024, 1, 1), 7], keys_scope((Row.created_at, Row.id)))
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, keys_scope((Row.score, Row.id)))
+    assert keys_scope((Row.created_at, Row.id)) == keys_scope((Row.created_at, Row.id))
+
+@pytest.mark.parametrize("cursor", ["not base64!", encode_cursor([1])[:-3], "WzEsMl0"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+def test_cursor_values_must_match_key_types():
+    _check_types((Row.created_at, Row.id), [datetime(2024, 1, 1), 7])
+    _check_types((Row.score, Row.id), [3, 7])
+    for values in ([datetime(2024, 1, 1), 7], ["2024-01-01", 7], [1.5, True]):
+        with pytest.raises(InvalidCursor):
+            _check_types((Row.score, Row.id), values)
+
+def test_scope_includes_filters():
+    keys = (Row.score, Row.id)
+    assert keys_scope(keys, ("python", None)) == keys_scope(keys, ("python", None))
+    assert keys_scope(keys, ("python", None)) != keys_scope(keys, ("java & dev:*", None))
+    assert keys_scope(keys, ("python", None)) != keys_scope(keys, ("python", "active"))
@@ -0,0 +1,58 @@
+from core.tools.resume_text import estimate_tokens, normalize_resume_text, prepare_resume_text
+
+TWO_PAGES = "\f".join([
+    "Jane Doe\nSenior Engineer | jane@example.com\n\nExperience\nAcme Corp\n2019 - 2023\nBuilt things\n"
+    "Globex\n2016 - 2019\nShipped things\nConfidential\nPage 1 of 2",
+    "Jane Doe\nSenior Engineer | jane@example.com\nInitech\n2014 - 2016\nFixed things\nUmbrella\n2013 - 2014\n"
+    "Education\nState University\n2009 - 2013\nConfidential\nPage 2 of 2",
+])
+
+def test_running_headers_and_footers_are_kept_once():
+    text = normalize_resume_text(TWO_PAGES)
+    lines = text.split("\n")
+    assert lines.count("Jane Doe") == 1
+    assert lines.count("Senior Engineer | jane@example.com") == 1
+    assert lines.count("Confidential") == 1
+    assert not any(line.startswith("Page") for line in lines)
+
+def test_employment_dates_are_preserved():
+    lines = normalize_resume_text(TWO_PAGES).split("\n")
+    for dates in ("2019 - 2023", "2016 - 2019", "2014 - 2016", "2013 - 2014", "2009 - 2013"):
+        assert dates in lines
+
+def test_repeated_lines_in_a_page_body_are_kept():
+    pages = [
+        "Header\nIntro\nOne\nTwo\nThree\nPython\nFour\nFive\nSix\nPython",
+        "Header\nPython\nSeven\nEight\nNine\nPython\nTen\nEleven\nTwelve\nThirteen",
+    ]
+    lines = normalize_resume_text("\f".join(pages)).split("\n")
+    assert lines.count("Header") == 1
+    # The copy at the top of page 2 goes; the ones inside page bodies stay
+    assert lines.count("Python") == 3
+
+def test_whitespace_and_blank_lines_are_collapsed():
+    assert normalize_resume_text("Jane  Doe \r\n\r\n\r\n\tPython ,  SQL\n- 3 -") == "Jane Doe\n\nPython , SQL"
+
+def test_text_within_budget_is_only_normalized():
+    prepared = prepare_resume_text("Jane Doe\n\n\nSkills\nPython", token_budget=100)
+    assert prepared["text"] == "Jane Doe\n\nSkills\nPython"
+    assert not prepared["truncated"]
+    assert prepared["input_tokens"] == estimate_tokens(prepared["text"])
+
+def test_over_budget_text_keeps_core_sections_first():
+    text = "\n".join([
+        "Jane Doe", "jane@example.com",
+        "Skills", "Python, SQL, Docker",
+        "Experience", *[f"Did task number {i} at Acme with great results" for i in range(40)],
+        "Education", "State University 2009 - 2013",
+        "Hobbies", *[f"Hobby {i} described at some length here" for i in range(40)],
+    ])
+    prepared = prepare_resume_text(text, token_budget=200)
+    assert prepared["truncated"]
+    assert prepared["input_tokens"] <= 200
+    assert "Python, SQL, Docker" in prepared["text"]
+    assert "State University 2009 - 2013" in prepared["text"]
+    assert "experience" in prepared["trimmed_sections"]
+    assert "other" in prepared["dropped_sections"]
+    # Kept sections stay in document order
+    assert prepared["text"].index("Skills") < prepared["text"].index("Experience") < prepared["text"].index("Education")
@@ -0,0 +1,112 @@
+import random
+from array import array
+from core.tools.skill_index import ARRAY_MAX, Bitmap, SkillIndex, clean_skills, normalize_skill
+
+def _random_ids(rng, count, dense_chunk=None):
+    ids = {rng.randrange(0, 300000) for _ in range(count)}
+    if dense_chunk is not None:
+        # Enough members in one chunk to store it as a bitmap
+        base = dense_chunk << 16
+        ids |= {base + offset for offset in rng.sample(range(65536), ARRAY_MAX + 500)}
+    return ids
+
+def test_bitmap_matches_set_semantics():
+    rng = random.Random(3)
+    for dense in (None, 1):
+        a_ids = _random_ids(rng, 3000, dense)
+        b_ids = _random_ids(rng, 3000, 1)
+        a, b = Bitmap.from_ids(a_ids), Bitmap.from_sorted(sorted(b_ids))
+        assert list(a) == sorted(a_ids)
+        assert len(a) == len(a_ids)
+        assert list(a & b) == sorted(a_ids & b_ids)
+        assert list(a | b) == sorted(a_ids | b_ids)
+        sample = rng.sample(sorted(a_ids), 5)
+        assert all(value in a for value in sample)
+        assert 300001 not in a
+
+def test_bitmap_converts_between_array_and_bitmap_containers():
+    values = list(range(ARRAY_MAX + 1))
+    bitmap = Bitmap.from_sorted(values[:ARRAY_MAX])
+    assert isinstance(bitmap.chunks[0], array)
+    bitmap.add(ARRAY_MAX)
+    assert isinstance(bitmap.chunks[0], int)
+    assert list(bitmap) == values
+
+    bitmap.discard(0)
+    assert isinstance(bitmap.chunks[0], array)
+    assert list(bitmap) == values[1:]
+
+def test_bitmap_discard_drops_empty_chunks():
+    bitmap = Bitmap.from_ids([5, 70000])
+    bitmap.discard(70000)
+    bitmap.discard(12345)
+    assert list(bitmap) == [5]
+    assert list(bitmap.chunks) == [0]
+
+def test_bitmap_copy_is_independent():
+    original = Bitmap.from_ids([1, 2, 3])
+    copy = original.copy()
+    copy.add(4)
+    copy.discard(1)
+    assert list(original) == [1, 2, 3]
+
+def test_skill_index_matches_case_insensitively():
+    index = SkillIndex(max_age=0)
+    index.build([(1, ["Python", "SQL"]), (2, ["python "]), (3, ["Java", "sql"])])
+    assert list(index.match(all_of=["PYTHON"])) == [1, 2]
+    assert list(index.match(all_of=["python", "sql"])) == [1]
+    assert list(index.match(any_of=["java", "Python"])) == [1, 2, 3]
+    assert list(index.match(all_of=["sql"], any_of=["java", "go"])) == [3]
+    assert list(index.match()) == []
+    assert index.counts(all_of=["SQL"], any_of=["java"]) == {"total": 1, "by_skill": {"sql": 2, "java": 1}}
+
+def test_skill_index_update_and_remove():
+    index = SkillIndex(max_age=0)
+    index.build([(1, ["python"]), (2, ["java"])])
+    result = index.match(all_of=["python"])
+    index.update(2, ["Python"])
+    index.update_many([(3, ["go"]), (1, ["go"])])
+    assert list(result) == [1]
+    assert list(index.match(all_of=["python"])) == [2]
+    assert list(index.match(all_of=["go"])) == [1, 3]
+    index.remove(3)
+    assert list(index.match(any_of=["go", "java"])) == [1]
+    assert index.max_id == 3
+
+def test_skill_index_keeps_writes_made_during_a_rebuild():
+    index = SkillIndex(max_age=0)
+    index.build([(1, ["python"]), (2, ["java"])])
+    index.invalidate()
+    assert not index.fresh()
+
+    def rows():
+        # The snapshot was read before candidate 2 and 3 were written
+        yield 1, ["python"]
+        index.update(2, ["python"])
+        index.update(3, ["Python"])
+        yield 2, ["java"]
+
+    assert index.refresh(rows, wait=True)
+    assert list(index.match(all_of=["python"])) == [1, 2, 3]
+    assert list(index.match(all_of=["java"])) == []
+    assert index.max_id == 3
+    assert not index.stale()
+
+def test_skill_index_first_build_keeps_concurrent_writes():
+    index = SkillIndex(max_age=0)
+    index.update(9, ["rust"])
+    assert not index.loaded
+
+    def rows():
+        yield 1, ["python"]
+        index.update(2, ["rust"])
+
+    assert index.refresh(rows, wait=True)
+    assert list(index.match(all_of=["rust"])) == [2]
+
+def test_stored_skills_agree_with_the_index_keys():
+    stored = clean_skills([" Python", "SQL ", "", "  ", None, "Go"])
+    assert stored == ["Python", "SQL", "Go"]
+    # The database key is the lowercased stored skill, which is what the index uses
+    assert [skill.lower() for skill in stored] == [normalize_skill(skill) for skill in stored]
+    assert clean_skills(None) is None
@@ -0,0 +1,38 @@
+from core.tools.skill_matcher import SkillMatcher, match_skills
+
+DICTIONARY = {
+    "programming_languages": ["Python", "C++", "C#", {"term": "Go", "case_sensitive": True}, {"term": "R", "case_sensitive": True}],
+    "technical_skills": ["Node.js", "CI/CD", "Django", "machine learning", {"term": "Python", "name": "python"}],
+    "soft_skills": ["team leadership"],
+}
+
+def test_matches_whole_tokens_with_symbols():
+    matched = SkillMatcher(DICTIONARY).match("Built C++ and C# services, Node.js APIs and CI/CD pipelines")
+    assert matched == {"programming_languages": ["c++", "c#"], "technical_skills": ["node.js", "ci/cd"]}
+
+def test_case_sensitive_terms_only_match_their_written_form():
+    matcher = SkillMatcher(DICTIONARY)
+    assert matcher.match("Services in Go and R") == {"programming_languages": ["go", "r"]}
+    assert matcher.match("ready to go, r and d, going cargo") == {}
+
+def test_compounds_are_also_split_into_parts():
+    matched = SkillMatcher(DICTIONARY).match("Stack: python/django.")
+    assert matched["technical_skills"] == ["python", "django"]
+
+def test_phrases_need_every_word_in_order():
+    matcher = SkillMatcher(DICTIONARY)
+    assert matcher.match("Applied Machine  Learning; team leadership") == {
+        "technical_skills": ["machine learning"], "soft_skills": ["team leadership"]
+    }
+    assert matcher.match("learning machine, leadership of the team") == {}
+    # Phrases end at a word boundary
+    assert matcher.match("machine learnings") == {}
+
+def test_a_skill_is_reported_in_every_category_in_dictionary_order():
+    matched = SkillMatcher(DICTIONARY).match("Django then Python")
+    assert matched == {"programming_languages": ["python"], "technical_skills": ["python", "django"]}
+
+def test_shared_matcher_results_are_cached_and_immutable():
+    first = match_skills("Python and SQL")
+    assert first is match_skills("Python and SQL")
+    assert all(isinstance(names, tuple) for names in first.values())
@@ -0,0 +1,21 @@
+from core.tools.text_extraction import _collect_pages
+
+def _pages(pulled, count=10, chars=10):
+    for index in range(count):
+        pulled.append(index)
+        yield "x" * chars
+
+def test_pages_past_the_page_budget_are_never_pulled():
+    pulled = []
+    text, pages = _collect_pages(_pages(pulled), max_pages=3, max_chars=1000, separator="|")
+    assert pages == 3
+    assert pulled == [0, 1, 2]
+    assert text == "|".join(["x" * 10] * 3)
+
+def test_character_budget_stops_after_the_page_that_reaches_it():
+    pulled = []
+    assert _collect_pages(_pages(pulled), max_pages=9, max_chars=25)[1] == 3
+    assert pulled == [0, 1, 2]
+
+def test_missing_page_text_counts_as_empty():
+    assert _collect_pages(iter([None, "a"]), max_pages=5, max_chars=100) == ("\na", 2)